@@ -1,9 +1,8 @@
 from constants import *
-from nodes.animator import Animator
 
 
 class Fire:
-    def __init__(self, sprite_sheet, animation_data, camera, xds, yds):
+    def __init__(self, sprite_sheet, animation_clips, animation_clock, camera, xds, yds, phase=0):
         # Depedencies
         self.camera = camera
 
@@ -14,18 +13,22 @@ class Fire:
         self.sprite_sheet = sprite_sheet
 
         # Parents load once and pass to me
-        self.aniamtion_data = animation_data
+        self.animation_clips = animation_clips
+
+        # Shared cursor, every fire with the same phase shows the same frame, phase is ms ahead of the others
+        self.animation_clock = animation_clock
+        self.animation_key = self.animation_clock.add(self.animation_clips["burn"], phase)
 
         # Init starting region
-        self.region = self.aniamtion_data["burn"]["frames_list"][0]["region"]
+        self.region = self.animation_clock.regions[self.animation_key]
 
         # Rect
         self.rect = pg.Rect(xds, yds, self.region[2], self.region[3])
 
-        # Animator node
-        self.animator = Animator(self, self.aniamtion_data, "burn")
-
     def draw(self):
+        # Get current region from the shared cursor
+        self.region = self.animation_clock.regions[self.animation_key]
+
         # Turn my coord to draw coord
         xds = self.rect.x - self.camera.rect.x
         yds = self.rect.y - self.camera.rect.y
@@ -37,6 +40,22 @@ class Fire:
             self.region
         )
 
+    # Tell dirty rects where I draw and how I look, I am redrawn only when that changes
+    def add_to_dirty_rects(self, dirty_rects):
+        # Get current region from the shared cursor
+        self.region = self.animation_clock.regions[self.animation_key]
+
+        xds = self.rect.x - self.camera.rect.x
+        yds = self.rect.y - self.camera.rect.y
+        dirty_rects.track(
+            self,
+            xds,
+            yds,
+            self.region[2],
+            self.region[3],
+            tuple(self.region)
+        )
+
     def update(self, dt):
-        # Update animation node
-        self.animator.update(dt)
+        # Animation clock moves my frame, nothing to do
+        pass
@@ -5,7 +5,7 @@ from nodes.timer import Timer
 
 
 class Goblin:
-    def __init__(self, id, sprite_sheet, sprite_sheet_flip, animation_data, camera, xds, yds, game, room, quadtree, player, sprite_region, world):
+    def __init__(self, id, frame_atlas, animation_clips, camera, xds, yds, game, room, quadtree, player, sprite_region, world):
         # Get worlds
         self.world = world
 
@@ -24,26 +24,27 @@ class Goblin:
         # Get quadtree
         self.quadtree = quadtree
 
-        # Id for quadtree bookeeping, for quick relocation in quad
+        # Id, index in the room actor layer (quadtree books actors by instance, not by this)
         self.id = id
 
         # Name
         self.name = "goblin"
 
-        # Parents load once and pass to me
-        self.sprite_sheet = sprite_sheet
-        self.sprite_sheet_flip = sprite_sheet_flip
-        self.current_sprite_sheet = self.sprite_sheet
+        # Parents load once and pass to me, animation frames, flip or no flip
+        self.frame_atlas = frame_atlas
+
+        # Facing left? Draw the flipped frames
+        self.is_flipped = False
 
         # Parents load once and pass to me
-        self.aniamtion_data = animation_data
+        self.animation_clips = animation_clips
 
         # Surface offset
         self.surface_offset_x = 37
         self.surface_offset_y = 30
 
         # Init starting region
-        self.region = self.aniamtion_data["idle"]["frames_list"][0]["region"]
+        self.region = self.animation_clips["idle"].regions[0]
 
         # Rect
         self.rect = pg.FRect(0, 0, 6, 31)
@@ -59,7 +60,7 @@ class Goblin:
         self.direction = 0
 
         # Animator node
-        self.animator = Animator(self, self.aniamtion_data, "idle")
+        self.animator = Animator(self, self.animation_clips, "idle", self.frame_atlas)
         self.animator.add_event_listener(
             self.on_attack_animation_end, "animation_end"
         )
@@ -76,7 +77,8 @@ class Goblin:
             self.game,
             self.room,
             self.camera,
-            self.quadtree
+            self.quadtree,
+            self.game.kinematic_solvers[self.name]
         )
 
         # Timer to toggle between idle and run
@@ -112,19 +114,19 @@ class Goblin:
             if rel_player_pos != 0:
 
                 # I am facing right?
-                if self.current_sprite_sheet == self.sprite_sheet:
+                if not self.is_flipped:
                     # Player on my left?
                     if rel_player_pos < 0:
                         # Update sprite sheet to flip (this will determine dir input for vel in run entry)
-                        self.current_sprite_sheet = self.sprite_sheet_flip
+                        self.is_flipped = True
                         self.facing_direction = -1
 
                 # I am facing left?
-                elif self.current_sprite_sheet == self.sprite_sheet_flip:
+                elif self.is_flipped:
                     # Player on my right?
                     if rel_player_pos > 0:
                         # Update sprite sheet to normal (this will determine dir input for vel in run entry)
-                        self.current_sprite_sheet = self.sprite_sheet
+                        self.is_flipped = False
                         self.facing_direction = 1
 
             # Replay the attack anim, stay in attack state
@@ -144,28 +146,26 @@ class Goblin:
 
     # Called by kinematic
     def on_collide(self, cells):
-        # Unpack all found collided cells type and name
+        # Unpack all found collided cells kind
         for cell in cells:
+            kind = self.room.collision_grid[cell]
+
             # Prioritize solids, found solid first? Stop
-            if cell["sprite_type"] == "solid":
+            if kind == CELL_SOLID:
                 return True
 
             # Found door next? Stop
-            elif cell["sprite_type"] == "door":
+            elif kind == CELL_DOOR:
                 return True
 
             # Found thin? Stop
-            elif cell["sprite_type"] == "thin":
+            elif kind == CELL_THIN:
                 return True
 
     def draw(self):
         xds = (self.rect.x - self.surface_offset_x) - self.camera.rect.x
         yds = (self.rect.y - self.surface_offset_y) - self.camera.rect.y
-        NATIVE_SURF.blit(
-            self.current_sprite_sheet,
-            (xds, yds),
-            self.region
-        )
+        NATIVE_SURF.blit(self.frame[self.is_flipped], (xds, yds))
 
         if self.game.is_debug:
             x = self.aggro_rect.x - self.camera.rect.x
@@ -174,14 +174,11 @@ class Goblin:
             h = self.aggro_rect.height
 
             # Owner real rect
-            self.game.debug_draw.add(
-                {
-                    "type": "rect",
-                    "layer": 1,
-                    "rect": [x, y, w, h],
-                    "color": "red",
-                    "width": 1
-                }
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="red",
+                rect=[x, y, w, h],
+                width=1
             )
 
             x = self.hit_rect.x - self.camera.rect.x
@@ -190,14 +187,11 @@ class Goblin:
             h = self.hit_rect.height
 
             # Owner real rect
-            self.game.debug_draw.add(
-                {
-                    "type": "rect",
-                    "layer": 1,
-                    "rect": [x, y, w, h],
-                    "color": "yellow",
-                    "width": 1
-                }
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="yellow",
+                rect=[x, y, w, h],
+                width=1
             )
 
             # Base
@@ -205,60 +199,58 @@ class Goblin:
             y = self.rect.y - self.camera.rect.y
 
             # State
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - FONT_H,
-                    "text": f"state: {self.state}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - FONT_H,
+                text=f"state: {self.state}"
             )
 
             # Facing
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (2 * FONT_H) - 1,
-                    "text": f"face: {self.facing_direction}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (2 * FONT_H) - 1,
+                text=f"face: {self.facing_direction}"
             )
 
             # On wall?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (3 * FONT_H) - 2,
-                    "text": f"wall: {self.kinematic.is_on_wall}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (3 * FONT_H) - 2,
+                text=f"wall: {self.kinematic.is_on_wall}"
             )
 
             # On floor?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (4 * FONT_H) - 3,
-                    "text": f"floor: {self.kinematic.is_on_floor}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (4 * FONT_H) - 3,
+                text=f"floor: {self.kinematic.is_on_floor}"
             )
 
             # Name?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (5 * FONT_H) - 4,
-                    "text": f"name: {self.name}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (5 * FONT_H) - 4,
+                text=f"name: {self.name}"
             )
 
+    # Tell dirty rects where I draw and how I look, I am redrawn only when that changes
+    def add_to_dirty_rects(self, dirty_rects):
+        xds = (self.rect.x - self.surface_offset_x) - self.camera.rect.x
+        yds = (self.rect.y - self.surface_offset_y) - self.camera.rect.y
+        dirty_rects.track(
+            self,
+            xds,
+            yds,
+            self.region[2],
+            self.region[3],
+            self.frame[self.is_flipped]
+        )
+
     def update(self, dt):
         # Update animation node
         self.animator.update(dt)
@@ -281,11 +273,11 @@ class Goblin:
         self.aggro_rect.midbottom = self.rect.midbottom
 
         # Update hit rect to follow rect, depends on my sprite sheet
-        if self.current_sprite_sheet == self.sprite_sheet:
+        if not self.is_flipped:
             self.hit_rect.midleft = self.rect.center
             self.hit_rect.y -= TILE_S
 
-        elif self.current_sprite_sheet == self.sprite_sheet_flip:
+        elif self.is_flipped:
             self.hit_rect.midright = self.rect.center
             self.hit_rect.y -= TILE_S
 
@@ -326,11 +318,11 @@ class Goblin:
 
                 # Update sprite to follow direction, flip or no flip
                 if self.direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                     self.facing_direction = 1
 
                 elif self.direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
                     self.facing_direction = -1
 
                 # Set rect to prev frame rect, where next frame is on floor
@@ -344,11 +336,11 @@ class Goblin:
 
                 # Update sprite to follow direction, flip or no flip
                 if self.direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                     self.facing_direction = 1
 
                 elif self.direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
                     self.facing_direction = -1
 
                 # Set rect to prev frame rect, where next frame is not in wall
@@ -392,11 +384,11 @@ class Goblin:
                 self.run_timer.reset()
 
                 # Use current sprite sheet to determine direction
-                if self.current_sprite_sheet == self.sprite_sheet:
+                if not self.is_flipped:
                     self.facing_direction = 1
                     self.direction = 1
 
-                elif self.current_sprite_sheet == self.sprite_sheet_flip:
+                elif self.is_flipped:
                     self.facing_direction = -1
                     self.direction = -1
 
@@ -414,19 +406,19 @@ class Goblin:
                 if rel_player_pos != 0:
 
                     # I am facing right?
-                    if self.current_sprite_sheet == self.sprite_sheet:
+                    if not self.is_flipped:
                         # Player on my left?
                         if rel_player_pos < 0:
                             # Update sprite sheet to flip (this will determine dir input for vel in run entry)
-                            self.current_sprite_sheet = self.sprite_sheet_flip
+                            self.is_flipped = True
                             self.facing_direction = -1
 
                     # I am facing left?
-                    elif self.current_sprite_sheet == self.sprite_sheet_flip:
+                    elif self.is_flipped:
                         # Player on my right?
                         if rel_player_pos > 0:
                             # Update sprite sheet to normal (this will determine dir input for vel in run entry)
-                            self.current_sprite_sheet = self.sprite_sheet
+                            self.is_flipped = False
                             self.facing_direction = 1
 
                 # Set direction input to 0
@@ -458,19 +450,19 @@ class Goblin:
                 if rel_player_pos != 0:
 
                     # I am facing right?
-                    if self.current_sprite_sheet == self.sprite_sheet:
+                    if not self.is_flipped:
                         # Player on my left?
                         if rel_player_pos < 0:
                             # Update sprite sheet to flip (this will determine dir input for vel in run entry)
-                            self.current_sprite_sheet = self.sprite_sheet_flip
+                            self.is_flipped = True
                             self.facing_direction = -1
 
                     # I am facing left?
-                    elif self.current_sprite_sheet == self.sprite_sheet_flip:
+                    elif self.is_flipped:
                         # Player on my right?
                         if rel_player_pos > 0:
                             # Update sprite sheet to normal (this will determine dir input for vel in run entry)
-                            self.current_sprite_sheet = self.sprite_sheet
+                            self.is_flipped = False
                             self.facing_direction = 1
 
                 # Set direction input to 0
@@ -12,34 +12,40 @@ class Player:
         self.camera = camera
         self.world = world
 
-        # Id for quadtree bookeeping, for quick relocation in quad
-        # Each room loop over and use index to set id, since player is only 1
-        # And count starts from 0, so there is only 1 -1
+        # Id, room actors use their actor layer index, since player is only 1
+        # And count starts from 0, so there is only 1 -1 (quadtree books actors by instance, not by this)
         self.id = -1
 
         # Name
         self.name = "player"
 
-        # Player sprite sheets, flip or no flip
-        self.sprite_sheet = pg.image.load(
-            PNGS_PATHS["player_sprite_sheet.png"]
-        )
-        self.sprite_sheet_flip = pg.image.load(
-            PNGS_PATHS["player_flip_sprite_sheet.png"]
-        )
-        self.current_sprite_sheet = self.sprite_sheet
-
         # Surface offset
         self.surface_offset_x = 21
         self.surface_offset_y = 14
 
         # Read json animation data
-        self.aniamtion_data = {}
-        with open(JSONS_PATHS["player_animation.json"], "r") as data:
-            self.aniamtion_data = load(data)
+        self.aniamtion_data = self.game.asset_manager.get_json(
+            JSONS_PATHS["player_animation.json"], "player"
+        )
+
+        # Compiled animation clips, next animations linked
+        self.animation_clips = self.game.asset_manager.get_animation_clips(
+            JSONS_PATHS["player_animation.json"], "player"
+        )
+
+        # Player animation frames, cut once, flip or no flip, the flip sheet has hand fixed frames
+        self.frame_atlas = self.game.asset_manager.get_frame_atlas(
+            PNGS_PATHS["player_sprite_sheet.png"],
+            self.aniamtion_data,
+            "player",
+            PNGS_PATHS.get("player_flip_sprite_sheet.png")
+        )
+
+        # Facing left? Draw the flipped frames
+        self.is_flipped = False
 
         # Init starting region
-        self.region = self.aniamtion_data["idle"]["frames_list"][0]["region"]
+        self.region = self.animation_clips["idle"].regions[0]
 
         # State
         self.state = "idle"
@@ -52,7 +58,7 @@ class Player:
         self.direction = 0
 
         # Animator node
-        self.animator = Animator(self, self.aniamtion_data, "idle")
+        self.animator = Animator(self, self.animation_clips, "idle", self.frame_atlas)
 
         # Rect
         self.rect = pg.FRect(0, 0, 6, 31)
@@ -76,7 +82,8 @@ class Player:
             self.game,
             self.room,
             self.camera,
-            self.room.quadtree
+            self.room.quadtree,
+            self.game.kinematic_solvers[self.name]
         )
 
         # Camera anchor
@@ -152,7 +159,7 @@ class Player:
         # Exit to up if next frame going down is floor
         if self.kinematic.is_on_floor:
             # I just press jump this frame
-            if self.game.is_jump_just_pressed:
+            if self.game.input.is_just_pressed(ACTION_JUMP):
                 self.set_state("up")
                 return
 
@@ -166,7 +173,7 @@ class Player:
         # Exit to crouch if next frame going down is floor
         if self.kinematic.is_on_floor:
             # I am holding down crouch this frame
-            if self.game.is_down_pressed:
+            if self.game.input.is_held(ACTION_DOWN):
                 self.set_state("crouch")
                 return
 
@@ -174,32 +181,39 @@ class Player:
     def on_collide(self, cells):
         # These are cells where my future self next frame would collide
 
-        # Unpack all given found collided cells type and name
+        # Unpack all given found collided cells kind
         for cell in cells:
-            self.collided_cell_type = cell["sprite_type"]
-            self.collided_cell_name = cell["sprite_name"]
+            kind = self.room.collision_grid[cell]
+            self.collided_cell_type = kind
 
             # Prioritize solids, found solid first? Stop
-            if cell["sprite_type"] == "solid":
+            if kind == CELL_SOLID:
                 return True
 
             # Found thin?
-            elif cell["sprite_type"] == "thin":
+            elif kind == CELL_THIN:
                 # Not passing thru?
                 if self.is_thin_fall == False:
                     # If I am falling
                     if self.velocity.y > 0:
+                        # Cell index -> cell top
+                        cell_yds = (cell // self.room.w_tu) * \
+                            TILE_S + self.room.rect[1]
+
                         # Player real rect feet flushed on it? Stop
-                        if (self.rect.bottom - cell["yds"]) == 0:
+                        if (self.rect.bottom - cell_yds) == 0:
                             return True
 
             # Found door next?
-            elif cell["sprite_type"] == "door":
+            elif kind == CELL_DOOR:
+                # Get the door data from the side table
+                door = self.room.collision_doors[cell]
+
                 # Announce to world
-                self.world.on_player_hit_door(cell)
+                self.world.on_player_hit_door(door)
 
                 # Get door direction
-                door_direction = cell["door_direction"]
+                door_direction = door["door_direction"]
 
                 # Based on direction, update my vel and tell kinematic to stop
                 if door_direction == "left":
@@ -226,10 +240,8 @@ class Player:
             xds = (self.rect.x - self.surface_offset_x) - self.camera.rect.x
             yds = (self.rect.y - self.surface_offset_y) - self.camera.rect.y
 
-            # Draw me with draw coords
-            NATIVE_SURF.blit(
-                self.current_sprite_sheet, (xds, yds), self.region
-            )
+            # Draw me with draw coords, frame is (frame, flipped frame)
+            NATIVE_SURF.blit(self.frame[self.is_flipped], (xds, yds))
 
         # Debug draw states
         if self.game.is_debug:
@@ -239,71 +251,70 @@ class Player:
             y = self.rect.y - self.camera.rect.y
 
             # State
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - FONT_H,
-                    "text": f"state: {self.state}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - FONT_H,
+                text=f"state: {self.state}"
             )
 
             # Facing
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (2 * FONT_H) - 1,
-                    "text": f"face: {self.facing_direction}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (2 * FONT_H) - 1,
+                text=f"face: {self.facing_direction}"
             )
 
             # On wall?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (3 * FONT_H) - 2,
-                    "text": f"wall: {self.kinematic.is_on_wall}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (3 * FONT_H) - 2,
+                text=f"wall: {self.kinematic.is_on_wall}"
             )
 
             # On floor?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (4 * FONT_H) - 3,
-                    "text": f"floor: {self.kinematic.is_on_floor}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (4 * FONT_H) - 3,
+                text=f"floor: {self.kinematic.is_on_floor}"
             )
 
             # Invincible?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (5 * FONT_H) - 4,
-                    "text": f"invicible: {self.is_invincible}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (5 * FONT_H) - 4,
+                text=f"invicible: {self.is_invincible}"
             )
 
             # Name?
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - (6 * FONT_H) - 5,
-                    "text": f"name: {self.name}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - (6 * FONT_H) - 5,
+                text=f"name: {self.name}"
             )
 
+    # Tell dirty rects where I draw and how I look, I am redrawn only when that changes
+    def add_to_dirty_rects(self, dirty_rects):
+        # Hidden? Not tracked, my old place gets redrawn
+        if self.is_hidden:
+            return
+
+        xds = (self.rect.x - self.surface_offset_x) - self.camera.rect.x
+        yds = (self.rect.y - self.surface_offset_y) - self.camera.rect.y
+        dirty_rects.track(
+            self,
+            xds,
+            yds,
+            self.region[2],
+            self.region[3],
+            self.frame[self.is_flipped]
+        )
+
     def update(self, dt):
         # Update animation node
         self.animator.update(dt)
@@ -336,7 +347,7 @@ class Player:
             self.old_facing_direction = self.facing_direction
 
         # Get horizontal input direction
-        self.direction = self.game.is_right_pressed - self.game.is_left_pressed
+        self.direction = self.game.input.is_held(ACTION_RIGHT) - self.game.input.is_held(ACTION_LEFT)
 
         # Update facing direction and old facing direction
         if self.direction != 0:
@@ -355,7 +366,7 @@ class Player:
             # Exit to up if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I just press jump this frame
-                if self.game.is_jump_just_pressed:
+                if self.game.input.is_just_pressed(ACTION_JUMP):
                     self.set_state("up")
                     return
 
@@ -369,7 +380,7 @@ class Player:
             # Exit to crouch if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I am holding down crouch this frame
-                if self.game.is_down_pressed:
+                if self.game.input.is_held(ACTION_DOWN):
                     self.set_state("crouch")
                     return
 
@@ -404,14 +415,14 @@ class Player:
             # Exit to up if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I just press jump this frame
-                if self.game.is_jump_just_pressed:
+                if self.game.input.is_just_pressed(ACTION_JUMP):
                     self.set_state("up")
                     return
 
             # Exit to crouch if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I am holding down crouch this frame
-                if self.game.is_down_pressed:
+                if self.game.input.is_held(ACTION_DOWN):
                     self.set_state("crouch")
                     return
 
@@ -419,9 +430,9 @@ class Player:
 
             # Update sprite flip / no flip with facing
             if self.facing_direction == 1:
-                self.current_sprite_sheet = self.sprite_sheet
+                self.is_flipped = False
             elif self.facing_direction == -1:
-                self.current_sprite_sheet = self.sprite_sheet_flip
+                self.is_flipped = True
 
             # Face direction prev was different?
             if self.old_facing_direction != self.facing_direction:
@@ -452,16 +463,16 @@ class Player:
                 # I am not pressing anything or next frame is solid pixel wall? Idle
                 if self.direction == 0 or self.kinematic.is_on_wall:
                     # Not pressing down?
-                    if not self.game.is_down_pressed:
+                    if not self.game.input.is_held(ACTION_DOWN):
                         self.set_state("idle")
                         return
 
             # Next frame going down is solid pixel?
             if self.kinematic.is_on_floor:
                 # Down is held? And jump was just pressed?
-                if self.game.is_down_pressed and self.game.is_jump_just_pressed:
+                if self.game.input.is_held(ACTION_DOWN) and self.game.input.is_just_pressed(ACTION_JUMP):
                     # If solid pixel is thin
-                    if self.collided_cell_type == "Thin":
+                    if self.collided_cell_type == CELL_THIN:
                         # Set pass thru to true, after move, next frame this will be set to false
                         self.is_thin_fall = True
                         return
@@ -475,7 +486,7 @@ class Player:
                 # I am pressing direction AND next frame is NOT solid pixel wall? Run
                 if self.direction != 0 and not self.kinematic.is_on_wall:
                     # Not pressing down?
-                    if not self.game.is_down_pressed:
+                    if not self.game.input.is_held(ACTION_DOWN):
                         self.set_state("run")
                         return
 
@@ -486,13 +497,13 @@ class Player:
 
             # Update sprite flip / no flip with facing
             if self.facing_direction == 1:
-                self.current_sprite_sheet = self.sprite_sheet
+                self.is_flipped = False
 
                 # Since direction is 0, need to update old face here myself
                 self.old_facing_direction = 1
 
             elif self.facing_direction == -1:
-                self.current_sprite_sheet = self.sprite_sheet_flip
+                self.is_flipped = True
 
                 # Since direction is 0, need to update old face here myself
                 self.old_facing_direction = -1
@@ -519,14 +530,14 @@ class Player:
             # Then state logic
 
             # Jump was released while going up? Heavy gravity
-            if self.game.is_jump_just_released == True:
+            if self.game.input.is_just_released(ACTION_JUMP) == True:
                 self.gravity = self.heavy_gravity
 
             # Update sprite flip / no flip with facing
             if self.facing_direction == 1:
-                self.current_sprite_sheet = self.sprite_sheet
+                self.is_flipped = False
             elif self.facing_direction == -1:
-                self.current_sprite_sheet = self.sprite_sheet_flip
+                self.is_flipped = True
 
             # I am invincible? Start timer toggle it back to normal
             if self.is_invincible == True:
@@ -550,7 +561,7 @@ class Player:
             # Exit to up if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I just press jump this frame
-                if self.game.is_jump_just_pressed:
+                if self.game.input.is_just_pressed(ACTION_JUMP):
                     self.set_state("up")
                     return
 
@@ -564,7 +575,7 @@ class Player:
             # Exit to crouch if next frame going down is floor
             if self.kinematic.is_on_floor:
                 # I am holding down crouch this frame
-                if self.game.is_down_pressed:
+                if self.game.input.is_held(ACTION_DOWN):
                     self.set_state("crouch")
                     return
 
@@ -572,9 +583,9 @@ class Player:
 
             # Update sprite flip / no flip with facing
             if self.facing_direction == 1:
-                self.current_sprite_sheet = self.sprite_sheet
+                self.is_flipped = False
             elif self.facing_direction == -1:
-                self.current_sprite_sheet = self.sprite_sheet_flip
+                self.is_flipped = True
 
             # I am invincible? Start timer toggle it back to normal
             if self.is_invincible == True:
@@ -624,9 +635,9 @@ class Player:
 
                 # Update sprite flip / no flip with facing
                 if self.facing_direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                 elif self.facing_direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
 
                 # Face direction prev was SAME?
                 if self.old_facing_direction == self.facing_direction:
@@ -727,9 +738,9 @@ class Player:
 
                 # Update sprite flip / no flip with facing
                 if self.facing_direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                 elif self.facing_direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
 
                 # Face direction prev was SAME?
                 if self.old_facing_direction == self.facing_direction:
@@ -807,9 +818,9 @@ class Player:
 
                 # Update sprite flip / no flip with facing
                 if self.facing_direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                 elif self.facing_direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
 
                 # Face direction prev was SAME?
                 if self.old_facing_direction == self.facing_direction:
@@ -860,9 +871,9 @@ class Player:
 
                 # Update sprite flip / no flip with facing
                 if self.facing_direction == 1:
-                    self.current_sprite_sheet = self.sprite_sheet
+                    self.is_flipped = False
                 elif self.facing_direction == -1:
-                    self.current_sprite_sheet = self.sprite_sheet_flip
+                    self.is_flipped = True
 
                 # Face direction prev was SAME?
                 if self.old_facing_direction == self.facing_direction:
@@ -3,7 +3,7 @@ from nodes.popup import Popup
 
 
 class TwinGoddess:
-    def __init__(self, id, sprite_sheet, sprite_sheet_flip, animation_data, camera, xds, yds, game, room, quadtree, player, sprite_region, world):
+    def __init__(self, id, sprite_sheet, animation_clips, camera, xds, yds, game, room, quadtree, player, sprite_region, world):
         # Get worlds
         self.world = world
 
@@ -22,7 +22,7 @@ class TwinGoddess:
         # Get quadtree
         self.quadtree = quadtree
 
-        # Id for quadtree bookeeping, for quick relocation in quad
+        # Id, index in the room actor layer (quadtree books actors by instance, not by this)
         self.id = id
 
         # Name
@@ -43,7 +43,7 @@ class TwinGoddess:
 
         # Popup init
         text = f"press {
-            pg.key.name(self.game.key_bindings["up"])
+            pg.key.name(self.game.input.key_bindings["up"][0])
         } to save"
 
         self.popup = Popup(
@@ -80,14 +80,11 @@ class TwinGoddess:
             h = self.rect.height
 
             # Owner real rect
-            self.game.debug_draw.add(
-                {
-                    "type": "rect",
-                    "layer": 1,
-                    "rect": [x, y, w, h],
-                    "color": "red",
-                    "width": 1
-                }
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="red",
+                rect=[x, y, w, h],
+                width=1
             )
 
             # Base
@@ -95,16 +92,41 @@ class TwinGoddess:
             y = self.rect.y - self.camera.rect.y
 
             # State
-            self.game.debug_draw.add(
-                {
-                    "type": "text",
-                    "layer": 3,
-                    "x": x,
-                    "y": y - FONT_H,
-                    "text": f"name: {self.name}"
-                }
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=x,
+                y=y - FONT_H,
+                text=f"name: {self.name}"
             )
 
+    # Tell dirty rects where I and my overlay draw and how we look, redrawn only when that changes
+    def add_to_dirty_rects(self, dirty_rects):
+        xds = self.rect.x - self.camera.rect.x
+        yds = self.rect.y - self.camera.rect.y
+        dirty_rects.track(
+            self,
+            xds,
+            yds,
+            self.region[2],
+            self.region[3],
+            tuple(self.region)
+        )
+
+        # Popup invisible? Not tracked, its old place gets redrawn
+        if self.popup.alpha == 0:
+            return
+
+        xds = self.popup.rect.x - self.camera.rect.x
+        yds = self.popup.rect.y - self.camera.rect.y - self.popup.y_offset
+        dirty_rects.track(
+            self.popup,
+            xds,
+            yds,
+            self.popup.rect.width,
+            self.popup.rect.height,
+            self.popup.alpha
+        )
+
     def update(self, dt):
         # Looking
         if self.state == "looking":
@@ -129,7 +151,7 @@ class TwinGoddess:
             # Then state logic
 
             # Player pressed up?
-            if self.game.is_up_just_pressed:
+            if self.game.input.is_just_pressed(ACTION_UP):
                 self.world.on_player_save(self)
 
         # Update curtain, this thing stops itself when it is done
@@ -0,0 +1,89 @@
+# Bake room jsons into compact room bins and pack each stage into a world file, run from the project root after editing a room json by hand:
+# python bake_rooms.py                                        every game room
+# python bake_rooms.py stage_1_hallway_game.json              that room, and its whole stage world
+# The room editor bakes the room it saves and its stage world by itself
+import os
+import tracemalloc
+from argparse import ArgumentParser
+from os.path import getsize
+from time import perf_counter_ns
+
+# No window and no sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from constants import *
+from nodes.room_format import RoomFormat
+
+
+# Load with the given loader, return ms and bytes still held by what it returned
+def measure(loader, *args):
+    tracemalloc.start()
+    start = perf_counter_ns()
+    room_data = loader(*args)
+    ms = (perf_counter_ns() - start) / 1000000
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Keep room data alive until memory is read
+    del room_data
+    return ms, held
+
+
+def load_json(path):
+    with open(path, "r") as data:
+        return load(data)
+
+
+def main():
+    parser = ArgumentParser(description="Bake room jsons into room bins and stage worlds")
+    parser.add_argument(
+        "rooms", nargs="*", help="room json names, default every game room"
+    )
+    args = parser.parse_args()
+
+    # Every game room is the default
+    rooms = args.rooms or [
+        name for name in JSONS_PATHS if name.endswith("_game.json")
+    ]
+
+    # Worlds are rewritten here, so do not map them
+    room_format = RoomFormat(is_open_worlds=False)
+    os.makedirs(BINS_DIR_PATH, exist_ok=True)
+
+    # Bake each room bin, collect the stages to pack
+    stages = set()
+    for room_name in rooms:
+        room_data = room_format.from_json(load_json(JSONS_PATHS[room_name]))
+        room_format.save(room_data, room_format.get_bin_path(room_name))
+        stages.add(room_data["stage_no"])
+
+    # Pack every room of each touched stage
+    for stage_no in sorted(stages):
+        world_path = room_format.get_world_path(stage_no)
+        room_format.save_world(world_path, room_format.get_stage_names(stage_no))
+        print(f"{world_path}: {getsize(world_path) / 1024:.1f} kb")
+
+    # Compare reading the json, the room bin and the mapped world room
+    world_format = RoomFormat()
+    print(
+        f"{'room':<28} {'json kb':>8} {'bin kb':>7} {'json ms':>8} {'bin ms':>7} {'world ms':>9} "
+        f"{'json mem kb':>12} {'bin mem kb':>11} {'world mem kb':>13}"
+    )
+    for room_name in rooms:
+        json_path = JSONS_PATHS[room_name]
+        bin_path = room_format.get_bin_path(room_name)
+
+        json_ms, json_memory = measure(load_json, json_path)
+        bin_ms, bin_memory = measure(room_format.load_bin, bin_path)
+        world_ms, world_memory = measure(world_format.load, room_name)
+
+        print(
+            f"{room_name[:28]:<28} {getsize(json_path) / 1024:>8.1f} "
+            f"{getsize(bin_path) / 1024:>7.1f} {json_ms:>8.3f} {bin_ms:>7.3f} {world_ms:>9.3f} "
+            f"{json_memory / 1024:>12.1f} {bin_memory / 1024:>11.1f} {world_memory / 1024:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
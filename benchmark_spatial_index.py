@@ -0,0 +1,98 @@
+# REMOVE IN BUILD
+# Compare QuadTree and SpatialHash with moving actors, run from the project root:
+# python benchmark_spatial_index.py
+import os
+from random import Random
+from time import perf_counter
+
+# No window needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from constants import *
+from nodes.quadtree import QuadTree
+from nodes.spatial_hash import SpatialHash
+
+
+# Stand in for a moving actor, only needs a rect and a velocity
+class BenchActor:
+    def __init__(self, x, y, vx, vy):
+        self.rect = pg.FRect(x, y, 6, 31)
+        self.velocity = Vector2(vx, vy)
+
+        # Goblin sized aggro rect, searched every frame
+        self.aggro_rect = pg.FRect(0, 0, 80, 47)
+
+
+def run(make_index, actors_total, frames, room_rect, seed=0):
+    rng = Random(seed)
+
+    # Same actors for every index
+    actors = [
+        BenchActor(
+            rng.uniform(room_rect.left, room_rect.right - 6),
+            rng.uniform(room_rect.top, room_rect.bottom - 31),
+            rng.uniform(-2, 2),
+            rng.uniform(-2, 2)
+        )
+        for _ in range(actors_total)
+    ]
+
+    # Room camera, moves with the first actor
+    camera_rect = pg.FRect(0, 0, NATIVE_W, NATIVE_H)
+
+    index = make_index(pg.FRect(room_rect))
+    for actor in actors:
+        index.insert(actor)
+
+    found_total = 0
+    start = perf_counter()
+    for _ in range(frames):
+        # Move every actor, bounce on room edges, relocate like kinematic does
+        for actor in actors:
+            actor.rect.x += actor.velocity.x
+            actor.rect.y += actor.velocity.y
+            if not room_rect.contains(actor.rect):
+                actor.velocity *= -1
+                actor.rect.clamp_ip(room_rect)
+            index.relocate(actor)
+
+        # Room update and draw both search the camera
+        camera_rect.center = actors[0].rect.center
+        found_total += len(index.search(camera_rect))
+        found_total += len(index.search(camera_rect))
+
+        # Every actor searches its aggro rect, like goblin looking for player
+        for actor in actors:
+            actor.aggro_rect.midbottom = actor.rect.midbottom
+            found_total += len(index.search(actor.aggro_rect))
+
+    elapsed = perf_counter() - start
+
+    # Return ms per frame and total found, found must match between indexes
+    return elapsed * 1000 / frames, found_total
+
+
+def main():
+    # 3 by 3 screens room
+    room_rect = pg.Rect(0, 0, NATIVE_W * 3, NATIVE_H * 3)
+    frames = 200
+
+    indexes = {
+        "quadtree": lambda rect: QuadTree(rect, None),
+        "spatial_hash tile": lambda rect: SpatialHash(rect, None, TILE_S),
+        "spatial_hash 4 tiles": lambda rect: SpatialHash(rect, None, TILE_S * 4),
+        "spatial_hash screen": lambda rect: SpatialHash(rect, None, NATIVE_H),
+    }
+
+    print(f"{'actors':>8} {'index':<22} {'ms / frame':>12} {'found':>10}")
+    for actors_total in (10, 100, 1000):
+        for name, make_index in indexes.items():
+            ms, found_total = run(
+                make_index, actors_total, frames, room_rect
+            )
+            print(f"{actors_total:>8} {name:<22} {ms:>12.3f} {found_total:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# REMOVE IN BUILD
+# Headless World benchmark with scripted input, run from the project root:
+# python benchmark_world.py                                   every game room
+# python benchmark_world.py stage_1_hallway_game.json --frames 1200 --dt 16
+# python benchmark_world.py --script my_script.json           [[frame, "down" / "up", action], ...]
+import os
+from argparse import ArgumentParser
+from time import perf_counter_ns
+
+# No window and no sound device needed
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from constants import *
+from nodes.game import Game
+
+
+# Default input timeline, [frame, "down" / "up", action], actions are game key bindings names
+# Run left and jump, then run right and jump, then stand still
+DEFAULT_SCRIPT = [
+    [10, "down", "left"],
+    [60, "down", "jump"],
+    [80, "up", "jump"],
+    [200, "down", "jump"],
+    [220, "up", "jump"],
+    [300, "up", "left"],
+    [300, "down", "right"],
+    [360, "down", "jump"],
+    [380, "up", "jump"],
+    [500, "up", "right"],
+]
+
+
+# Nearest rank percentile of a sorted list
+def percentile(sorted_values, value):
+    i = max(0, min(len(sorted_values) - 1, round(value / 100 * len(sorted_values)) - 1))
+    return sorted_values[i]
+
+
+# Put the world in the given room, like a door transition does
+def load_room(world, room_name):
+    # Same room world starts with? Nothing to do
+    if world.room.name != room_name:
+        world.room.set_name(room_name)
+        world.room.quadtree.insert(world.player)
+
+    # Same spot world puts the player in, relative to this room
+    world.player.rect.midbottom = (
+        world.room.rect[0] + 10 * TILE_S,
+        world.room.rect[1] + 9 * TILE_S
+    )
+    world.player.velocity.update(0, 0)
+    world.room.quadtree.relocate(world.player)
+
+    # Camera starts on the room top left
+    world.camera.rect.topleft = (world.room.rect[0], world.room.rect[1])
+
+
+def run(game, room_name, frames, dt, script):
+    world = game.current_scene
+    load_room(world, room_name)
+
+    # Frame -> events of that frame
+    timeline = {}
+    for frame, kind, action in script:
+        timeline.setdefault(frame, []).append(
+            pg.event.Event(
+                pg.KEYDOWN if kind == "down" else pg.KEYUP,
+                key=game.input.key_bindings[action][0]
+            )
+        )
+
+    update_times = []
+    draw_times = []
+
+    for frame in range(frames):
+        # Feed this frame scripted input
+        for event in timeline.get(frame, []):
+            game.event(event)
+
+        # Draw game current scene
+        start = perf_counter_ns()
+        game.current_scene.draw()
+        draw_times.append(perf_counter_ns() - start)
+
+        # Update game current scene
+        start = perf_counter_ns()
+        game.update(dt)
+        update_times.append(perf_counter_ns() - start)
+
+    # Release everything still held, next room starts clean
+    for action in ("up", "down", "left", "right", "enter", "pause", "jump"):
+        if game.input.is_held(ACTIONS[action]):
+            game.event(pg.event.Event(pg.KEYUP, key=game.input.key_bindings[action][0]))
+    game.input.reset()
+
+    return sorted(update_times), sorted(draw_times)
+
+
+def main():
+    parser = ArgumentParser(description="Headless World benchmark")
+    parser.add_argument(
+        "rooms", nargs="*",
+        help="game room json names, default is every game room"
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--dt", type=int, default=1000 // FPS)
+    parser.add_argument(
+        "--script",
+        help="json input timeline, [[frame, \"down\" / \"up\", action], ...]"
+    )
+    args = parser.parse_args()
+
+    # Every game room is the default suite
+    rooms = args.rooms or [
+        name for name in JSONS_PATHS if name.endswith("_game.json")
+    ]
+
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script, "r") as data:
+            script = load(data)
+
+    print(f"{args.frames} frames, dt {args.dt} ms, times in ms")
+    print(
+        f"{'room':<28} {'update p50':>10} {'p95':>7} {'p99':>7} "
+        f"{'draw p50':>10} {'p95':>7} {'p99':>7}"
+    )
+
+    for room_name in rooms:
+        # Fresh game per room, so rooms do not affect each other
+        game = Game("World")
+
+        update_times, draw_times = run(
+            game, room_name, args.frames, args.dt, script
+        )
+
+        row = [room_name[:28].ljust(28)]
+        for times in (update_times, draw_times):
+            for value in (50, 95, 99):
+                ms = percentile(times, value) / 1000000
+                row.append(f"{ms:>{10 if value == 50 else 7}.3f}")
+        print(" ".join(row))
+
+
+if __name__ == "__main__":
+    main()
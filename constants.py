@@ -4,6 +4,8 @@ import pygame.freetype as font
 from pygame.math import Vector2
 from pygame.math import lerp
 from pygame.math import clamp
+from math import ceil
+from math import floor
 from json import dump
 from json import load
 
@@ -17,7 +19,6 @@ PNGS_PATHS = {
     "stage_1_sprite_sheet.png": join(PNGS_DIR_PATH, "stage_1_sprite_sheet.png"),
     "stage_2_sprite_sheet.png": join(PNGS_DIR_PATH, "stage_2_sprite_sheet.png"),
     "goblin_sprite_sheet.png": join(PNGS_DIR_PATH, "goblin_sprite_sheet.png"),
-    "goblin_flip_sprite_sheet.png": join(PNGS_DIR_PATH, "goblin_flip_sprite_sheet.png"),
 }
 
 # Jsons
@@ -36,6 +37,9 @@ JSONS_PATHS = {
     "stage_2_test_game.json": join(JSONS_DIR_PATH, "stage_2_test_game.json"),
 }
 
+# Baked rooms, made from the room jsons by bake_rooms.py, file name is the room json name with .bin
+BINS_DIR_PATH = "bins"
+
 # Wavs
 WAVS_DIR_PATH = "wavs"
 WAVS_PATHS = {
@@ -72,6 +76,48 @@ EDITOR_EVENTS = [
     pg.KEYDOWN, pg.KEYUP, pg.MOUSEBUTTONUP, pg.MOUSEBUTTONDOWN, pg.QUIT
 ]
 
+# Game input actions, 1 bit each in the input held, just pressed and just released bitmasks
+ACTION_UP = 1 << 0
+ACTION_DOWN = 1 << 1
+ACTION_LEFT = 1 << 2
+ACTION_RIGHT = 1 << 3
+ACTION_ENTER = 1 << 4
+ACTION_PAUSE = 1 << 5
+ACTION_JUMP = 1 << 6
+
+# REMOVE IN BUILD
+ACTION_LMB = 1 << 7
+ACTION_MMB = 1 << 8
+ACTION_RMB = 1 << 9
+
+# Action name -> action bit, bindings use the names
+ACTIONS = {
+    "up": ACTION_UP,
+    "down": ACTION_DOWN,
+    "left": ACTION_LEFT,
+    "right": ACTION_RIGHT,
+    "enter": ACTION_ENTER,
+    "pause": ACTION_PAUSE,
+    "jump": ACTION_JUMP,
+    # REMOVE IN BUILD
+    "lmb": ACTION_LMB,
+    "mmb": ACTION_MMB,
+    "rmb": ACTION_RMB,
+}
+
+# Room collision grid cell kinds
+CELL_EMPTY = 0
+CELL_SOLID = 1
+CELL_THIN = 2
+CELL_DOOR = 3
+
+# Collision layer sprite type -> collision grid cell kind
+CELL_KINDS = {
+    "solid": CELL_SOLID,
+    "thin": CELL_THIN,
+    "door": CELL_DOOR,
+}
+
 # Font
 FONT_H = 5
 FONT_W = 3
@@ -140,12 +186,3 @@ MASK_ID_TO_INDEX = {
 
 # Max recursion quadtree
 MAX_QUADTREE_DEPTH = 8
-
-# Book to store all quad (section / kid) with their actors
-# For quick lookup, to avoid search tree recursion
-# Reset the book
-actor_to_quad = {}
-
-
-def reset_actor_to_quad():
-    actor_to_quad = {}
@@ -9,65 +9,53 @@ game = Game("World")
 # The Main loop
 while 1:
     # Fps limit and get dt
-    dt = CLOCK.tick(FPS)
+    dt = CLOCK.tick(game.fps_limit)
 
     # Use this for game
     # for event in pg.event.get(EVENTS):
     # REMOVE IN BUILD -> EDITOR_EVENTS
+    game.profiler.begin("event")
     for event in pg.event.get(EDITOR_EVENTS):
         # Update the game input flags
         game.event(event)
+    game.profiler.end("event")
+
+    # REMOVE IN BUILD, keep this frame input flags and dt when recording
+    game.input_recorder.record(game, dt)
 
     # Draw game current scene
+    game.profiler.begin("draw")
     game.current_scene.draw()
+    game.profiler.end("draw")
 
-    # Update game current scene
-    game.current_scene.update(dt)
+    # Update game current scene, once or in fixed ticks, just flags are cleaned once seen
+    game.profiler.begin("update")
+    game.update(dt)
+    game.profiler.end("update")
 
     # REMOVE IN BUILD
-    game.debug_draw.add(
-        {
-            "type": "text",
-            "layer": 6,
-            "x": 0,
-            "y": 0,
-            "text": f"fps: {int(CLOCK.get_fps())}"
-        }
+    game.debug_draw.add_text(
+        layer=6,
+        x=0,
+        y=0,
+        text=f"fps: {int(CLOCK.get_fps())}"
     )
 
+    # REMOVE IN BUILD
+    game.profiler.draw(game.debug_draw)
+
     # Debug draw
+    game.profiler.begin("debug draw")
     game.debug_draw.draw()
+    game.profiler.end("debug draw")
 
-    # Scale the native to window surface
-    scaled_native_surf = pg.transform.scale_by(NATIVE_SURF, game.resolution)
-    game.window_surf.blit(scaled_native_surf, (0, game.y_offset))
-    pg.display.update()
-
-    # Cleanup the just pressed game events for next frame
-    game.is_up_just_pressed = False
-    game.is_down_just_pressed = False
-    game.is_left_just_pressed = False
-    game.is_right_just_pressed = False
+    # REMOVE IN BUILD, what debug draw drew on top must be shown and redrawn under next frame
+    game.dirty_rects.set_overlay_rects(game.debug_draw.drawn_rects)
 
-    game.is_enter_just_pressed = False
-    game.is_pause_just_pressed = False
-    game.is_jump_just_pressed = False
-
-    # Cleanup the just released game events for next frame
-    game.is_up_just_released = False
-    game.is_down_just_released = False
-    game.is_left_just_released = False
-    game.is_right_just_released = False
-
-    game.is_enter_just_released = False
-    game.is_pause_just_released = False
-    game.is_jump_just_released = False
-
-    # REMOVE IN BUILD (Cleanup the just released game events for next frame)
-    game.is_lmb_just_pressed = False
-    game.is_rmb_just_pressed = False
-    game.is_mmb_just_pressed = False
+    # Scale the native to window surface
+    game.profiler.begin("present")
+    game.present()
+    game.profiler.end("present")
 
-    game.is_lmb_just_released = False
-    game.is_rmb_just_released = False
-    game.is_mmb_just_released = False
+    # REMOVE IN BUILD
+    game.profiler.end_frame()
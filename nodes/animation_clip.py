@@ -0,0 +1,52 @@
+from constants import *
+from bisect import bisect_right
+
+
+class AnimationClip:
+    '''
+    How to use:
+        1: Ask the asset manager get animation clips with an animation json path, it makes all clips of it once
+        2: Give the clips to the animator, it plays them
+        3: Ask my get frame index with the time into me, I give back which frame shows then
+
+    What will happen:
+        1: Frames durations are summed once into ends, end time of each frame from my start
+        2: Frame at a time is a binary search in ends, no walking frame by frame, any dt is fine
+        3: Next animation name is turned into the next clip once, by my link
+        4: Regions and durations are lists, no string keys read when playing
+    '''
+
+    def __init__(self, name, animation):
+        # Name, the animation data key
+        self.name = name
+
+        # Loop or not loop
+        self.is_loop = animation["is_loop"] == 1
+
+        # Next animation name, 0 is none, turned into next clip by link
+        self.next_animation = animation["next_animation"]
+        self.next_clip = None
+
+        # Frames
+        self.regions = [frame_data["region"] for frame_data in animation["frames_list"]]
+        self.durations = [frame_data["duration"] for frame_data in animation["frames_list"]]
+        self.last_index = len(self.regions) - 1
+
+        # End time of each frame, frame i shows from ends[i - 1] until ends[i]
+        self.ends = []
+        total = 0
+        for duration in self.durations:
+            total += duration
+            self.ends.append(total)
+
+        # How long I play once
+        self.total = total
+
+    # Turn next animation name into the clip, call after every clip of the data is made
+    def link(self, clips):
+        if self.next_animation != 0:
+            self.next_clip = clips[self.next_animation]
+
+    # Time into me -> frame index, past my end is the last frame
+    def get_frame_index(self, elapsed):
+        return min(bisect_right(self.ends, elapsed), self.last_index)
@@ -0,0 +1,97 @@
+from constants import *
+
+
+class AnimationClock:
+    '''
+    How to use:
+        1: Game owns me, everyone reaches me with game.animation_clock
+        2: Animated backgrounds call my add with their clip and a phase offset, keep the key I give back
+        3: Read the current region with my regions[key], eg. in draw
+        4: Room (or editor) calls my update once per frame
+        5: Stage changed? Room calls my release with the old stage clips, their cursors are dropped
+        6: Input recorder calls my get cursors when it starts and my set cursors on replay
+
+    What will happen:
+        1: Every clip and phase pair has 1 shared cursor, 100 torches of the same clip and phase share 1
+        2: Update moves each cursor once, instances do not update anything
+        3: Phase starts a cursor that many ms into its clip, so tiles can be out of step
+        4: Looping clips wrap around, non looping ones stay on their last frame, no next clip, no callbacks
+    '''
+
+    def __init__(self):
+        # (clip, phase) -> clip
+        self.clips = {}
+
+        # (clip, phase) -> time into the clip
+        self.elapsed = {}
+
+        # (clip, phase) -> when the current frame ends
+        self.frame_ends = {}
+
+        # (clip, phase) -> current frame region
+        self.regions = {}
+
+    # Give back the key of the cursor for this clip and phase, make it if needed
+    def add(self, clip, phase=0):
+        key = (clip, phase)
+
+        # New cursor? Start it phase ms into the clip
+        if key not in self.clips:
+            self.clips[key] = clip
+            self.set_elapsed(key, phase)
+
+        return key
+
+    # Drop the cursors of these clips, animation name -> clip, as the asset manager gives them
+    def release(self, animation_clips):
+        clips = set(animation_clips.values())
+        for key in [key for key, clip in self.clips.items() if clip in clips]:
+            del self.clips[key]
+            del self.elapsed[key]
+            del self.frame_ends[key]
+            del self.regions[key]
+
+    # Every cursor as [clip name, phase, elapsed], json friendly
+    def get_cursors(self):
+        return [[clip.name, key[1], self.elapsed[key]] for key, clip in self.clips.items()]
+
+    # Move cursors back to my get cursors, cursors I do not have are skipped
+    def set_cursors(self, cursors):
+        elapsed = {(name, phase): time for name, phase, time in cursors}
+        for key, clip in self.clips.items():
+            time = elapsed.get((clip.name, key[1]))
+            if time is not None:
+                self.set_elapsed(key, time)
+
+    # Move a cursor to elapsed time, find its frame
+    def set_elapsed(self, key, elapsed):
+        clip = self.clips[key]
+
+        # Past the clip end? Wrap or stay on last frame
+        if elapsed >= clip.total:
+            if clip.is_loop:
+                elapsed %= clip.total
+            else:
+                elapsed = clip.total
+
+        frame_index = clip.get_frame_index(elapsed)
+        self.elapsed[key] = elapsed
+        self.frame_ends[key] = clip.ends[frame_index]
+        self.regions[key] = clip.regions[frame_index]
+
+        # Stopped on last frame? It never ends, update skips it
+        if elapsed == clip.total:
+            self.frame_ends[key] = float("inf")
+
+    def update(self, dt):
+        elapsed = self.elapsed
+        frame_ends = self.frame_ends
+
+        for key in self.clips:
+            # Still in current frame? Only count the time
+            time = elapsed[key] + dt
+            if time < frame_ends[key]:
+                elapsed[key] = time
+                continue
+
+            self.set_elapsed(key, time)
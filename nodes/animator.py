@@ -3,48 +3,37 @@ from constants import *
 
 class Animator:
     '''
-    How to use: 
-        1: Give me animation data
+    How to use:
+        1: Give me animation clips, ask the asset manager get animation clips for them
         2: Starting animation
         3: Run my update callback
+        4: Give me a frame atlas too, then I also put the (frame, flipped frame) surfaces in owner frame
 
     What will happen:
-        1: Timer counts until current animation frame duration
-        2: If it is time to cycle to next frame, timer is 0 and go to next frame
-        3: Check if next frame is last
-        4: If it is last loop or not loop?
-        5: Update owner region with updated frame
-        6: If it is last and do not loop, got next animation?
-        7: Got next animation? play it, reset timer and frame index
+        1: Elapsed counts the time into the current clip
+        2: While elapsed is inside the current frame, update is 1 add and 1 compare
+        3: Past the frame? Clip finds the frame at elapsed with a binary search, many frames can be skipped in 1 update
+        4: Past the clip end and it loops? Elapsed wraps around
+        5: Past the clip end and it does not loop, got next clip? Play it, with the time left over
+        6: Past the clip end and no next clip? Stay on last frame, call animation end callback
+        7: Update owner region with updated frame, and owner frame if I got a frame atlas
     '''
 
-    def __init__(self, owner, animation_data, initial_animation_name):
+    def __init__(self, owner, animation_clips, initial_animation_name, frame_atlas=None):
         # Owner
         self.owner = owner
 
-        # Animation data
-        self.animation_data = animation_data
+        # Cut frame surfaces, None means owner blits with region
+        self.frame_atlas = frame_atlas
 
-        # Get current animation data
-        self.current_animation = initial_animation_name
-        self.is_loop = self.animation_data[self.current_animation]["is_loop"]
-        self.next_animation = self.animation_data[self.current_animation]["next_animation"]
-        self.frames_list = self.animation_data[self.current_animation]["frames_list"]
-        self.frames_list_len = len(self.frames_list)
-        self.frames_list_i_len = self.frames_list_len - 1
-        self.frame_index = 0
-        self.timer = 0
-
-        # Frame data
-        self.frame_data = self.frames_list[self.frame_index]
-        self.owner.region = self.frame_data["region"]
-        self.duration = self.frame_data["duration"]
+        # Animation name -> compiled clip
+        self.animation_clips = animation_clips
 
         # Callbacks
         self.listener_end = []
 
-        # Done
-        self.is_done = False
+        # Get current animation clip
+        self.set_current_animation(initial_animation_name)
 
     def add_event_listener(self, value, event):
         if event == "animation_end":
@@ -52,61 +41,80 @@ class Animator:
 
     def set_current_animation(self, value):
         # Calling the same animation name when it is playing will reset it to start
+        self.set_clip(self.animation_clips[value], 0)
+
+    # Play a clip from elapsed time into it
+    def set_clip(self, clip, elapsed):
         self.is_done = False
 
-        # Get current animation data
-        self.current_animation = value
-        self.is_loop = self.animation_data[self.current_animation]["is_loop"]
-        self.next_animation = self.animation_data[self.current_animation]["next_animation"]
-        self.frames_list = self.animation_data[self.current_animation]["frames_list"]
-        self.frames_list_len = len(self.frames_list)
-        self.frames_list_i_len = self.frames_list_len - 1
-        self.set_frame_index(0)
-        self.timer = 0
+        # Get current animation clip
+        self.clip = clip
+        self.current_animation = clip.name
+        self.elapsed = elapsed
+
+        # Frame surfaces
+        if self.frame_atlas is not None:
+            self.frames = self.frame_atlas.animations[clip.name]
+
+        self.set_frame_index(clip.get_frame_index(elapsed))
 
     def set_frame_index(self, value):
         # Update frame index
         self.frame_index = value
 
-        # On last frame?
-        if self.frame_index > self.frames_list_i_len:
-            # This anim loop?
-            if self.is_loop == 1:
-                # Reset frame index
-                self.frame_index = 0
+        # Update frame data, when this frame ends
+        self.frame_end = self.clip.ends[value]
+        self.owner.region = self.clip.regions[value]
 
-            # This anim do not loop?
-            else:
-                # Stay on last frame
-                self.frame_index -= 1
+        # Update frame surfaces
+        if self.frame_atlas is not None:
+            self.owner.frame = self.frames[value]
+
+    # Elapsed is past the current frame, find the frame it is in now
+    def advance(self):
+        clip = self.clip
+        elapsed = self.elapsed
+
+        # Past the clip end? Loop, go to next clip or stop
+        while elapsed >= clip.total:
+            # This clip loop? Wrap around
+            if clip.is_loop:
+                elapsed %= clip.total
+                break
 
-                # Did not loop, this anim has transition animation?
-                if self.next_animation != 0:
-                    # Play next anim, do not call animation end callback
-                    self.set_current_animation(self.next_animation)
-                    return
+            # Did not loop, no transition clip?
+            if clip.next_clip is None:
+                # Stay on last frame
+                self.elapsed = clip.total
+                self.set_frame_index(clip.last_index)
 
                 # Call animation end callback
                 self.is_done = True
                 for callback in self.listener_end:
                     callback()
-
-                # If staying on last frame no need to update data
                 return
 
-        # Update frame data
-        self.frame_data = self.frames_list[self.frame_index]
-        self.owner.region = self.frame_data["region"]
-        self.duration = self.frame_data["duration"]
+            # Play next clip with the time left, do not call animation end callback
+            elapsed -= clip.total
+            clip = clip.next_clip
+
+        # Went to another clip?
+        if clip is not self.clip:
+            self.set_clip(clip, elapsed)
+            return
+
+        self.elapsed = elapsed
+        self.set_frame_index(clip.get_frame_index(elapsed))
 
     def update(self, dt):
         # If I am done no need to update
         if self.is_done == True:
             return
 
-        # region update timer, set frame index
-        self.timer += dt
-        if self.timer >= self.duration:
-            self.timer = 0
-            self.set_frame_index(self.frame_index + 1)
-        # endregion update timer, set frame index
+        # Still in current frame? Nothing to change
+        self.elapsed += dt
+        if self.elapsed < self.frame_end:
+            return
+
+        self.advance()
+
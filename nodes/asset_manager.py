@@ -0,0 +1,136 @@
+from constants import *
+from nodes.animation_clip import AnimationClip
+from nodes.frame_atlas import FrameAtlas
+from collections import deque
+from os.path import getsize
+from time import perf_counter_ns
+
+
+class AssetManager:
+    '''
+    How to use:
+        1: Game owns me, everyone reaches me with game.asset_manager
+        2: Ask my get surface, get json, get sound, get frame atlas or get animation clips with the asset path and a group name, eg. "stage_1", "player"
+        3: When a group is not needed anymore (stage changed), call my release group
+        4: Call my save to dump a csv of every loaded asset, its load time and memory
+
+    What will happen:
+        1: Each path is loaded once, asking again gives back the same surface / dict / sound
+        2: Surfaces are converted to the display format with alpha, so they blit fast
+        3: Every group that asked for an asset holds a reference to it
+        4: Releasing a group drops its references, assets that no group holds are evicted
+        5: Json data is shared, do not change it in place
+    '''
+
+    def __init__(self, evicted_size=256):
+        # Path -> {"asset", "kind", "groups", "load_ms", "bytes"}
+        self.assets = {}
+
+        # Last evicted asset rows, so save still shows them, oldest dropped
+        self.evicted = deque(maxlen=evicted_size)
+
+    # Give back the loaded asset for path, load it with the given loader first if needed
+    def get(self, path, group, kind, loader):
+        record = self.assets.get(path)
+
+        # Not loaded yet? Load and time it
+        if record is None:
+            start = perf_counter_ns()
+            asset = loader(path)
+            load_ms = (perf_counter_ns() - start) / 1000000
+
+            record = {
+                "asset": asset,
+                "kind": kind,
+                "groups": set(),
+                "load_ms": load_ms,
+                "bytes": self.get_bytes(path, kind, asset),
+            }
+            self.assets[path] = record
+
+        # Group holds a reference now
+        record["groups"].add(group)
+        return record["asset"]
+
+    def get_surface(self, path, group):
+        return self.get(
+            path, group, "surface",
+            lambda path: pg.image.load(path).convert_alpha()
+        )
+
+    def get_json(self, path, group):
+        return self.get(path, group, "json", self.load_json)
+
+    def get_sound(self, path, group):
+        return self.get(path, group, "sound", pg.mixer.Sound)
+
+    # Frames of a sprite sheet cut by its animation data, the sheets themselves are not kept
+    def get_frame_atlas(self, path, animation_data, group, flip_path=None):
+        return self.get(
+            f"{path} frames", group, "atlas",
+            lambda _: FrameAtlas(path, animation_data, flip_path)
+        )
+
+    # Animation name -> compiled clip of an animation json, next animations already linked
+    def get_animation_clips(self, path, group):
+        return self.get(
+            f"{path} clips", group, "clips",
+            lambda _: self.load_animation_clips(self.get_json(path, group))
+        )
+
+    def load_animation_clips(self, animation_data):
+        animation_clips = {}
+        for name, animation in animation_data.items():
+            animation_clips[name] = AnimationClip(name, animation)
+
+        # Every clip is made, now turn next animation names into clips
+        for clip in animation_clips.values():
+            clip.link(animation_clips)
+
+        return animation_clips
+
+    def load_json(self, path):
+        with open(path, "r") as data:
+            return load(data)
+
+    # Memory of an asset, surfaces and atlases are counted in pixels, the rest by file size
+    def get_bytes(self, path, kind, asset):
+        # Clips are small lists, count them as their json
+        if kind == "clips":
+            path = path.removesuffix(" clips")
+
+        if kind == "surface":
+            return asset.get_width() * asset.get_height() * asset.get_bytesize()
+
+        if kind == "atlas":
+            return asset.get_bytes()
+
+        return getsize(path)
+
+    # Drop the group references, evict what no group holds anymore
+    def release_group(self, group):
+        for path in list(self.assets):
+            record = self.assets[path]
+            record["groups"].discard(group)
+
+            # Nobody holds it? Evict
+            if not record["groups"]:
+                del self.assets[path]
+                del record["asset"]
+                self.evicted.append((path, record))
+
+    # Write every asset, loaded or evicted, 1 row each
+    def save(self, path="assets.csv"):
+        with open(path, "w") as csv_file:
+            csv_file.write("path,kind,groups,load ms,bytes\n")
+
+            rows = [
+                (asset_path, record) for asset_path, record in self.assets.items()
+            ] + list(self.evicted)
+
+            for asset_path, record in rows:
+                groups = " ".join(sorted(record["groups"])) or "evicted"
+                csv_file.write(
+                    f"{asset_path},{record["kind"]},{groups},"
+                    f"{record["load_ms"]:.4f},{record["bytes"]}\n"
+                )
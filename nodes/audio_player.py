@@ -2,11 +2,17 @@ import pygame
 
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, asset_manager=None):
         self.sounds = {}
 
+        # Loads each wav once, shared by every scene
+        self.asset_manager = asset_manager
+
     def load_sound(self, name, path):
-        sound = pygame.mixer.Sound(path)
+        if self.asset_manager:
+            sound = self.asset_manager.get_sound(path, "sounds")
+        else:
+            sound = pygame.mixer.Sound(path)
         self.sounds[name] = sound
 
     def play_sound(self, name, loop=0):
@@ -2,131 +2,148 @@ from constants import *
 
 
 class Background:
-    def __init__(self, sprite_sheet, camera, stage_no, desired_background_names):
-        self.sprite_sheet_surf = sprite_sheet
+    '''
+    How to use:
+        1: Give me the asset manager, stage sprite sheet, camera, stage number and the background names the room wants
+        2: Background layers are declared in the stage room editor json "backgrounds" list, drawn in that order
+        3: Call my draw right after the scene cleared native surface, before anything else is drawn
+        4: Room changed? Call my update prop, I only reload the stage layers when stage changes
+        5: Stage assets released? Call my release first, I drop the strips and the sprite sheet
+
+    What will happen:
+        1: Each layer region is cut once into its own strip surface, placed on every offset, strip is w by h
+        2: Strip is repeated on the tiled axis so it is wrap ready, 1 blit with an area covers the whole screen
+        3: Layer scrolls by the camera times its scroll factor, floored to int
+        4: All wanted layers are composited into 1 cached surface, on top of what native had under it
+        5: The cache is only re-rendered when the int scroll offset of some layer changes, else it is 1 blit
+    '''
+
+    def __init__(self, asset_manager, sprite_sheet, camera, stage_no, desired_background_names):
         self.camera = camera
-        self.stage_no = stage_no
-        self.desired_background_names = desired_background_names
+
+        # Stage json is read through it, in the stage group
+        self.asset_manager = asset_manager
+
+        # Composited layers, same size and format as native
+        self.cache_surface = pg.Surface((NATIVE_W, NATIVE_H))
+
+        # Each layer blit pos and area of the last render, None forces a render
+        self.cache_key = None
+
+        # Stage layer data and strip surfaces, set by update prop
+        self.stage_no = None
+        self.sprite_sheet_surf = None
+        self.update_prop(sprite_sheet, stage_no, desired_background_names)
 
     def update_prop(self, sprite_sheet, stage_no, desired_background_names):
-        self.sprite_sheet_surf = sprite_sheet
-        self.stage_no = stage_no
+        # New stage or sprite sheet? Read its layers and cut the strips again
+        if stage_no != self.stage_no or sprite_sheet is not self.sprite_sheet_surf:
+            self.sprite_sheet_surf = sprite_sheet
+            self.stage_no = stage_no
+
+            # Read stage data for its background layers
+            self.stage_layers = self.asset_manager.get_json(
+                JSONS_PATHS[f"stage_{self.stage_no}_room_editor.json"],
+                f"stage_{self.stage_no}"
+            ).get("backgrounds", [])
+
+            # Layer name -> its wrap ready strip surface
+            self.strips = {}
+            for layer in self.stage_layers:
+                self.strips[layer["name"]] = self.cut_strip(layer)
+
+        # Only the layers this room wants, in stage order
         self.desired_background_names = desired_background_names
+        self.layers = [
+            layer for layer in self.stage_layers
+            if layer["name"] in self.desired_background_names
+        ]
 
-    def draw(self):
-        # Stage 1 backgrounds
-        if self.stage_no == 1:
-            if "sky" in self.desired_background_names:
-                x = (-self.camera.rect.x * 0.05) % NATIVE_W
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, 0), (0, 0, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, 0), (0, 0, 320, 160)
-                )
+        # Force a render on next draw
+        self.cache_key = None
 
-            if "clouds" in self.desired_background_names:
-                x = (-self.camera.rect.x * 0.1) % NATIVE_W
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, 0), (0, 160, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, 0), (0, 160, 320, 160)
-                )
+    # Drop the strips and sprite sheet, so a released stage group really frees them, next update prop cuts again
+    def release(self):
+        self.sprite_sheet_surf = None
+        self.stage_no = None
+        self.stage_layers = []
+        self.strips = {}
+        self.layers = []
+        self.cache_key = None
 
-            if "temple" in self.desired_background_names:
-                x = (-self.camera.rect.x * 0.25) % NATIVE_W
-                y = (-self.camera.rect.y * 0.25) % NATIVE_H
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, y), (0, 320, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, y), (0, 320, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, y - NATIVE_H), (0, 320, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, y - NATIVE_H), (0, 320, 320, 160)
-                )
+    # Cut the layer region once into a strip surface, repeated on the tiled axis
+    def cut_strip(self, layer):
+        w = layer.get("w", NATIVE_W)
+        h = layer.get("h", NATIVE_H)
 
-            if "trees" in self.desired_background_names:
-                x = (-self.camera.rect.x * 0.5) % NATIVE_W
-                # 1
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, 32), (432, 368, 80, 144)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, 32), (432, 368, 80, 144)
-                )
-                # 2
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf, (x + 96, 64),
-                    (432, 368, 80, 144)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x + 96 - NATIVE_W, 64), (432, 368, 80, 144)
-                )
-                # 3
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf, (x + 160, 32),
-                    (432, 368, 80, 144)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x + 160 - NATIVE_W, 32), (432, 368, 80, 144)
-                )
-                # 4
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf, (x + 224, 16),
-                    (432, 368, 80, 144)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x + 224 - NATIVE_W, 16), (432, 368, 80, 144)
-                )
+        # Tiled axis gets enough copies so a screen sized area always fits
+        copies_x = ceil(NATIVE_W / w) + 1 if layer["is_tile_x"] else 1
+        copies_y = ceil(NATIVE_H / h) + 1 if layer["is_tile_y"] else 1
 
-            if "blue_glow" in self.desired_background_names:
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (0, 48), (0, 480, 320, 128)
-                )
+        strip = pg.Surface((w * copies_x, h * copies_y), pg.SRCALPHA)
 
-        # Stage 2 backgrounds
-        if self.stage_no == 2:
-            if "rock" in self.desired_background_names:
-                x = (-self.camera.rect.x * 0.25) % NATIVE_W
-                y = (-self.camera.rect.y * 0.25) % NATIVE_H
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, y), (0, 0, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, y), (0, 0, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x, y - NATIVE_H), (0, 0, 320, 160)
-                )
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (x - NATIVE_W, y - NATIVE_H), (0, 0, 320, 160)
-                )
+        for copy_y in range(copies_y):
+            for copy_x in range(copies_x):
+                for offset in layer["offsets"]:
+                    x = copy_x * w + offset[0]
+                    y = copy_y * h + offset[1]
+
+                    # Region pos in strip, also 1 strip to the left and up on tiled axis, so wrapped parts show
+                    strip.blit(self.sprite_sheet_surf, (x, y), layer["region"])
+                    if layer["is_tile_x"]:
+                        strip.blit(
+                            self.sprite_sheet_surf, (x - w, y), layer["region"]
+                        )
+                    if layer["is_tile_y"]:
+                        strip.blit(
+                            self.sprite_sheet_surf, (x, y - h), layer["region"]
+                        )
 
-            if "orange_glow" in self.desired_background_names:
-                NATIVE_SURF.blit(
-                    self.sprite_sheet_surf,
-                    (0, 48), (0, 160, 320, 128)
+        return strip
+
+    # Layer blit pos and area from camera
+    def get_blit(self, layer):
+        # Int scroll offset
+        x = floor(-self.camera.rect.x * layer["scroll_x"])
+        y = floor(-self.camera.rect.y * layer["scroll_y"])
+
+        # Tiled axis always blits at 0 and moves the area instead, else the strip moves
+        if layer["is_tile_x"]:
+            area_x = -x % layer.get("w", NATIVE_W)
+            x = 0
+        else:
+            area_x = 0
+
+        if layer["is_tile_y"]:
+            area_y = -y % layer.get("h", NATIVE_H)
+            y = 0
+        else:
+            area_y = 0
+
+        return (x, y, area_x, area_y)
+
+    def draw(self):
+        # No layers? Nothing to draw
+        if not self.layers:
+            return
+
+        # Get every layer blit
+        blits = [self.get_blit(layer) for layer in self.layers]
+        key = tuple(blits)
+
+        # Some layer moved? Re-render the cache
+        if key != self.cache_key:
+            self.cache_key = key
+
+            # Layers are drawn on top of what native had under them
+            self.cache_surface.blit(NATIVE_SURF, (0, 0))
+
+            for layer, (x, y, area_x, area_y) in zip(self.layers, blits):
+                self.cache_surface.blit(
+                    self.strips[layer["name"]],
+                    (x, y),
+                    (area_x, area_y, NATIVE_W, NATIVE_H)
                 )
+
+        # Draw the cache
+        NATIVE_SURF.blit(self.cache_surface, (0, 0))
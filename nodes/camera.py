@@ -82,26 +82,20 @@ class Camera:
                 x = (NATIVE_W // 2) - 1
                 y = (NATIVE_H // 2) - 1
 
-                self.game.debug_draw.add(
-                    {
-                        "type": "line",
-                        "layer": 5,
-                        "start": (x, (NATIVE_H // 2) + 3),
-                        "end": (x, (NATIVE_H // 2) - 4),
-                        "color": "red",
-                        "width": 2
-                    }
+                self.game.debug_draw.add_line(
+                    layer=5,
+                    color="red",
+                    start=(x, (NATIVE_H // 2) + 3),
+                    end=(x, (NATIVE_H // 2) - 4),
+                    width=2
                 )
 
-                self.game.debug_draw.add(
-                    {
-                        "type": "line",
-                        "layer": 5,
-                        "start": ((NATIVE_W // 2) + 3, y),
-                        "end": ((NATIVE_W // 2) - 4, y),
-                        "color": "red",
-                        "width": 2
-                    }
+                self.game.debug_draw.add_line(
+                    layer=5,
+                    color="red",
+                    start=((NATIVE_W // 2) + 3, y),
+                    end=((NATIVE_W // 2) - 4, y),
+                    width=2
                 )
 
                 # Draw target
@@ -110,12 +104,9 @@ class Camera:
                 x = target_center_x - self.rect.x
                 y = target_center_y - self.rect.y
 
-                self.game.debug_draw.add(
-                    {
-                        "type": "circle",
-                        "layer": 5,
-                        "color": "yellow",
-                        "center": (x, y),
-                        "radius": 2
-                    }
+                self.game.debug_draw.add_circle(
+                    layer=5,
+                    color="yellow",
+                    center=(x, y),
+                    radius=2
                 )
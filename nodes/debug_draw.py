@@ -2,79 +2,157 @@ from constants import *
 
 
 class DebugDraw:
+    '''
+    How to use:
+        1: Game owns me, everyone reaches me with game.debug_draw
+        2: Add what to draw with my add text, add rect, add line, add circle or add surf, give the layer first
+        3: Main loop calls my draw once every frame, after the scene drew
 
-    def __init__(self):
-        self.layers = [
-            [],
-            [],
-            [],
-            [],
-            [],
-            [],
-            [],
-        ]
-
-    def add(self, obj):
-        layer = obj["layer"]
-        self.layers[layer].append(obj)
+    What will happen:
+        1: Each add puts 1 tuple in its layer buffer, kind first, no dict per call
+        2: Draw goes layer 0 to 6, each layer in add order, higher layers are on top
+        3: Color names are turned into colors once and remembered
+        4: Rects in a row are drawn in 1 tight loop, filled ones with fill, a rect added again later in the row is only drawn there
+        5: Buffers are kept between frames, draw only resets how many commands each has
+    '''
+
+    # Command kinds, first item of every command tuple
+    TEXT = 0
+    RECT = 1
+    LINE = 2
+    CIRCLE = 3
+    SURF = 4
+
+    def __init__(self, layers_total=7):
+        # Command tuples per layer, kept between frames, only the first count of each are live
+        self.layers = [[] for _ in range(layers_total)]
+
+        # Live commands per layer
+        self.counts = [0] * layers_total
+
+        # Color name -> color
+        self.colors = {}
+
+        # Rects drawn on native by the last draw, so dirty rects can redraw under them
+        self.drawn_rects = []
+
+    # Put a command in its layer buffer, reuse the slot of an old one if there is
+    def add_command(self, layer, command):
+        count = self.counts[layer]
+        buffer = self.layers[layer]
+        if count < len(buffer):
+            buffer[count] = command
+        else:
+            buffer.append(command)
+        self.counts[layer] = count + 1
+
+    def add_text(self, layer, x, y, text):
+        self.add_command(layer, (self.TEXT, x, y, text))
+
+    def add_rect(self, layer, color, rect, width=0):
+        self.add_command(layer, (self.RECT, color, rect, width))
+
+    def add_line(self, layer, color, start, end, width=1):
+        self.add_command(layer, (self.LINE, color, start, end, width))
+
+    def add_circle(self, layer, color, center, radius):
+        self.add_command(layer, (self.CIRCLE, color, center, radius))
+
+    def add_surf(self, layer, surf, x, y):
+        self.add_command(layer, (self.SURF, surf, x, y))
+
+    # Color name -> color, converted once
+    def get_color(self, name):
+        color = self.colors.get(name)
+        if color is None:
+            color = pg.Color(name)
+            self.colors[name] = color
+        return color
+
+    # Draw a row of rect commands, start to end of buffer
+    def draw_rects(self, buffer, start, end):
+        # Keep only the last of each same rect, it is drawn over the earlier ones anyway, pixels stay the same
+        seen = set()
+        rects = []
+        for i in range(end - 1, start - 1, -1):
+            _, color, rect, width = buffer[i]
+            key = (color, tuple(rect), width)
+            if key not in seen:
+                seen.add(key)
+                rects.append((color, rect, width))
+
+        # Back in add order
+        drawn_rects = self.drawn_rects
+        get_color = self.get_color
+        for color, rect, width in reversed(rects):
+            # Filled? Fill is the fast path
+            if width == 0:
+                drawn_rect = NATIVE_SURF.fill(get_color(color), rect)
+            else:
+                drawn_rect = pg.draw.rect(NATIVE_SURF, get_color(color), rect, width)
+            drawn_rects.append(drawn_rect)
 
     def draw(self):
+        # Forget last draw rects
+        self.drawn_rects = []
+
         # Loop over each layer
-        for layer in self.layers:
-            for obj in layer:
+        for layer_no, buffer in enumerate(self.layers):
+            count = self.counts[layer_no]
+
+            i = 0
+            while i < count:
+                command = buffer[i]
+                kind = command[0]
+
+                # Rect? Draw it and every rect right after it together
+                if kind == self.RECT:
+                    end = i + 1
+                    while end < count and buffer[end][0] == self.RECT:
+                        end += 1
+                    self.draw_rects(buffer, i, end)
+                    i = end
+                    continue
 
                 # Text?
-                if obj["type"] == "text":
-                    FONT.render_to(
+                if kind == self.TEXT:
+                    _, x, y, text = command
+                    drawn_rect = FONT.render_to(
                         NATIVE_SURF,
-                        (obj["x"], obj["y"]),
-                        obj["text"],
+                        (x, y),
+                        text,
                         "white",
                         "black"
                     )
 
-                # Rect?
-                elif obj["type"] == "rect":
-                    pg.draw.rect(
+                # Line?
+                elif kind == self.LINE:
+                    _, color, start, end, width = command
+                    drawn_rect = pg.draw.line(
                         NATIVE_SURF,
-                        obj["color"],
-                        obj["rect"],
-                        obj["width"],
+                        self.get_color(color),
+                        start,
+                        end,
+                        width,
                     )
 
-                # Rect?
-                elif obj["type"] == "line":
-                    pg.draw.line(
+                # Circle?
+                elif kind == self.CIRCLE:
+                    _, color, center, radius = command
+                    drawn_rect = pg.draw.circle(
                         NATIVE_SURF,
-                        obj["color"],
-                        obj["start"],
-                        obj["end"],
-                        obj["width"],
+                        self.get_color(color),
+                        center,
+                        radius,
                     )
 
-                # Rect?
-                elif obj["type"] == "circle":
-                    pg.draw.circle(
-                        NATIVE_SURF,
-                        obj["color"],
-                        obj["center"],
-                        obj["radius"],
-                    )
+                # Surf?
+                elif kind == self.SURF:
+                    _, surf, x, y = command
+                    drawn_rect = NATIVE_SURF.blit(surf, (x, y))
 
-                # Rect?
-                elif obj["type"] == "surf":
-                    NATIVE_SURF.blit(
-                        obj["surf"],
-                        (obj["x"], obj["y"]),
-                    )
+                self.drawn_rects.append(drawn_rect)
+                i += 1
 
-        # Empty it
-        self.layers = [
-            [],
-            [],
-            [],
-            [],
-            [],
-            [],
-            [],
-        ]
+            # Empty it, keep the buffer, old tuples are overwritten next frame
+            self.counts[layer_no] = 0
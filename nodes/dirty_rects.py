@@ -0,0 +1,143 @@
+from constants import *
+
+
+class DirtyRects:
+    '''
+    How to use:
+        1: Game owns me, only used when game render mode is "dirty"
+        2: Scene calls my begin once at the start of its draw, give me a key of everything that changes the whole screen
+        3: Then everything that draws tells me where it draws and how it looks with my track, key it with itself
+        4: Scene calls my end tracking, then draws once per draw rect with it set as native clip
+        5: Debug draw gives me what it drew on top with my set overlay rects
+        6: Game present asks my present rects, then calls my end frame
+
+    What will happen:
+        1: Different begin key (camera moved, room changed, curtain faded) marks the whole screen dirty
+        2: A tracked thing whose screen rect or look changed marks its old and new rect dirty
+        3: A thing tracked last frame but not this frame (left camera, hidden) marks its old rect dirty
+        4: Last frame overlay rects are dirty too, so the scene draws over them
+        5: Scenes that never call begin are always presented whole
+        6: Nothing changed? No clip rects and no present rects, the frame costs nearly nothing
+        7: More clip rects than max clip draws? Scene draws once clipped to their union, not once per rect
+    '''
+
+    def __init__(self):
+        # Whole native rect
+        self.screen_rect = pg.Rect(0, 0, NATIVE_W, NATIVE_H)
+
+        # Whole screen changed this frame, scenes that do not call begin keep it true
+        self.is_full = True
+
+        # Key of the last begin
+        self.frame_key = None
+
+        # Dirty native rects of this frame
+        self.rects = []
+
+        # Key -> (screen rect, look) of last frame and of this frame
+        self.last_tracked = {}
+        self.tracked = {}
+
+        # Native rects drawn on top after the scene, presented this frame and redrawn next frame
+        self.overlay_rects = []
+
+        # Most scene draws per frame, each draw redraws everything under its clip, past this 1 draw clipped to the union is cheaper
+        self.max_clip_draws = 2
+
+    def begin(self, frame_key):
+        # Whole screen changed? Draw and present it all
+        if frame_key != self.frame_key:
+            self.frame_key = frame_key
+            self.is_full = True
+
+        else:
+            self.is_full = False
+
+            # Redraw what was drawn on top last frame
+            for rect in self.overlay_rects:
+                self.add(rect)
+
+    # Mark a native rect dirty, clipped to screen
+    def add(self, rect):
+        rect = self.screen_rect.clip(rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+
+    # Called by everything that draws, xds yds w h is where it draws on native, look is anything that changes its pixels
+    def track(self, key, xds, yds, w, h, look):
+        # Draw coords may be floats, grow by 1 so the truncated blit is covered
+        rect = pg.Rect(floor(xds), floor(yds), ceil(w) + 1, ceil(h) + 1)
+        self.tracked[key] = (rect, look)
+
+        # Whole screen is redrawn anyway
+        if self.is_full:
+            return
+
+        # Moved or changed look? Old and new place are dirty
+        last = self.last_tracked.get(key)
+        if last is None:
+            self.add(rect)
+
+        elif last[0] != rect or last[1] != look:
+            self.add(last[0])
+            self.add(rect)
+
+    def end_tracking(self):
+        # Gone since last frame? Its old place is dirty
+        if not self.is_full:
+            for key, (rect, look) in self.last_tracked.items():
+                if key not in self.tracked:
+                    self.add(rect)
+
+        # This frame becomes last frame
+        self.last_tracked, self.tracked = self.tracked, self.last_tracked
+        self.tracked.clear()
+
+    # Native clip rects for the scene draw, touching dirty rects are merged, empty if nothing needs drawing
+    def get_clip_rects(self):
+        if self.is_full:
+            return [self.screen_rect]
+
+        merged = []
+        for rect in self.rects:
+            rect = rect.copy()
+
+            # Swallow every merged rect it touches, check again since it grew
+            i = 0
+            while i < len(merged):
+                if rect.colliderect(merged[i]):
+                    rect.union_ip(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+
+            merged.append(rect)
+
+        # Keep them, present shows the same rects
+        self.rects = merged
+        return merged
+
+    # Native clip rects to draw the scene once each, few clip rects are drawn 1 by 1, many as 1 union
+    def get_draw_rects(self):
+        clip_rects = self.get_clip_rects()
+        if len(clip_rects) <= self.max_clip_draws:
+            return clip_rects
+
+        # Outside the dirty rects the union redraws what is already there, only the dirty rects are presented
+        return [clip_rects[0].unionall(clip_rects[1:])]
+
+    # Called after debug draw with what it drew
+    def set_overlay_rects(self, rects):
+        self.overlay_rects = [self.screen_rect.clip(rect) for rect in rects]
+
+    # Native rects to show this frame
+    def get_present_rects(self):
+        if self.is_full:
+            return [self.screen_rect]
+
+        return self.rects + self.overlay_rects
+
+    # Called by game present at the end of every frame
+    def end_frame(self):
+        self.rects.clear()
+        self.is_full = True
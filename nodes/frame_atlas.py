@@ -0,0 +1,61 @@
+from constants import *
+from os.path import exists
+
+
+class FrameAtlas:
+    '''
+    How to use:
+        1: Ask the asset manager get frame atlas with a sprite sheet path and its animation data, it makes me once
+        2: Give the flip sprite sheet path too if the flipped frames were touched by hand, else leave it out
+        3: Give me to the animator, it puts the (frame, flipped frame) of the current frame in owner frame
+        4: Owner draws with a plain blit of owner frame[is flipped], no region
+
+    What will happen:
+        1: Every region the animation data uses is cut once into its own small surface
+        2: Flipped frames are cut from the flip sprite sheet if there is one, else made with transform flip
+        3: Sprite sheets are dropped after, only used frames stay in memory
+        4: Same region in many animations is cut once and shared
+    '''
+
+    def __init__(self, sprite_sheet_path, animation_data, sprite_sheet_flip_path=None):
+        # Sheets are only needed while cutting
+        sprite_sheet = pg.image.load(sprite_sheet_path).convert_alpha()
+        sprite_sheet_flip = None
+        if sprite_sheet_flip_path is not None and exists(sprite_sheet_flip_path):
+            sprite_sheet_flip = pg.image.load(sprite_sheet_flip_path).convert_alpha()
+
+        # Region tuple -> (frame, flipped frame)
+        self.frames = {}
+
+        # Animation name -> (frame, flipped frame) of each frame in frames list order
+        self.animations = {}
+
+        for animation_name, animation in animation_data.items():
+            animation_frames = []
+
+            for frame_data in animation["frames_list"]:
+                region = tuple(frame_data["region"])
+
+                # Not cut yet? Cut it and its flipped one
+                if region not in self.frames:
+                    frame = sprite_sheet.subsurface(region).copy()
+
+                    # Flip sheet frames are flipped in place, same region
+                    if sprite_sheet_flip is not None:
+                        flipped_frame = sprite_sheet_flip.subsurface(region).copy()
+                    else:
+                        flipped_frame = pg.transform.flip(frame, True, False)
+
+                    self.frames[region] = (frame, flipped_frame)
+
+                animation_frames.append(self.frames[region])
+
+            self.animations[animation_name] = animation_frames
+
+    # Memory of every frame surface
+    def get_bytes(self):
+        total = 0
+        for frame, flipped_frame in self.frames.values():
+            total += frame.get_width() * frame.get_height() * frame.get_bytesize()
+            total += flipped_frame.get_width() * flipped_frame.get_height() * flipped_frame.get_bytesize()
+        return total
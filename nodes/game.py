@@ -4,6 +4,12 @@ from scenes.room_editor import RoomEditor
 from scenes.world import World
 from nodes.audio_player import SoundManager
 from nodes.debug_draw import DebugDraw
+from nodes.profiler import Profiler
+from nodes.dirty_rects import DirtyRects
+from nodes.asset_manager import AssetManager
+from nodes.animation_clock import AnimationClock
+from nodes.input_recorder import InputRecorder
+from nodes.input import Input
 from actors.fire import Fire
 from actors.goblin import Goblin
 from actors.twin_goddess import TwinGoddess
@@ -17,6 +23,12 @@ class Game:
         # REMOVE IN BUILD, for everyone to use
         self.debug_draw = DebugDraw()
 
+        # REMOVE IN BUILD, for everyone to time their scopes
+        self.profiler = Profiler()
+
+        # REMOVE IN BUILD, records input flags and dt per frame for replay input script
+        self.input_recorder = InputRecorder()
+
         # Game resolution and window
         self.resolution = 6
         self.window_w = WINDOW_W * self.resolution
@@ -24,60 +36,51 @@ class Game:
         self.window_surf = pg.display.set_mode((self.window_w, self.window_h))
         self.y_offset = ((WINDOW_H - NATIVE_H) // 2) * self.resolution
 
-        # Game input flags
-        self.is_up_pressed = False
-        self.is_down_pressed = False
-        self.is_left_pressed = False
-        self.is_right_pressed = False
-
-        self.is_up_just_pressed = False
-        self.is_down_just_pressed = False
-        self.is_left_just_pressed = False
-        self.is_right_just_pressed = False
-
-        self.is_up_just_released = False
-        self.is_down_just_released = False
-        self.is_left_just_released = False
-        self.is_right_just_released = False
-
-        self.is_lmb_pressed = False
-        self.is_rmb_pressed = False
-        self.is_mmb_pressed = False
-
-        self.is_lmb_just_pressed = False
-        self.is_rmb_just_pressed = False
-        self.is_mmb_just_pressed = False
-
-        self.is_lmb_just_released = False
-        self.is_rmb_just_released = False
-        self.is_mmb_just_released = False
-
-        self.is_enter_pressed = False
-        self.is_pause_pressed = False
-        self.is_jump_pressed = False
-
-        self.is_enter_just_pressed = False
-        self.is_pause_just_pressed = False
-        self.is_jump_just_pressed = False
-
-        self.is_enter_just_released = False
-        self.is_pause_just_released = False
-        self.is_jump_just_released = False
-
-        # Game keybindings
-        self.key_bindings = {
-            "up": pg.K_UP,
-            "down": pg.K_DOWN,
-            "left": pg.K_LEFT,
-            "right": pg.K_RIGHT,
-            "enter": pg.K_RETURN,
-            "pause": pg.K_ESCAPE,
-            "jump": pg.K_c,
+        # Where native surface is scaled into every frame, created once per resolution
+        self.set_present_surf()
+
+        # How scenes render, "full" redraws and shows the whole screen, "dirty" only what changed
+        self.render_mode = "full"
+
+        # Tracks what changed on screen, scenes that support "dirty" render mode use it
+        self.dirty_rects = DirtyRects()
+
+        # Main loop fps cap, 0 is uncapped
+        self.fps_limit = FPS
+
+        # How scenes are updated, "variable" once per frame with the frame dt, "fixed" in fixed ticks
+        self.loop_mode = "variable"
+
+        # Fixed loop mode ticks per second, every tick updates the scene with the same dt
+        self.tick_rate = 60
+
+        # Fixed loop mode max ticks per frame, a slow frame drops the rest of its time instead of catching up
+        self.max_ticks_per_frame = 5
+
+        # Fixed loop mode frame time not ticked yet, always less than 1 tick
+        self.accumulator = 0
+
+        # How far the frame is between the last 2 ticks, 0 to 1, scenes read this in draw, always 1 in variable mode
+        self.alpha = 1.0
+
+        # Game input, action name -> keys / mouse buttons, rebind at runtime with game.input.bind
+        self.input = Input(
+            key_bindings={
+                "up": [pg.K_UP],
+                "down": [pg.K_DOWN],
+                "left": [pg.K_LEFT],
+                "right": [pg.K_RIGHT],
+                "enter": [pg.K_RETURN],
+                "pause": [pg.K_ESCAPE],
+                "jump": [pg.K_c],
+            },
             # REMOVE IN BUILD
-            "lmb": 1,
-            "mmb": 2,
-            "rmb": 3,
-        }
+            button_bindings={
+                "lmb": [1],
+                "mmb": [2],
+                "rmb": [3],
+            },
+        )
 
         # All game actors
         self.actors = {
@@ -86,6 +89,18 @@ class Game:
             "twin_goddess": TwinGoddess,
         }
 
+        # Movement solver each actor kinematic uses, "pixel" or "swept"
+        self.kinematic_solvers = {
+            "player": "pixel",
+            "goblin": "pixel",
+        }
+
+        # Moving actors spatial index each room uses, "quadtree" or "spatial_hash"
+        self.spatial_index = "quadtree"
+
+        # How many parsed and baked rooms the room cache keeps
+        self.room_cache_size = 6
+
         # All game scenes
         self.scenes = {
             "JsonEditor": JsonEditor,
@@ -93,8 +108,14 @@ class Game:
             "World": World,
         }
 
+        # Loads every png, json and wav once, for everyone to use
+        self.asset_manager = AssetManager()
+
+        # Shared animation cursors, animated backgrounds of the same clip and phase show the same frame
+        self.animation_clock = AnimationClock()
+
         # Game sound manager
-        self.sound_manager = SoundManager()
+        self.sound_manager = SoundManager(self.asset_manager)
 
         # Game current scene
         self.current_scene = self.scenes[initial_scene](self)
@@ -118,6 +139,117 @@ class Game:
             self.window_h = WINDOW_H * self.resolution
             self.y_offset = ((WINDOW_H - NATIVE_H) // 2) * self.resolution
 
+        # Window changed, so does the present surface
+        self.set_present_surf()
+
+    # Prepare the surface native surface is scaled into, only call when window or resolution changes
+    def set_present_surf(self):
+        # Scaled native size and where it goes on the window
+        self.present_size = (NATIVE_W * self.resolution, NATIVE_H * self.resolution)
+        self.present_rect = pg.Rect((0, self.y_offset), self.present_size)
+
+        # Scale straight into the window when it fits and has the same pixel format as native
+        self.is_present_direct = (
+            self.window_surf.get_rect().contains(self.present_rect)
+            and self.window_surf.get_bitsize() == NATIVE_SURF.get_bitsize()
+        )
+
+        if self.is_present_direct:
+            # Window area below the top letterbox
+            self.present_surf = self.window_surf.subsurface(self.present_rect)
+
+        else:
+            # Scale into a surface like native, then blit that to window
+            self.present_surf = pg.Surface(self.present_size, 0, NATIVE_SURF)
+
+    # Scale native surface to window and show it, call once at the end of every frame
+    def present(self):
+        # Only the changed native rects, whole screen in full render mode or when the scene did not track
+        rects = self.dirty_rects.get_present_rects()
+
+        # Whole screen? Scale into the surface made in set present surf, no new surface per frame
+        if self.dirty_rects.is_full:
+            pg.transform.scale(NATIVE_SURF, self.present_size, self.present_surf)
+
+            # Not scaled straight into window? Blit it there
+            if not self.is_present_direct:
+                self.window_surf.blit(self.present_surf, self.present_rect)
+
+            pg.display.update()
+
+        # Some rects? Scale each of them into its own area, then only update those
+        elif rects:
+            window_rects = []
+            for rect in rects:
+                # Native rect scaled, relative to present surf
+                present_rect = pg.Rect(
+                    rect.x * self.resolution,
+                    rect.y * self.resolution,
+                    rect.width * self.resolution,
+                    rect.height * self.resolution
+                )
+                pg.transform.scale(
+                    NATIVE_SURF.subsurface(rect),
+                    present_rect.size,
+                    self.present_surf.subsurface(present_rect)
+                )
+
+                # Move it to where present surf is on the window
+                present_rect.move_ip(self.present_rect.topleft)
+
+                # Not scaled straight into window? Blit it there
+                if not self.is_present_direct:
+                    self.window_surf.blit(
+                        self.present_surf,
+                        present_rect,
+                        present_rect.move(-self.present_rect.x, -self.present_rect.y)
+                    )
+
+                window_rects.append(present_rect)
+
+            pg.display.update(window_rects)
+
+        # Ready for next frame
+        self.dirty_rects.end_frame()
+
+    # Update current scene with the frame dt, call once every frame
+    def update(self, dt):
+        # Fixed loop mode? Update in fixed ticks
+        if self.loop_mode == "fixed":
+            self.update_fixed(dt)
+            return
+
+        # Variable loop mode, 1 update with the frame dt
+        self.current_scene.update(dt)
+        self.alpha = 1.0
+
+        # Just flags were seen, clear them
+        self.input.reset()
+
+    # Update current scene 0 or more times with the same tick dt, keep what is left for the next frame
+    def update_fixed(self, dt):
+        tick_ms = 1000 / self.tick_rate
+
+        # Add this frame time
+        self.accumulator += dt
+
+        ticks = 0
+        while self.accumulator >= tick_ms:
+            # Too far behind (room load, window drag)? Drop the rest, sim slows down instead of spiraling
+            if ticks == self.max_ticks_per_frame:
+                self.accumulator %= tick_ms
+                break
+
+            self.current_scene.update(tick_ms)
+            self.accumulator -= tick_ms
+            ticks += 1
+
+            # Only the first tick sees the just flags, no tick this frame keeps them for the next one
+            self.input.reset()
+
+        # Draw is between the last 2 ticks by this much
+        self.alpha = self.accumulator / tick_ms
+
     # Call this to change scene
     def set_scene(self, value):
         self.current_scene = self.scenes[value](self)
@@ -125,78 +257,36 @@ class Game:
     # Exit window / update game input flags
     def event(self, event):
         if event.type == pg.QUIT:
+            # REMOVE IN BUILD
+            self.profiler.save()
+
+            # REMOVE IN BUILD, asset load times and memory, only when profiling was on
+            if self.profiler.history:
+                self.asset_manager.save()
+
+            # REMOVE IN BUILD, quit while recording saves it too
+            if self.input_recorder.is_recording:
+                self.input_recorder.stop()
+
             pg.quit()
             exit()
 
-        if event.type == pg.KEYDOWN:
-            if event.key == self.key_bindings["up"]:
-                self.is_up_pressed = True
-                self.is_up_just_pressed = True
-            if event.key == self.key_bindings["down"]:
-                self.is_down_pressed = True
-                self.is_down_just_pressed = True
-            if event.key == self.key_bindings["left"]:
-                self.is_left_pressed = True
-                self.is_left_just_pressed = True
-            if event.key == self.key_bindings["right"]:
-                self.is_right_pressed = True
-                self.is_right_just_pressed = True
-            if event.key == self.key_bindings["enter"]:
-                self.is_enter_pressed = True
-                self.is_enter_just_pressed = True
-            if event.key == self.key_bindings["pause"]:
-                self.is_pause_pressed = True
-                self.is_pause_just_pressed = True
-            if event.key == self.key_bindings["jump"]:
-                self.is_jump_pressed = True
-                self.is_jump_just_pressed = True
-
-        elif event.type == pg.KEYUP:
-            if event.key == self.key_bindings["up"]:
-                self.is_up_pressed = False
-                self.is_up_just_released = True
-            if event.key == self.key_bindings["down"]:
-                self.is_down_pressed = False
-                self.is_down_just_released = True
-            if event.key == self.key_bindings["left"]:
-                self.is_left_pressed = False
-                self.is_left_just_released = True
-            if event.key == self.key_bindings["right"]:
-                self.is_right_pressed = False
-                self.is_right_just_released = True
-            if event.key == self.key_bindings["enter"]:
-                self.is_enter_pressed = False
-                self.is_enter_just_released = True
-            if event.key == self.key_bindings["pause"]:
-                self.is_pause_pressed = False
-                self.is_pause_just_released = True
-            if event.key == self.key_bindings["jump"]:
-                self.is_jump_pressed = False
-                self.is_jump_just_released = True
+        # Update the input bits
+        self.input.event(event)
+
+        if event.type == pg.KEYUP:
             # REMOVE IN BUILD
             if event.key == pg.K_0:
                 self.is_debug = not self.is_debug
-
-        # REMOVE IN BUILD
-        if event.type == pg.MOUSEBUTTONDOWN:
-            if event.button == self.key_bindings["lmb"]:
-                self.is_lmb_pressed = True
-                self.is_lmb_just_pressed = True
-            if event.button == self.key_bindings["mmb"]:
-                self.is_mmb_pressed = True
-                self.is_mmb_just_pressed = True
-            if event.button == self.key_bindings["rmb"]:
-                self.is_rmb_pressed = True
-                self.is_rmb_just_pressed = True
-
-        # REMOVE IN BUILD
-        elif event.type == pg.MOUSEBUTTONUP:
-            if event.button == self.key_bindings["lmb"]:
-                self.is_lmb_pressed = False
-                self.is_lmb_just_released = True
-            if event.button == self.key_bindings["mmb"]:
-                self.is_mmb_pressed = False
-                self.is_mmb_just_released = True
-            if event.button == self.key_bindings["rmb"]:
-                self.is_rmb_pressed = False
-                self.is_rmb_just_released = True
+            # REMOVE IN BUILD
+            if event.key == pg.K_9:
+                self.profiler.is_enabled = not self.profiler.is_enabled
+            # REMOVE IN BUILD, only the world can be recorded
+            if event.key == pg.K_8 and isinstance(self.current_scene, World):
+                if self.input_recorder.is_recording:
+                    self.input_recorder.stop()
+                else:
+                    # Remember where the player is, then restart the world there, replay restarts it the same way
+                    self.input_recorder.start(self.current_scene)
+                    self.set_scene("World")
+                    self.input_recorder.set_start(self.current_scene)
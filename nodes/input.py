@@ -0,0 +1,114 @@
+from constants import *
+
+
+class Input:
+    '''
+    How to use:
+        1: Game owns me, give me the key bindings and mouse button bindings, action name -> list of keys / buttons
+        2: Game event gives me every event, game update calls my reset after the scene has seen the flags
+        3: Ask my is held, is just pressed or is just released with an action bit, eg. ACTION_JUMP
+        4: Call my bind to change what keys an action uses at runtime, eg. bind("jump", [pg.K_c, pg.K_SPACE])
+
+    What will happen:
+        1: Bindings are turned into key -> action bits and button -> action bits lookups
+        2: An event is 1 dict lookup and a few bit ops, no if chain
+        3: Held, just pressed and just released are 3 ints, 1 bit per action
+        4: Reset clears just pressed and just released, 2 stores
+        5: An action with many keys stays held until all of its keys are up
+    '''
+
+    def __init__(self, key_bindings, button_bindings):
+        # Action bits
+        self.held = 0
+        self.just_pressed = 0
+        self.just_released = 0
+
+        # Action name -> keys / mouse buttons
+        self.key_bindings = {}
+        self.button_bindings = {}
+
+        # Key / mouse button -> action bits, 1 key can do many actions
+        self.key_actions = {}
+        self.button_actions = {}
+
+        # Keys and buttons down now, an action is only released when none of its keys are
+        self.held_keys = set()
+        self.held_buttons = set()
+
+        for name, keys in key_bindings.items():
+            self.bind(name, keys)
+        for name, buttons in button_bindings.items():
+            self.bind(name, buttons, is_button=True)
+
+    # Set the keys (or mouse buttons) of an action, replaces its old ones
+    def bind(self, name, keys, is_button=False):
+        if is_button:
+            self.button_bindings[name] = list(keys)
+            self.button_actions = self.get_lookup(self.button_bindings)
+        else:
+            self.key_bindings[name] = list(keys)
+            self.key_actions = self.get_lookup(self.key_bindings)
+
+    # Bindings -> key to action bits lookup
+    def get_lookup(self, bindings):
+        lookup = {}
+        for name, keys in bindings.items():
+            for key in keys:
+                lookup[key] = lookup.get(key, 0) | ACTIONS[name]
+        return lookup
+
+    def event(self, event):
+        if event.type == pg.KEYDOWN:
+            self.press(event.key, self.key_actions, self.held_keys)
+
+        elif event.type == pg.KEYUP:
+            self.release(event.key, self.key_actions, self.held_keys)
+
+        # REMOVE IN BUILD
+        elif event.type == pg.MOUSEBUTTONDOWN:
+            self.press(event.button, self.button_actions, self.held_buttons)
+
+        # REMOVE IN BUILD
+        elif event.type == pg.MOUSEBUTTONUP:
+            self.release(event.button, self.button_actions, self.held_buttons)
+
+    def press(self, key, actions, held_keys):
+        bits = actions.get(key, 0)
+
+        # Not bound? Nothing to do
+        if not bits:
+            return
+
+        held_keys.add(key)
+        self.held |= bits
+        self.just_pressed |= bits
+
+    def release(self, key, actions, held_keys):
+        bits = actions.get(key, 0)
+
+        # Not bound? Nothing to do
+        if not bits:
+            return
+
+        held_keys.discard(key)
+
+        # Actions another held key still does stay held
+        for other_key in held_keys:
+            bits &= ~actions.get(other_key, 0)
+
+        self.held &= ~bits
+        self.just_released |= bits
+
+    # Cleanup the just pressed and just released bits for next frame
+    def reset(self):
+        self.just_pressed = 0
+        self.just_released = 0
+
+    def is_held(self, action):
+        return self.held & action != 0
+
+    def is_just_pressed(self, action):
+        return self.just_pressed & action != 0
+
+    def is_just_released(self, action):
+        return self.just_released & action != 0
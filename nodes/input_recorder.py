@@ -0,0 +1,162 @@
+from constants import *
+from array import array
+from json import dumps
+from json import loads
+from struct import calcsize
+from struct import pack
+from struct import unpack_from
+from sys import byteorder
+
+
+class InputRecorder:
+    '''
+    How to use:
+        1: Game owns me, press 8 in the world to start recording, press 8 again to stop and save
+        2: Main loop calls my record once every frame, after the events and before the update
+        3: Replay input script calls my load, then my replay once every frame instead of feeding events
+
+    What will happen:
+        1: Start remembers the room, player and camera position, loop mode and the shared animation clock cursors
+        2: A fresh world is put there before recording and replay, so actor animators and timers start the same too
+        3: Each frame I keep the game input held, just pressed and just released bits as 1 uint32 and the frame dt as 1 uint16 ms
+        4: Save writes a header, a small json block (room, positions, clock cursors, frames total) then both arrays
+        5: Replay sets the game input bits of that frame and gives back its dt, no real events are needed
+        6: Same build, same recording, same dt, the world runs exactly the same frames every time
+    '''
+
+    # Recording header, magic, version and meta json byte size
+    HEADER = "<4sHI"
+    MAGIC = b"INPT"
+    VERSION = 3
+
+    # Bits each of held, just pressed and just released takes in a frame bit set
+    ACTION_BITS = len(ACTIONS)
+
+    def __init__(self):
+        self.is_recording = False
+
+        # Where the recording starts, room name, player and camera topleft, game loop mode, clock cursors
+        self.meta = {}
+
+        # Per frame input bit sets and dt ms
+        self.flags = array("I")
+        self.dts = array("H")
+
+        # Next frame replay gives back
+        self.replay_frame = 0
+
+    # Start a new recording from where the world is now
+    def start(self, world):
+        self.is_recording = True
+        self.meta = {
+            "room_name": world.room.name,
+            "player_topleft": list(world.player.rect.topleft),
+            "camera_topleft": list(world.camera.rect.topleft),
+            "loop_mode": world.game.loop_mode,
+            "tick_rate": world.game.tick_rate,
+            # Game owns the clock, it keeps running across worlds, so a fresh world does not reset it
+            "animation_clock": world.game.animation_clock.get_cursors(),
+        }
+        self.flags = array("I")
+        self.dts = array("H")
+
+    # Stop recording and write it
+    def stop(self, path="input.rec"):
+        self.is_recording = False
+        self.save(path)
+
+    # Keep this frame input bits and dt, call after the events and before the update
+    def record(self, game, dt):
+        if not self.is_recording:
+            return
+
+        # Held, just pressed and just released side by side
+        self.flags.append(
+            game.input.held
+            | game.input.just_pressed << self.ACTION_BITS
+            | game.input.just_released << (2 * self.ACTION_BITS)
+        )
+        self.dts.append(min(int(dt), 65535))
+
+    def save(self, path="input.rec"):
+        # Nothing recorded? Do not write
+        if not self.flags:
+            return
+
+        meta = dict(self.meta, frames_total=len(self.flags))
+        meta_bytes = dumps(meta, separators=(",", ":")).encode("utf-8")
+
+        # Arrays are always little endian
+        flags = array("I", self.flags)
+        dts = array("H", self.dts)
+        if byteorder == "big":
+            flags.byteswap()
+            dts.byteswap()
+
+        with open(path, "wb") as recording_file:
+            recording_file.write(pack(self.HEADER, self.MAGIC, self.VERSION, len(meta_bytes)))
+            recording_file.write(meta_bytes)
+            recording_file.write(flags.tobytes())
+            recording_file.write(dts.tobytes())
+
+    # Read a recording from my save, replay starts from its first frame
+    def load(self, path):
+        with open(path, "rb") as recording_file:
+            data = recording_file.read()
+
+        # Check header
+        magic, version, meta_size = unpack_from(self.HEADER, data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a version {self.VERSION} input recording")
+
+        # Meta json block
+        offset = calcsize(self.HEADER)
+        self.meta = loads(data[offset:offset + meta_size])
+        offset += meta_size
+
+        # Flag array then dt array
+        frames_total = self.meta["frames_total"]
+        self.flags = array("I", data[offset:offset + 4 * frames_total])
+        offset += 4 * frames_total
+        self.dts = array("H", data[offset:offset + 2 * frames_total])
+        if byteorder == "big":
+            self.flags.byteswap()
+            self.dts.byteswap()
+
+        self.replay_frame = 0
+
+    # Put a fresh world where the recording started
+    def set_start(self, world):
+        # Same loop mode, fixed loop mode starts from a whole tick too
+        world.game.loop_mode = self.meta["loop_mode"]
+        world.game.tick_rate = self.meta["tick_rate"]
+        world.game.accumulator = 0
+
+        # Not the room world is in? Load it, like a door transition does
+        if world.room.name != self.meta["room_name"]:
+            world.room.set_name(self.meta["room_name"])
+            world.room.quadtree.insert(world.player)
+            world.room.add_room_to_mini_map(world.mini_map)
+            world.room.add_room_to_mini_map(world.inventory.mini_map)
+
+        world.player.rect.topleft = self.meta["player_topleft"]
+        world.room.quadtree.relocate(world.player)
+        world.camera.rect.topleft = self.meta["camera_topleft"]
+
+        # Shared animations on the same frames as when recording started, after the room added its cursors
+        world.game.animation_clock.set_cursors(self.meta["animation_clock"])
+
+    def is_replay_done(self):
+        return self.replay_frame >= len(self.flags)
+
+    # Set the game input bits to the next recorded frame, give back its dt
+    def replay(self, game):
+        bits = self.flags[self.replay_frame]
+        mask = (1 << self.ACTION_BITS) - 1
+        game.input.held = bits & mask
+        game.input.just_pressed = bits >> self.ACTION_BITS & mask
+        game.input.just_released = bits >> (2 * self.ACTION_BITS) & mask
+
+        dt = self.dts[self.replay_frame]
+        self.replay_frame += 1
+        return dt
@@ -61,7 +61,7 @@ class Inventory:
         # Priotize input checks
         if self.is_allow_input == True:
             # Prioritize pause input check
-            if self.game.is_pause_just_pressed:
+            if self.game.input.is_just_pressed(ACTION_PAUSE):
                 # Deactivate myself, no input allowed, fade out
                 self.is_allow_input == False
                 self.curtain.go_to_invisible()
@@ -6,7 +6,7 @@ class Kinematic:
     How to use: 
         1: I am always a child of a moving actor
         2: Call my move function after you have updated velocity in actor
-        3: Require a callback for me to call and pass what you collided with
+        3: Require a callback for me to call and pass what you collided with, a list of room collision grid indexes
         4: I Have debug draw in my update
 
     What will happen:
@@ -23,9 +23,17 @@ class Kinematic:
         11: If I did hit something, owner callback on hit. Let owner do what they want based on what it hits, also update is on wall and is on floor
         12: Did not hit anything? Move owner rect 1 px and go to next iteration
         13: After updating both x and y, check if I am on floor and is on wall, if yes then take away the owner x velocity
+
+    Swept solver:
+        1: Pass solver "swept" to use it instead of the 1 px loop, same flags, callback and remainder
+        2: Per axis, collect every cell in the tile range that the whole displacement sweeps over
+        3: For each cell compute the first and last px step where my future self overlaps it
+        4: Steps are grouped in runs where the overlapped cells stay the same, runs that overlap nothing are skipped at once
+        5: In a run that overlaps cells, owner callback is called once per px step, same count as the 1 px loop
+        6: Owner wants me to stop? Place me 1 step before that, else move the whole displacement at once
     '''
 
-    def __init__(self, owner, game, room, camera, quadtree):
+    def __init__(self, owner, game, room, camera, quadtree, solver="pixel"):
         # Dependencies
         self.game = game
         self.room = room
@@ -42,7 +50,21 @@ class Kinematic:
         self.is_on_floor = False
         self.is_on_wall = False
 
+        # Movement solver, "pixel" or "swept"
+        self.solver = solver
+
     def move(self, dt):
+        self.game.profiler.begin("kinematic move")
+
+        # Swept solver selected? Use it instead
+        if self.solver == "swept":
+            self.move_swept(dt)
+        else:
+            self.move_pixel(dt)
+
+        self.game.profiler.end("kinematic move")
+
+    def move_pixel(self, dt):
         is_moved = False
 
         # Debug draw rects
@@ -53,14 +75,11 @@ class Kinematic:
             y = self.owner.rect.y - self.camera.rect.y
 
             # Owner real rect
-            self.game.debug_draw.add(
-                {
-                    "type": "rect",
-                    "layer": 1,
-                    "rect": [x, y, self.owner.rect.width, self.owner.rect.height],
-                    "color": "orange",
-                    "width": 1
-                }
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="orange",
+                rect=[x, y, self.owner.rect.width, self.owner.rect.height],
+                width=1
             )
 
         # Update direction sign for movement
@@ -197,10 +216,10 @@ class Kinematic:
                         clamp(possible_y_tu, self.room.y_tu, self.room.h_tu - 1)
                     )
 
-                    # Tu index -> cell
-                    cell = self.room.collision_layer[
+                    # Tu index -> cell index, wrap negative index like a list does
+                    cell = (
                         possible_y_tu * self.room.w_tu + possible_x_tu
-                    ]
+                    ) % len(self.room.collision_grid)
 
                     # Debug draw rects
                     if self.game.is_debug:
@@ -215,18 +234,15 @@ class Kinematic:
                         ) - self.camera.rect.y
 
                         # Posssible collision rect
-                        self.game.debug_draw.add(
-                            {
-                                "type": "rect",
-                                "layer": 1,
-                                "rect": [possible_xd, possible_yd, TILE_S, TILE_S],
-                                "color": "green",
-                                "width": 1
-                            }
+                        self.game.debug_draw.add_rect(
+                            layer=1,
+                            color="green",
+                            rect=[possible_xd, possible_yd, TILE_S, TILE_S],
+                            width=1
                         )
 
                     # Found something?
-                    if cell != 0:
+                    if self.room.collision_grid[cell] != CELL_EMPTY:
                         # Found rect? Add it to possible_cells
                         possible_cells.append(cell)
 
@@ -234,14 +250,11 @@ class Kinematic:
                         if self.game.is_debug:
 
                             # Posssible found rect
-                            self.game.debug_draw.add(
-                                {
-                                    "type": "rect",
-                                    "layer": 1,
-                                    "rect": [possible_xd, possible_yd, TILE_S, TILE_S],
-                                    "color": "yellow",
-                                    "width": 0
-                                }
+                            self.game.debug_draw.add_rect(
+                                layer=1,
+                                color="yellow",
+                                rect=[possible_xd, possible_yd, TILE_S, TILE_S],
+                                width=0
                             )
 
                 # My future position (x / horizontal)
@@ -254,14 +267,11 @@ class Kinematic:
                 if self.game.is_debug:
 
                     # My future rect horizontal
-                    self.game.debug_draw.add(
-                        {
-                            "type": "rect",
-                            "layer": 1,
-                            "rect": [xds - self.camera.rect.x, yds - self.camera.rect.y, self.owner.rect.width, self.owner.rect.height],
-                            "color": "blue",
-                            "width": 1
-                        }
+                    self.game.debug_draw.add_rect(
+                        layer=1,
+                        color="blue",
+                        rect=[xds - self.camera.rect.x, yds - self.camera.rect.y, self.owner.rect.width, self.owner.rect.height],
+                        width=1
                     )
 
                 # Prepare container to store collided cells
@@ -269,9 +279,9 @@ class Kinematic:
 
                 # Check each found cells AABB
                 for cell in possible_cells:
-                    # Extract cell data to do AABB
-                    c_xds = cell["xds"]
-                    c_yds = cell["yds"]
+                    # Cell index -> cell pos to do AABB
+                    c_xds = (cell % self.room.w_tu) * TILE_S + self.room.rect[0]
+                    c_yds = (cell // self.room.w_tu) * TILE_S + self.room.rect[1]
                     c_w = c_xds + TILE_S
                     c_h = c_yds + TILE_S
 
@@ -426,10 +436,10 @@ class Kinematic:
                         clamp(possible_y_tu, self.room.y_tu, self.room.h_tu - 1)
                     )
 
-                    # Tu index -> cell
-                    cell = self.room.collision_layer[
+                    # Tu index -> cell index, wrap negative index like a list does
+                    cell = (
                         possible_y_tu * self.room.w_tu + possible_x_tu
-                    ]
+                    ) % len(self.room.collision_grid)
 
                     # Debug draw rects
                     if self.game.is_debug:
@@ -444,18 +454,15 @@ class Kinematic:
                         ) - self.camera.rect.y
 
                         # Posssible collision rect
-                        self.game.debug_draw.add(
-                            {
-                                "type": "rect",
-                                "layer": 1,
-                                "rect": [possible_xd, possible_yd, TILE_S, TILE_S],
-                                "color": "green",
-                                "width": 1
-                            }
+                        self.game.debug_draw.add_rect(
+                            layer=1,
+                            color="green",
+                            rect=[possible_xd, possible_yd, TILE_S, TILE_S],
+                            width=1
                         )
 
                     # Found something?
-                    if cell != 0:
+                    if self.room.collision_grid[cell] != CELL_EMPTY:
                         # Found rect? Add it to possible_cells
                         possible_cells.append(cell)
 
@@ -463,14 +470,11 @@ class Kinematic:
                         if self.game.is_debug:
 
                             # Posssible found rect
-                            self.game.debug_draw.add(
-                                {
-                                    "type": "rect",
-                                    "layer": 1,
-                                    "rect": [possible_xd, possible_yd, TILE_S, TILE_S],
-                                    "color": "yellow",
-                                    "width": 0
-                                }
+                            self.game.debug_draw.add_rect(
+                                layer=1,
+                                color="yellow",
+                                rect=[possible_xd, possible_yd, TILE_S, TILE_S],
+                                width=0
                             )
 
                 # My future position (y / vertical)
@@ -483,14 +487,11 @@ class Kinematic:
                 if self.game.is_debug:
 
                     # My future rect horizontal
-                    self.game.debug_draw.add(
-                        {
-                            "type": "rect",
-                            "layer": 1,
-                            "rect": [xds - self.camera.rect.x, yds - self.camera.rect.y, self.owner.rect.width, self.owner.rect.height],
-                            "color": "blue",
-                            "width": 1
-                        }
+                    self.game.debug_draw.add_rect(
+                        layer=1,
+                        color="blue",
+                        rect=[xds - self.camera.rect.x, yds - self.camera.rect.y, self.owner.rect.width, self.owner.rect.height],
+                        width=1
                     )
 
                 # Prepare container to store collided cells
@@ -498,9 +499,9 @@ class Kinematic:
 
                 # Check each found cells AABB
                 for cell in possible_cells:
-                    # Extract cell data to do AABB
-                    c_xds = cell["xds"]
-                    c_yds = cell["yds"]
+                    # Cell index -> cell pos to do AABB
+                    c_xds = (cell % self.room.w_tu) * TILE_S + self.room.rect[0]
+                    c_yds = (cell // self.room.w_tu) * TILE_S + self.room.rect[1]
                     c_w = c_xds + TILE_S
                     c_h = c_yds + TILE_S
 
@@ -538,3 +539,224 @@ class Kinematic:
         # Owner moved? relocate them in quadtree
         if is_moved:
             self.room.quadtree.relocate(self.owner)
+
+    def move_swept(self, dt):
+        is_moved = False
+
+        # Debug draw rects
+        if self.game.is_debug:
+
+            # Base
+            x = self.owner.rect.x - self.camera.rect.x
+            y = self.owner.rect.y - self.camera.rect.y
+
+            # Owner real rect
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="orange",
+                rect=[x, y, self.owner.rect.width, self.owner.rect.height],
+                width=1
+            )
+
+        # Do not do anything if there is no velocity == 0
+        if self.owner.velocity.x != 0:
+
+            # Turn displacement to int, store the droppped to remainder
+            self.remainder_x += self.owner.velocity.x * dt
+            displacement_x = round(self.remainder_x)
+            self.remainder_x -= displacement_x
+
+            # Sweep the whole displacement at once
+            if displacement_x != 0:
+                if self.sweep(displacement_x, "x"):
+                    is_moved = True
+
+        # Do not do anything if there is no velocity == 0
+        if self.owner.velocity.y != 0:
+
+            # Turn displacement to int, store the droppped to remainder
+            self.remainder_y += self.owner.velocity.y * dt
+            displacement_y = round(self.remainder_y)
+            self.remainder_y -= displacement_y
+
+            # Sweep the whole displacement at once
+            if displacement_y != 0:
+                if self.sweep(displacement_y, "y"):
+                    is_moved = True
+
+        # Owner moved? relocate them in quadtree
+        if is_moved:
+            self.room.quadtree.relocate(self.owner)
+
+    # Move owner by int displacement on 1 axis, return true if owner moved
+    def sweep(self, displacement, axis):
+        rect = self.owner.rect
+
+        # Direction and distance in px
+        direction = 1 if displacement > 0 else -1
+        distance = abs(displacement)
+
+        # Moving axis start pos and size, the other axis stays still
+        if axis == "x":
+            start = rect.x
+            size = rect.width
+            other_start = rect.y
+            other_size = rect.height
+        else:
+            start = rect.y
+            size = rect.height
+            other_start = rect.x
+            other_size = rect.width
+
+        # The box that covers my future self on every step
+        near = start + direction
+        far = start + direction * distance
+        low = min(near, far)
+        high = max(near, far) + size
+
+        # Turn the box into room tile index ranges, clipped within room
+        if axis == "x":
+            col_start = floor((low - self.room.rect[0]) / TILE_S)
+            col_end = ceil((high - self.room.rect[0]) / TILE_S)
+            row_start = floor((other_start - self.room.rect[1]) / TILE_S)
+            row_end = ceil((other_start + other_size - self.room.rect[1]) / TILE_S)
+        else:
+            col_start = floor((other_start - self.room.rect[0]) / TILE_S)
+            col_end = ceil((other_start + other_size - self.room.rect[0]) / TILE_S)
+            row_start = floor((low - self.room.rect[1]) / TILE_S)
+            row_end = ceil((high - self.room.rect[1]) / TILE_S)
+
+        col_start = max(col_start, 0)
+        col_end = min(col_end, self.room.w_tu)
+        row_start = max(row_start, 0)
+        row_end = min(row_end, self.room.h_tu)
+
+        # Debug draw rects
+        if self.game.is_debug:
+
+            # My swept box
+            self.game.debug_draw.add_rect(
+                layer=1,
+                color="blue",
+                rect=[
+                        (low if axis == "x" else other_start) - self.camera.rect.x,
+                        (other_start if axis == "x" else low) - self.camera.rect.y,
+                        (high - low) if axis == "x" else other_size,
+                        other_size if axis == "x" else (high - low),
+                    ],
+                width=1
+            )
+
+        # Prepare found cells with their first and last overlapping step
+        found_cells = []
+
+        # Steps where the overlapping cells change
+        steps = set()
+
+        # Check each cell in the box
+        for row in range(row_start, row_end):
+            for col in range(col_start, col_end):
+                # Tu index -> cell index
+                cell = row * self.room.w_tu + col
+
+                # Empty? Skip
+                if self.room.collision_grid[cell] == CELL_EMPTY:
+                    continue
+
+                # Cell pos
+                cell_xds = col * TILE_S + self.room.rect[0]
+                cell_yds = row * TILE_S + self.room.rect[1]
+
+                # Cell pos on moving axis and on the other axis
+                if axis == "x":
+                    cell_start = cell_xds
+                    cell_other_start = cell_yds
+                else:
+                    cell_start = cell_yds
+                    cell_other_start = cell_xds
+
+                # Must overlap on the axis that does not move
+                if not (cell_other_start < other_start + other_size and other_start < cell_other_start + TILE_S):
+                    continue
+
+                # Overlap on step k when low < k < high, solve for the k
+                if direction == 1:
+                    low_k = cell_start - size - start
+                    high_k = cell_start + TILE_S - start
+                else:
+                    low_k = start - cell_start - TILE_S
+                    high_k = start + size - cell_start
+
+                # First and last step my future self overlaps this cell
+                first_step = max(1, floor(low_k) + 1)
+                last_step = min(distance, ceil(high_k) - 1)
+
+                # Never overlaps on this displacement? Skip
+                if first_step > last_step:
+                    continue
+
+                # Collect this cell
+                found_cells.append((cell, first_step, last_step))
+                steps.add(first_step)
+                if last_step < distance:
+                    steps.add(last_step + 1)
+
+                # Debug draw rects
+                if self.game.is_debug:
+
+                    # Posssible found rect
+                    self.game.debug_draw.add_rect(
+                        layer=1,
+                        color="yellow",
+                        rect=[cell_xds - self.camera.rect.x, cell_yds - self.camera.rect.y, TILE_S, TILE_S],
+                        width=0
+                    )
+
+        # Check each run of steps where the overlapping cells stay the same, in order
+        steps = sorted(steps)
+        for i, step in enumerate(steps):
+            # Cells that hit my future self on this run
+            collided_cells = [
+                cell for cell, first_step, last_step in found_cells
+                if first_step <= step <= last_step
+            ]
+
+            # Did not hit anything on this run
+            if not collided_cells:
+                continue
+
+            # Last step of this run, the one before the next change
+            run_end = steps[i + 1] - 1 if i + 1 < len(steps) else distance
+
+            # Owner callback runs once per px step, like the 1 px loop, so its side effects (eg. door slowdown) happen as often
+            for run_step in range(step, run_end + 1):
+                # Put me 1 step before, where owner callback expects me to be
+                if axis == "x":
+                    rect.x = start + direction * (run_step - 1)
+
+                    # is_on_wall = true when my future self collided
+                    self.is_on_wall = True
+                else:
+                    rect.y = start + direction * (run_step - 1)
+
+                    # is_on_floor = true when my future self collided if I AM GOING DOWN
+                    if direction == 1:
+                        self.is_on_floor = True
+
+                # Tell owner what its future self hit, then collect if it wants me to stop
+                is_stop = self.owner.on_collide(collided_cells)
+
+                # Owner wants me to stop? I moved if the stop is not on first step
+                if is_stop == True:
+                    return run_step > 1
+
+        # My future self did not get stopped if I get here, so not on wall or floor
+        if axis == "x":
+            self.is_on_wall = False
+            rect.x = start + direction * distance
+        else:
+            self.is_on_floor = False
+            rect.y = start + direction * distance
+
+        # Moved the whole distance
+        return True
@@ -3,13 +3,16 @@ from constants import *
 
 class MiniMap:
     '''
-    How to use: 
+    How to use:
         1: Create it before player and room
         2: Call its draw method
         3: When room change call my add room method
 
     What will happen:
         1: This thing will draw the added room is rel pos to player pos
+        2: Every added room is drawn ONCE on the world surface, 1 px per tile, it grows when a room is outside it
+        3: The sticker only copies the world surface part around the player, no loop over the rooms
+        4: Gameplay sticker is only redrawn when player changes tile or a room is added
     '''
 
     def __init__(self, state, player):
@@ -28,6 +31,19 @@ class MiniMap:
         self.mini_map_surface.set_colorkey("black")
         self.mini_map_surface.fill("black")
 
+        # Every added room drawn once, 1 px per tile, made on first add room
+        self.world_surface = None
+
+        # Tile coord of the world surface topleft
+        self.world_x_tu = 0
+        self.world_y_tu = 0
+
+        # Extra tiles around the rooms when the world surface grows, so it does not grow on every add
+        self.world_margin_tu = 32
+
+        # What the sticker shows now, player tile and rooms total, redraw when it changes
+        self.sticker_key = None
+
         self.room_colors = {
             "outline": {
                 1: "#e5e3bc"
@@ -89,211 +105,110 @@ class MiniMap:
             self.offset_y_1 = self.offset_y - 1
 
             # Draw here ONCE, then stick this to inventory curtain base surface
+            self.redraw_inventory_mini_map()
+
+    # Draw 1 room on the world surface, with its doors
+    def draw_room(self, data):
+        # Get room rect
+        room_rect = data["rect"]
+
+        # Get room stage no
+        room_stage_no = data["stage_no"]
+
+        outline_color = self.room_colors["outline"][room_stage_no]
+        fill_color = self.room_colors["fill"][room_stage_no]
+        door_color = self.room_colors["door_color"][room_stage_no]
+
+        # Room rect on world surface
+        rect = (
+            room_rect[0] - self.world_x_tu,
+            room_rect[1] - self.world_y_tu,
+            room_rect[2],
+            room_rect[3]
+        )
 
-            # Draw the background on the sticker
-            pg.draw.rect(
-                self.mini_map_surface, "black", (
-                    self.x, self.y, self.w, self.h
-                )
-            )
-
-            # Get player pos
-            player_x_tu = 0
-            player_y_tu = 0
-
-            # Iterate over each room
-            for data in self.rooms:
-                # Get room rect
-                room_rect = data["rect"]
-
-                # Get room stage no
-                room_stage_no = data["stage_no"]
-
-                outline_color = self.room_colors["outline"][room_stage_no]
-                fill_color = self.room_colors["fill"][room_stage_no]
-
-                # Get room 4 points with the player offset and minimap position offset
-                x = room_rect[0] - (
-                    player_x_tu // TILE_S
-                ) + self.offset_x
-                y = room_rect[1] - (
-                    player_y_tu // TILE_S
-                ) + self.offset_y
-                r = x + room_rect[2]
-                b = y + room_rect[3]
-
-                # Ensure 4 rects points are in the minimap 4 points
-                x = clamp(x, self.x, self.r)
-                y = clamp(y, self.y, self.b)
-                r = clamp(r, self.x, self.r)
-                b = clamp(b, self.y, self.b)
-
-                # Compute the w and h for drawing
-                w = r - x
-                h = b - y
-
-                # Draw the room
-                pg.draw.rect(
-                    self.mini_map_surface,
-                    fill_color,
-                    (x, y, w, h),
-                )
+        # Draw the room
+        pg.draw.rect(self.world_surface, fill_color, rect)
 
-                # Draw the room
-                pg.draw.rect(
-                    self.mini_map_surface,
-                    outline_color,
-                    (x, y, w, h),
-                    1
-                )
+        # Draw the room
+        pg.draw.rect(self.world_surface, outline_color, rect, 1)
 
-                # Get the doors
-                for door in data["doors_pos"]:
-                    # Get room 4 points with the player offset and minimap position offset
-                    x = door["xtu"] - (
-                        player_x_tu // TILE_S
-                    ) + self.offset_x
-                    y = door["ytu"] - (
-                        player_y_tu // TILE_S
-                    ) + self.offset_y
-                    r = x + 1
-                    b = y + 1
-
-                    # Ensure 4 rects points are in the minimap 4 points
-                    x = clamp(x, self.x, self.r)
-                    y = clamp(y, self.y, self.b)
-                    r = clamp(r, self.x, self.r)
-                    b = clamp(b, self.y, self.b)
-
-                    # Compute the w and h for drawing
-                    w = r - x
-                    h = b - y
-
-                    door_color = self.room_colors["door_color"][room_stage_no]
-
-                    # Draw the door
-                    pg.draw.rect(
-                        self.mini_map_surface,
-                        door_color,
-                        (x, y, w, h),
-                        1
-                    )
-
-            # Draw the white frame
-            pg.draw.rect(
-                self.mini_map_surface, "white",
-                (self.x, self.y, self.w, self.h), 1
+        # Draw the doors, 1 px each
+        for door in data["doors_pos"]:
+            self.world_surface.set_at(
+                (door["xtu"] - self.world_x_tu, door["ytu"] - self.world_y_tu),
+                door_color
             )
 
-            # Inventory mode draw player rel to center offset
-            player_x_tu = self.player.rect.center[0] // TILE_S + self.offset_x
-            player_y_tu = self.player.rect.center[1] // TILE_S + self.offset_y
-
-            # Draw center - represent player
-            pg.draw.rect(
-                self.mini_map_surface, "red",
-                (player_x_tu, player_y_tu, 1, 2)
-            )
-
-    # Redraw ONCE again, with new player position or new room
-    def redraw_inventory_mini_map(self):
-        # Draw here ONCE, then stick this to inventory curtain base surface
-
-        # Draw the background on the sticker
-        pg.draw.rect(
-            self.mini_map_surface, "black", (
-                self.x, self.y, self.w, self.h
+    # Make the world surface big enough for every room, then draw them all in add order
+    def resize_world_surface(self):
+        # Rooms bounds in tiles
+        left = min(data["rect"][0] for data in self.rooms)
+        top = min(data["rect"][1] for data in self.rooms)
+        right = max(data["rect"][0] + data["rect"][2] for data in self.rooms)
+        bottom = max(data["rect"][1] + data["rect"][3] for data in self.rooms)
+
+        # With margin, next rooms next to these fit without a resize
+        self.world_x_tu = left - self.world_margin_tu
+        self.world_y_tu = top - self.world_margin_tu
+        self.world_surface = pg.Surface(
+            (
+                right - left + 2 * self.world_margin_tu,
+                bottom - top + 2 * self.world_margin_tu
             )
         )
+        self.world_surface.fill("black")
 
-        # Get player pos
-        player_x_tu = 0
-        player_y_tu = 0
-
-        # Iterate over each room
         for data in self.rooms:
-            # Get room rect
-            room_rect = data["rect"]
-
-            # Get room stage no
-            room_stage_no = data["stage_no"]
-
-            outline_color = self.room_colors["outline"][room_stage_no]
-            fill_color = self.room_colors["fill"][room_stage_no]
-
-            # Get room 4 points with the player offset and minimap position offset
-            x = room_rect[0] - (
-                player_x_tu // TILE_S
-            ) + self.offset_x
-            y = room_rect[1] - (
-                player_y_tu // TILE_S
-            ) + self.offset_y
-            r = x + room_rect[2]
-            b = y + room_rect[3]
-
-            # Ensure 4 rects points are in the minimap 4 points
-            x = clamp(x, self.x, self.r)
-            y = clamp(y, self.y, self.b)
-            r = clamp(r, self.x, self.r)
-            b = clamp(b, self.y, self.b)
-
-            # Compute the w and h for drawing
-            w = r - x
-            h = b - y
-
-            # Draw the room
-            pg.draw.rect(
-                self.mini_map_surface,
-                fill_color,
-                (x, y, w, h),
+            self.draw_room(data)
+
+    # Is the room inside the world surface?
+    def is_in_world_surface(self, data):
+        if self.world_surface is None:
+            return False
+
+        room_rect = data["rect"]
+        return self.world_surface.get_rect().contains(
+            (
+                room_rect[0] - self.world_x_tu,
+                room_rect[1] - self.world_y_tu,
+                room_rect[2],
+                room_rect[3]
             )
+        )
 
-            # Draw the room
-            pg.draw.rect(
-                self.mini_map_surface,
-                outline_color,
-                (x, y, w, h),
-                1
-            )
+    # Draw the sticker, world surface around the center tile, frame and player
+    def redraw_sticker(self, center_x_tu, center_y_tu, player_xd, player_yd):
+        frame_rect = (self.x, self.y, self.w, self.h)
 
-            # Get the doors
-            for door in data["doors_pos"]:
-                # Get room 4 points with the player offset and minimap position offset
-                x = door["xtu"] - (
-                    player_x_tu // TILE_S
-                ) + self.offset_x
-                y = door["ytu"] - (
-                    player_y_tu // TILE_S
-                ) + self.offset_y
-                r = x + 1
-                b = y + 1
-
-                # Ensure 4 rects points are in the minimap 4 points
-                x = clamp(x, self.x, self.r)
-                y = clamp(y, self.y, self.b)
-                r = clamp(r, self.x, self.r)
-                b = clamp(b, self.y, self.b)
-
-                # Compute the w and h for drawing
-                w = r - x
-                h = b - y
-
-                door_color = self.room_colors["door_color"][room_stage_no]
-
-                # Draw the door
-                pg.draw.rect(
-                    self.mini_map_surface,
-                    door_color,
-                    (x, y, w, h),
-                    1
+        # Draw the background on the sticker
+        self.mini_map_surface.fill("black", frame_rect)
+
+        # Copy the part of the world surface that is in the frame
+        if self.world_surface is not None:
+            self.mini_map_surface.set_clip(frame_rect)
+            self.mini_map_surface.blit(
+                self.world_surface,
+                (
+                    self.world_x_tu - center_x_tu + self.offset_x,
+                    self.world_y_tu - center_y_tu + self.offset_y
                 )
+            )
+            self.mini_map_surface.set_clip(None)
 
         # Draw the white frame
+        pg.draw.rect(self.mini_map_surface, "white", frame_rect, 1)
+
+        # Draw center - represent player
         pg.draw.rect(
-            self.mini_map_surface, "white",
-            (self.x, self.y, self.w, self.h), 1
+            self.mini_map_surface, "red",
+            (player_xd, player_yd, 1, 2)
         )
 
+    # Redraw ONCE again, with new player position or new room
+    def redraw_inventory_mini_map(self):
+        # Draw here ONCE, then stick this to inventory curtain base surface
+
         # Inventory mode draw player rel to center offset
         player_x_tu = self.player.rect.center[0] // TILE_S + self.offset_x
         player_y_tu = self.player.rect.center[1] // TILE_S + self.offset_y
@@ -302,11 +217,8 @@ class MiniMap:
         self.offset_x_1 = player_x_tu
         self.offset_y_1 = player_y_tu - 1
 
-        # Draw center - represent player
-        pg.draw.rect(
-            self.mini_map_surface, "red",
-            (self.offset_x_1, self.offset_y_1, 1, 2)
-        )
+        # Inventory map is not centered on player
+        self.redraw_sticker(0, 0, self.offset_x_1, self.offset_y_1)
 
     def add_room(self, data):
         room_name = data["name"]
@@ -319,6 +231,27 @@ class MiniMap:
             # Add it to set, to check, no dup
             self.visited_rooms.add(room_name)
 
+            # Fits the world surface? Only draw this one, else grow and draw all
+            if self.is_in_world_surface(data):
+                self.draw_room(data)
+            else:
+                self.resize_world_surface()
+
+    # Tell dirty rects where the gameplay map draws and what it shows, redrawn only when player changes tile or a room is added
+    def add_to_dirty_rects(self, dirty_rects):
+        dirty_rects.track(
+            self,
+            self.x,
+            self.y,
+            self.w,
+            self.h,
+            (
+                self.player.rect.center[0] // TILE_S,
+                self.player.rect.center[1] // TILE_S,
+                len(self.rooms)
+            )
+        )
+
     def draw(self, surf=NATIVE_SURF):
         # In inventory mode, no player offset
         if self.state == "inventory":
@@ -327,106 +260,21 @@ class MiniMap:
 
         # In inventory mode, no player offset
         elif self.state == "gameplay":
-            # Draw the background on the sticker / Things are drawn within this thing so technically this is a clear
-            pg.draw.rect(
-                self.mini_map_surface, "black", (
-                    self.x, self.y, self.w, self.h
-                )
-            )
-
-            # Get player pos
-            player_x_tu = self.player.rect.center[0]
-            player_y_tu = self.player.rect.center[1]
-
-            # Iterate over each room
-            for data in self.rooms:
-                # Get room rect
-                room_rect = data["rect"]
-
-                # Get room stage no
-                room_stage_no = data["stage_no"]
-
-                outline_color = self.room_colors["outline"][room_stage_no]
-                fill_color = self.room_colors["fill"][room_stage_no]
-
-                # Get room 4 points with the player offset and minimap position offset
-                x = room_rect[0] - (
-                    player_x_tu // TILE_S
-                ) + self.offset_x
-                y = room_rect[1] - (
-                    player_y_tu // TILE_S
-                ) + self.offset_y
-                r = x + room_rect[2]
-                b = y + room_rect[3]
-
-                # Ensure 4 rects points are in the minimap 4 points
-                x = clamp(x, self.x, self.r)
-                y = clamp(y, self.y, self.b)
-                r = clamp(r, self.x, self.r)
-                b = clamp(b, self.y, self.b)
-
-                # Compute the w and h for drawing
-                w = r - x
-                h = b - y
-
-                # Draw the room
-                pg.draw.rect(
-                    self.mini_map_surface,
-                    fill_color,
-                    (x, y, w, h),
+            # Get player tile
+            player_x_tu = self.player.rect.center[0] // TILE_S
+            player_y_tu = self.player.rect.center[1] // TILE_S
+
+            # Player changed tile or a room was added? Redraw the sticker
+            sticker_key = (player_x_tu, player_y_tu, len(self.rooms))
+            if sticker_key != self.sticker_key:
+                self.sticker_key = sticker_key
+                self.redraw_sticker(
+                    player_x_tu, player_y_tu, self.offset_x_1, self.offset_y_1
                 )
 
-                # Draw the room
-                pg.draw.rect(
-                    self.mini_map_surface,
-                    outline_color,
-                    (x, y, w, h),
-                    1
-                )
-
-                # Get the doors
-                for door in data["doors_pos"]:
-                    # Get room 4 points with the player offset and minimap position offset
-                    x = door["xtu"] - (
-                        player_x_tu // TILE_S
-                    ) + self.offset_x
-                    y = door["ytu"] - (
-                        player_y_tu // TILE_S
-                    ) + self.offset_y
-                    r = x + 1
-                    b = y + 1
-
-                    # Ensure 4 rects points are in the minimap 4 points
-                    x = clamp(x, self.x, self.r)
-                    y = clamp(y, self.y, self.b)
-                    r = clamp(r, self.x, self.r)
-                    b = clamp(b, self.y, self.b)
-
-                    # Compute the w and h for drawing
-                    w = r - x
-                    h = b - y
-
-                    door_color = self.room_colors["door_color"][room_stage_no]
-
-                    # Draw the door
-                    pg.draw.rect(
-                        self.mini_map_surface,
-                        door_color,
-                        (x, y, w, h),
-                        1
-                    )
-
-            # Draw the white frame
-            pg.draw.rect(
-                self.mini_map_surface, "white",
-                (self.x, self.y, self.w, self.h), 1
-            )
-
-            # Draw center - represent player
-            pg.draw.rect(
-                self.mini_map_surface, "red",
-                (self.offset_x_1, self.offset_y_1, 1, 2)
+            # Stick only the frame part of the gameplay surface to the native, the rest is see through
+            NATIVE_SURF.blit(
+                self.mini_map_surface,
+                (self.x, self.y),
+                (self.x, self.y, self.w, self.h)
             )
-
-            # Stick the gameplay sirface to the native
-            NATIVE_SURF.blit(self.mini_map_surface, (0, 0))
@@ -0,0 +1,160 @@
+from constants import *
+from collections import deque
+from time import perf_counter_ns
+
+
+class Profiler:
+    '''
+    How to use:
+        1: Game owns me, everyone reaches me with game.profiler
+        2: Wrap the code you want to time with my begin and end, give both the same scope name
+        3: Call my end frame once at the end of every frame
+        4: Call my draw to add my graph to the debug draw, call my save to dump csv
+
+    What will happen:
+        1: Begin and end do nothing when I am disabled
+        2: A scope that runs many times in a frame (every actor move) is summed in that frame
+        3: On end frame, the frame sums are moved to the history, one row per frame
+        4: The graph shows the last frames of each scope, with its average and max ms
+        5: Save writes every frame in the history to a csv, 1 column per scope, in ms
+    '''
+
+    def __init__(self, is_enabled=False, history_size=3600, graph_size=120):
+        # Off by default, begin and end cost nearly nothing then
+        self.is_enabled = is_enabled
+
+        # Scope name -> start ns of the running scope
+        self.starts = {}
+
+        # Scope name -> ns summed in this frame
+        self.frame_times = {}
+
+        # Scope names in first seen order, csv columns and graph rows
+        self.scope_names = []
+
+        # Rows of scope name -> ns, 1 per frame, oldest dropped
+        self.history = deque(maxlen=history_size)
+
+        # How many frames the graph shows
+        self.graph_size = graph_size
+
+        # Frame start, the whole frame is a scope too
+        self.frame_start = perf_counter_ns()
+
+        # Graph layout
+        self.row_h = FONT_H + 3
+        self.name_w = 23 * (FONT_W + 1)
+        self.surface = pg.Surface((NATIVE_W, NATIVE_H))
+        self.surface.set_colorkey("black")
+
+    def begin(self, name):
+        if not self.is_enabled:
+            return
+
+        self.starts[name] = perf_counter_ns()
+
+    def end(self, name):
+        if not self.is_enabled:
+            return
+
+        # Not begun? Profiling was turned on inside this scope, time it from next run
+        start = self.starts.pop(name, None)
+        if start is None:
+            return
+
+        # Add this run to the frame sum
+        elapsed = perf_counter_ns() - start
+        if name in self.frame_times:
+            self.frame_times[name] += elapsed
+        else:
+            self.frame_times[name] = elapsed
+
+            # First time seen? Add a column
+            if name not in self.scope_names:
+                self.scope_names.append(name)
+
+    def end_frame(self):
+        now = perf_counter_ns()
+
+        if self.is_enabled:
+            # Whole frame time
+            self.frame_times["total"] = now - self.frame_start
+            if "total" not in self.scope_names:
+                self.scope_names.append("total")
+
+            # Move the sums to history, next frame starts from 0
+            self.history.append(self.frame_times)
+            self.frame_times = {}
+
+        self.frame_start = now
+
+    # Add my graph to the debug draw
+    def draw(self, debug_draw, layer=6):
+        if not self.is_enabled:
+            return
+
+        # Clear graph surf
+        self.surface.fill("black")
+
+        # Last frames to show
+        start = max(0, len(self.history) - self.graph_size)
+        frames = [self.history[i] for i in range(start, len(self.history))]
+
+        # Graph is below the fps text
+        y = FONT_H + 2
+
+        for name in self.scope_names:
+            # This scope ms on each frame, 0 when it did not run
+            values = [frame.get(name, 0) / 1000000 for frame in frames]
+            if not values:
+                continue
+
+            average = sum(values) / len(values)
+            highest = max(values)
+
+            # Name, average and max
+            FONT.render_to(
+                self.surface,
+                (1, y),
+                f"{name[:10]:<10} {average:5.2f} {highest:5.2f}",
+                "white",
+                "grey15"
+            )
+
+            # 1 px column per frame, scaled to this scope max
+            x = self.name_w
+            if highest > 0:
+                for value in values:
+                    h = max(1, round(value / highest * (self.row_h - 2)))
+                    pg.draw.line(
+                        self.surface,
+                        "red" if value > 1000 / FPS else "green",
+                        (x, y + self.row_h - 2),
+                        (x, y + self.row_h - 1 - h)
+                    )
+                    x += 1
+
+            y += self.row_h
+
+        debug_draw.add_surf(
+            layer=layer,
+            surf=self.surface,
+            x=0,
+            y=0
+        )
+
+    # Write history to csv, 1 row per frame, 1 column per scope, in ms
+    def save(self, path="profile.csv"):
+        # Nothing recorded? Do not write
+        if not self.history:
+            return
+
+        with open(path, "w") as csv_file:
+            csv_file.write(",".join(["frame"] + [
+                f"{name} ms" for name in self.scope_names
+            ]) + "\n")
+
+            for i, frame in enumerate(self.history):
+                csv_file.write(",".join([str(i)] + [
+                    f"{frame.get(name, 0) / 1000000:.4f}" for name in self.scope_names
+                ]) + "\n")
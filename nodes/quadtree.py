@@ -19,18 +19,37 @@ class QuadTree:
         2: The search func iterates over the kids, see which one has their actors collide with the given rect
         3: Each kid have total actors, these are actors that is fully inside the kids rect
         4: If the search given rect fully encompasses a kid, all of that kid actor will be dumped to output
-        5: Removing actor is fast as it uses book keeping autoload
+        5: Removing actor is fast as it uses book keeping, the root owns the book and shares it with its kids
+        6: The book is keyed by the actor instance itself, it is emptied when root is cleared or resized
+        7: Kids that become empty are given back to the root pool, new kids are taken from the pool first
+        8: Relocate does nothing if the actor still belongs to the same quad
     '''
 
-    def __init__(self, rect, room, nDepth=0):
+    def __init__(self, rect, room, nDepth=0, actor_to_quad=None, pool=None):
         # Has actor to quad
         self.room = room
 
+        # Book to store the quad (section / kid) each actor is in, for quick lookup, to avoid search tree recursion
+        # Root creates it, kids get the root book
+        if actor_to_quad is None:
+            actor_to_quad = {}
+        self.actor_to_quad = actor_to_quad
+
+        # Spare quads to reuse as kids, instead of creating new ones
+        # Root creates it, kids get the root pool
+        if pool is None:
+            pool = []
+        self.pool = pool
+
         # Keeps track of my depth level, limit with max constant
         self.depth = nDepth
 
-        # My rect, to check if actor is inside or not
-        self.rect = rect
+        # My rect, to check if actor is inside or not, my own copy so it can be updated in place
+        self.rect = pg.FRect(rect)
+
+        # My parent and which of its kid I am, to prune myself when I am empty
+        self.parent = None
+        self.index = 0
 
         # To hold my potential kids
         self.kids = [None] * 4
@@ -39,28 +58,20 @@ class QuadTree:
         self.actors = []
 
         # Prepare rects for my kids, used to check if actor is in my kids, if so make kids
-        vChildSize = (self.rect.size[0] / 2.0, self.rect.size[1] / 2.0)
-        self.kids_rects = [
-            pg.FRect(self.rect.topleft, vChildSize),
-            pg.FRect(
-                (
-                    self.rect.topleft[0] + vChildSize[0],
-                    self.rect.topleft[1]
-                ), vChildSize
-            ),
-            pg.FRect(
-                (
-                    self.rect.topleft[0], self.rect.topleft[1] +
-                    vChildSize[1]
-                ), vChildSize
-            ),
-            pg.FRect(
-                (
-                    self.rect.topleft[0] + vChildSize[0],
-                    self.rect.topleft[1] + vChildSize[1]
-                ), vChildSize
-            )
-        ]
+        # Created once, updated in place when I am resized or reused
+        self.kids_rects = [pg.FRect(0, 0, 0, 0) for _ in range(4)]
+        self.set_kids_rects()
+
+    # Update my kids rects in place from my rect
+    def set_kids_rects(self):
+        x, y = self.rect.topleft
+        w = self.rect.width / 2.0
+        h = self.rect.height / 2.0
+
+        self.kids_rects[0].update(x, y, w, h)
+        self.kids_rects[1].update(x + w, y, w, h)
+        self.kids_rects[2].update(x, y + h, w, h)
+        self.kids_rects[3].update(x + w, y + h, w, h)
 
     # Called when room changed, set my rect to be as big as room
     def set_rect(self, rect):
@@ -68,43 +79,87 @@ class QuadTree:
         self.clear()
 
         # Update my rect
-        self.rect = rect
+        self.rect.update(rect)
 
-        # Prepare rects for my kids, used to check if actor is in my kids, if so make kids
-        vChildSize = (self.rect.size[0] / 2.0, self.rect.size[1] / 2.0)
-        self.kids_rects = [
-            pg.FRect(self.rect.topleft, vChildSize),
-            pg.FRect(
-                (
-                    self.rect.topleft[0] + vChildSize[0],
-                    self.rect.topleft[1]
-                ), vChildSize
-            ),
-            pg.FRect(
-                (
-                    self.rect.topleft[0], self.rect.topleft[1] +
-                    vChildSize[1]
-                ), vChildSize
-            ),
-            pg.FRect(
-                (
-                    self.rect.topleft[0] + vChildSize[0],
-                    self.rect.topleft[1] + vChildSize[1]
-                ), vChildSize
-            )
-        ]
+        # Update rects for my kids
+        self.set_kids_rects()
 
     # Removes all actors and kids, until only root is left
     def clear(self):
         # Clear actor
         self.actors.clear()
 
-        # Tell children to clear and empty themselves to None
+        # Empty the book, kids share it so this is done once for the whole tree
+        if self.depth == 0:
+            self.actor_to_quad.clear()
+
+        # Tell children to clear and give them back to the pool
         for i in range(4):
             if self.kids[i]:
                 self.kids[i].clear()
+                self.kids[i].parent = None
+                self.pool.append(self.kids[i])
                 self.kids[i] = None
 
+    # Get my kid, take a spare quad from the pool or create it if I do not have it yet
+    def get_kid(self, i):
+        # Already have this kid
+        if self.kids[i]:
+            return self.kids[i]
+
+        # Got spare quad? Reuse it
+        if self.pool:
+            kid = self.pool.pop()
+            kid.depth = self.depth + 1
+            kid.rect.update(self.kids_rects[i])
+            kid.set_kids_rects()
+
+        # No spare quad? Create child
+        else:
+            kid = QuadTree(
+                self.kids_rects[i],
+                self.room,
+                self.depth + 1,
+                self.actor_to_quad,
+                self.pool
+            )
+
+        # Link child to me
+        kid.parent = self
+        kid.index = i
+        self.kids[i] = kid
+        return kid
+
+    # Called after an actor left me, give me and my empty parents back to the pool
+    def prune(self):
+        quadtree = self
+
+        # Root is never pruned, stop at quads that still have actors or kids
+        while quadtree.parent and not quadtree.actors and not any(quadtree.kids):
+            parent = quadtree.parent
+
+            # Unlink from parent, give to pool
+            parent.kids[quadtree.index] = None
+            quadtree.parent = None
+            self.pool.append(quadtree)
+
+            # Parent may be empty now too
+            quadtree = parent
+
+    # Is given rect still where insert would put it, me and not any of my kids
+    def is_home(self, given_rect):
+        # Not root and not inside me? Not here
+        if self.parent and not self.rect.contains(given_rect):
+            return False
+
+        # Fits completely in one of my kid? Would go deeper
+        if self.depth + 1 < MAX_QUADTREE_DEPTH:
+            for kid_rect in self.kids_rects:
+                if kid_rect.contains(given_rect):
+                    return False
+
+        return True
+
     # In case I need to know how many actors are in this quad
     def size(self):
         # Return total amount of actors in this quad
@@ -116,38 +171,36 @@ class QuadTree:
 
     # Called when root first created or when actors position changed / relocated
     def insert(self, given_actor):
-        for i in range(4):
-            # Given actor is completely inside one of my kid?
-            if self.kids_rects[i].contains(given_actor.rect):
-
-                # Still inside limit? Go to next depth / level deeper (insert actor to kid)
-                if self.depth + 1 < MAX_QUADTREE_DEPTH:
-
-                    # No child
-                    if not self.kids[i]:
-
-                        # Create child
-                        self.kids[i] = QuadTree(
-                            self.kids_rects[i], self.depth + 1)
-
-                    # Got child? Or from creation above? Add given_actor to it
-                    self.kids[i].insert(given_actor)
+        # Still inside limit? Can go to next depth / level deeper
+        if self.depth + 1 < MAX_QUADTREE_DEPTH:
+            for i in range(4):
+                # Given actor is completely inside one of my kid? Insert actor to kid, get or create it
+                if self.kids_rects[i].contains(given_actor.rect):
+                    self.get_kid(i).insert(given_actor)
                     return
 
         # Actors is not completely inside any of my kids? Then its mine
         self.actors.append(given_actor)
 
-        # Fill global book, store the mapping of actor id to me (section / quad / kid)
-        actor_to_quad[given_actor.id] = self
+        # Fill book, store the mapping of actor to me (section / quad / kid)
+        self.actor_to_quad[given_actor] = self
 
     # Return actors list that overlap with given rect
     def search(self, given_rect):
+        # REMOVE IN BUILD, time it when I belong to a room
+        if self.room:
+            self.room.game.profiler.begin("quadtree search")
+
         # Prepare output
         found_actors = []
 
         # Recurssion search, this is expensive
         self.search_helper(given_rect, found_actors)
 
+        # REMOVE IN BUILD
+        if self.room:
+            self.room.game.profiler.end("quadtree search")
+
         # Return output
         return found_actors
 
@@ -183,18 +236,16 @@ class QuadTree:
 
     # Remove a certain actor from a certain quad (section / kid)
     def remove_actor(self, given_actor):
-        # Make sure that id is valid, it is in the book
-        if given_actor.id in actor_to_quad:
-            # Use the actor id to immediately get the quad it is in
-            quadtree = actor_to_quad[given_actor.id]
+        # Use the actor to immediately get the quad it is in, also deletes that book row
+        quadtree = self.actor_to_quad.pop(given_actor, None)
 
-            # Make sure that the given actor is in the quad from book
-            if given_actor in quadtree.actors:
-                # Remove actor from that quad
-                quadtree.actors.remove(given_actor)
+        # Make sure that actor is in the book
+        if quadtree is not None:
+            # Remove actor from that quad
+            quadtree.actors.remove(given_actor)
 
-            # Delete that book row
-            del actor_to_quad[given_actor.id]
+            # That quad may be empty now, give it back to the pool
+            quadtree.prune()
 
             # 200 deleted ok
             return True
@@ -204,8 +255,20 @@ class QuadTree:
 
     # Call this and pass the actor right after they have moved / updated their position
     def relocate(self, given_actor):
-        if self.remove_actor(given_actor):
-            self.insert(given_actor)
+        # Get the quad the actor is in
+        quadtree = self.actor_to_quad.get(given_actor)
+
+        # Not in book? Nothing to relocate
+        if quadtree is None:
+            return
+
+        # Still belongs to the same quad? Nothing to do
+        if quadtree.is_home(given_actor.rect):
+            return
+
+        # Moved out of it, put it in its new quad
+        self.remove_actor(given_actor)
+        self.insert(given_actor)
 
     # Debugging purposes to show all of the quads (sections / kids)
     def draw(self, game, camera):
@@ -216,14 +279,11 @@ class QuadTree:
         # Debug draw rects
 
         # My rect
-        game.debug_draw.add(
-            {
-                "type": "rect",
-                "layer": 2,
-                "rect": [x, y, self.rect.width, self.rect.height],
-                "color": "cyan",
-                "width": 1
-            }
+        game.debug_draw.add_rect(
+            layer=2,
+            color="cyan",
+            rect=[x, y, self.rect.width, self.rect.height],
+            width=1
         )
 
         # Draw how many actors I have
@@ -231,14 +291,11 @@ class QuadTree:
         text_rect.center = self.rect.center
         x = text_rect.x - camera.rect.x
         y = text_rect.y - camera.rect.y
-        game.debug_draw.add(
-            {
-                "type": "text",
-                "layer": 4,
-                "x": x,
-                "y": y,
-                "text": f"actors: {len(self.actors)}"
-            }
+        game.debug_draw.add_text(
+            layer=4,
+            x=x,
+            y=y,
+            text=f"actors: {len(self.actors)}"
         )
 
         # Recursively draw kids
@@ -248,13 +305,5 @@ class QuadTree:
 
     # In case I need to get all of the actors instance from this quad
     def get_all_actors(self):
-        # Prepare output
-        all_actors = []
-
-        # Iterate over all quads in actor_to_quad
-        for quadtree in actor_to_quad.values():
-            # Add actors from each quad to the list
-            all_actors.extend(quadtree.actors)
-
-        # Return output
-        return all_actors
+        # Every actor in the tree is a key in the book
+        return list(self.actor_to_quad)
@@ -1,6 +1,8 @@
 from constants import *
 from nodes.quadtree import QuadTree
+from nodes.spatial_hash import SpatialHash
 from nodes.background import Background
+from nodes.room_cache import RoomCache
 
 
 class Room:
@@ -14,6 +16,7 @@ class Room:
         6: Manually typed bg is also extracted to draw the hard coded background, make sure that you type in the correct available bg for distict stages
         7: Use my name setter to change room, if new room is in same stage, I will not re import the image for this stage
         8: Any sprite names that are in game actors list, will be instanced and placed in layer, replacing the dict
+        9: Rooms are read through my room cache, rooms behind my doors are parsed ahead of time, recent rooms are not baked again
 
     What will happen:
         1: You need to call my bg layer draw, This func, for every frame draws the bg
@@ -37,16 +40,18 @@ class Room:
         # Get room name
         self.name = name
 
-        # Room name -> read room data json
-        self.room_data = {}
-        with open(JSONS_PATHS[self.name], "r") as data:
-            self.room_data = load(data)
+        # Parsed rooms, rooms behind my doors are preloaded, recent rooms keep what I baked for them
+        self.room_cache = RoomCache(self.game.room_cache_size)
+
+        # Room name -> room data, from baked bin or json, through the cache
+        self.room_entry = self.room_cache.get(self.name)
+        self.room_data = self.room_entry["room_data"]
 
         # Get the background layers
         self.background_layers = self.room_data["background_layer"]
 
-        # Get the actor layer (enemies, goblins)
-        self.actor_layer = self.room_data["actor_layer"]
+        # Get the actor layer (enemies, goblins), a copy since its dicts are replaced by instances and room data is shared
+        self.actor_layer = list(self.room_data["actor_layer"])
 
         # Get the solid layer
         self.collision_layer = self.room_data["solid_layer"]
@@ -54,97 +59,14 @@ class Room:
         # get the foreground layer
         self.foreground_layers = self.room_data["foreground_layer"]
 
+        # Layers hold palette indexes, palette index -> tile dict, 0 is empty
+        self.palette = self.room_data["palette"]
+
         # Get the stage number
         self.stage_no = self.room_data["stage_no"]
 
-        # Load this room sprite sheet
-        self.sprite_sheet_png_name = self.room_data["sprite_sheet_name"]
-        self.sprite_sheet_path = PNGS_PATHS[self.sprite_sheet_png_name]
-        self.sprite_sheet_surf = pg.image.load(
-            self.sprite_sheet_path
-        ).convert_alpha()
-
-        # Prepare to collect animation / actor surface data for this stage
-        self.animation_data = {}
-        self.actor_surfaces = {}
-
-        # Handle stage 1 animation data
-        if self.stage_no == 1:
-
-            # Load fire animation data
-            with open(
-                JSONS_PATHS[
-                    f"{
-                    "fire"
-                    }_animation.json"
-                ], "r"
-            ) as data:
-                animation_data = load(data)
-
-            # Collect fire animation data
-            self.animation_data[
-                "fire"
-            ] = animation_data
-
-            # Load goblin animation data
-            with open(
-                JSONS_PATHS[
-                    f"{
-                    "goblin"
-                    }_animation.json"
-                ], "r"
-            ) as data:
-                animation_data = load(data)
-
-            # Collect goblin animation data
-            self.animation_data[
-                "goblin"
-            ] = animation_data
-
-            # Load goblin surface
-            with open(
-                PNGS_PATHS[
-                    f"{
-                    "goblin"
-                    }_sprite_sheet.png"
-                ], "r"
-            ) as data:
-                actor_surface = pg.image.load(data)
-
-            # Collect goblin surface
-            self.actor_surfaces[
-                "goblin"
-            ] = actor_surface
-
-            # Load goblin_flip surface
-            with open(
-                PNGS_PATHS[
-                    f"{
-                    "goblin_flip"
-                    }_sprite_sheet.png"
-                ], "r"
-            ) as data:
-                actor_surface = pg.image.load(data)
-
-            # Collect goblin_flip surface
-            self.actor_surfaces[
-                "goblin_flip"
-            ] = actor_surface
-
-            # Collect twin_goddess surface
-            self.actor_surfaces[
-                "twin_goddess"
-            ] = self.sprite_sheet_surf
-
-            # Collect twin_goddess surface flip
-            self.actor_surfaces[
-                "twin_goddess_flip"
-            ] = None
-
-            # Collect twin_goddess animation data
-            self.animation_data[
-                "twin_goddess"
-            ] = None
+        # Load this stage sprite sheet, animation data and actor surfaces
+        self.load_stage_assets()
 
         # Room rect, room camera limit
         self.rect = self.room_data["room_rect"]
@@ -168,29 +90,22 @@ class Room:
 
         # Init the background drawer
         self.background = Background(
+            self.game.asset_manager,
             self.sprite_sheet_surf,
             self.camera,
             self.stage_no,
             self.desired_background_names
         )
 
-        # Check if there are any actors in background_layers
-        for room in self.background_layers:
-            for sprite in room:
-                if sprite != 0:
-                    # Found?
-                    if sprite["sprite_type"] == "animated_background":
-                        # Add a new pair instance, value is the instance itself
-                        sprite["instance"] = self.game.actors[sprite["sprite_name"]](
-                            self.sprite_sheet_surf,
-                            self.animation_data[sprite["sprite_name"]],
-                            self.camera,
-                            sprite["xds"],
-                            sprite["yds"]
-                        )
+        # Collision grid, animated instances and static tile chunks, baked now or reused from the cache
+        self.load_baked()
 
         # Quadtree init, as big as current room, FRect because kid size might be decimal
-        self.quadtree = QuadTree(pg.FRect(self.rect), self)
+        # Game spatial index setting may swap it for a spatial hash, same api, so the name stays
+        if self.game.spatial_index == "spatial_hash":
+            self.quadtree = SpatialHash(pg.FRect(self.rect), self)
+        else:
+            self.quadtree = QuadTree(pg.FRect(self.rect), self)
 
         # REMOVE IN BUILD
         self.grid_surface = pg.Surface((NATIVE_W, NATIVE_H))
@@ -211,8 +126,7 @@ class Room:
             instance = self.game.actors[obj["sprite_name"]](
                 i,
                 self.actor_surfaces[obj["sprite_name"]],
-                self.actor_surfaces[f"{obj["sprite_name"]}_flip"],
-                self.animation_data[obj["sprite_name"]],
+                self.animation_clips[obj["sprite_name"]],
                 self.camera,
                 obj["xds"],
                 obj["yds"],
@@ -234,16 +148,15 @@ class Room:
         # Get room name
         self.name = name
 
-        # Room name -> read room data json
-        self.room_data = {}
-        with open(JSONS_PATHS[self.name], "r") as data:
-            self.room_data = load(data)
+        # Room name -> room data, from baked bin or json, through the cache, instant if it was preloaded
+        self.room_entry = self.room_cache.get(self.name)
+        self.room_data = self.room_entry["room_data"]
 
         # Get the background layers
         self.background_layers = self.room_data["background_layer"]
 
-        # Get the actor layer (enemies, goblins)
-        self.actor_layer = self.room_data["actor_layer"]
+        # Get the actor layer (enemies, goblins), a copy since its dicts are replaced by instances and room data is shared
+        self.actor_layer = list(self.room_data["actor_layer"])
 
         # Get the solid layer
         self.collision_layer = self.room_data["solid_layer"]
@@ -251,7 +164,11 @@ class Room:
         # get the foreground layer
         self.foreground_layers = self.room_data["foreground_layer"]
 
-        # Get the stage number
+        # Layers hold palette indexes, palette index -> tile dict, 0 is empty
+        self.palette = self.room_data["palette"]
+
+        # Get the stage number, keep the old one to see if stage changed
+        old_stage_no = self.stage_no
         self.stage_no = self.room_data["stage_no"]
 
         # Room rect, room camera limit
@@ -271,111 +188,21 @@ class Room:
             )
         )
 
-        # Check if there are any actors in background_layers
-        for room in self.background_layers:
-            for sprite in room:
-                if sprite != 0:
-                    # Found?
-                    if sprite["sprite_type"] == "animated_background":
-                        # Add a new pair instance, value is the instance itself
-                        sprite["instance"] = self.game.actors[sprite["sprite_name"]](
-                            self.sprite_sheet_surf,
-                            self.animation_data[sprite["sprite_name"]],
-                            self.camera,
-                            sprite["xds"],
-                            sprite["yds"]
-                        )
-
         # Room background names that it needs to draw
         self.desired_background_names = self.room_data["desired_background_names"]
 
-        # Only load new sprite sheet if it is different from what I have now
-        if self.room_data["stage_no"] != self.stage_no:
-
-            # Load this room sprite sheet
-            self.sprite_sheet_png_name = self.room_data["sprite_sheet_name"]
-            self.sprite_sheet_path = PNGS_PATHS[self.sprite_sheet_png_name]
-            self.sprite_sheet_surf = pg.image.load(
-                self.sprite_sheet_path
-            ).convert_alpha()
-
-            # Handle stage 1 animation data
-            if self.stage_no == 1:
-
-                # Load fire animation data
-                with open(
-                    JSONS_PATHS[
-                        f"{
-                        "fire"
-                        }_animation.json"
-                    ], "r"
-                ) as data:
-                    animation_data = load(data)
-
-                # Collect fire animation data
-                self.animation_data[
-                    "fire"
-                ] = animation_data
-
-                # Load goblin animation data
-                with open(
-                    JSONS_PATHS[
-                        f"{
-                        "goblin"
-                        }_animation.json"
-                    ], "r"
-                ) as data:
-                    animation_data = load(data)
-
-                # Collect goblin animation data
-                self.animation_data[
-                    "goblin"
-                ] = animation_data
-
-                # Load goblin surface
-                with open(
-                    PNGS_PATHS[
-                        f"{
-                        "goblin"
-                        }_sprite_sheet.png"
-                    ], "r"
-                ) as data:
-                    actor_surface = pg.image.load(data)
-
-                # Collect goblin surface
-                self.actor_surfaces[
-                    "goblin"
-                ] = actor_surface
-
-                # Load goblin_flip surface
-                with open(
-                    PNGS_PATHS[
-                        f"{
-                        "goblin_flip"
-                        }_sprite_sheet.png"
-                    ], "r"
-                ) as data:
-                    actor_surface = pg.image.load(data)
-
-                # Collect goblin_flip surface
-                self.actor_surfaces[
-                    "goblin_flip"
-                ] = actor_surface
-
-                # Collect twin_goddess surface
-                self.actor_surfaces[
-                    "twin_goddess"
-                ] = self.sprite_sheet_surf
-
-                # Collect twin_goddess surface flip
-                self.actor_surfaces[
-                    "twin_goddess_flip"
-                ] = None
-
-                # Collect twin_goddess animation data
-                self.animation_data[
-                    "twin_goddess"
-                ] = None
+        # Only load new stage assets if stage is different from what I have now
+        if self.stage_no != old_stage_no:
+            # Old stage assets are not needed anymore, drop the baked rooms and strips that still hold its surfaces too
+            self.room_cache.release_stage(old_stage_no)
+            self.background.release()
+            for animation_clips in self.animation_clips.values():
+                if animation_clips is not None:
+                    self.game.animation_clock.release(animation_clips)
+            self.game.asset_manager.release_group(f"stage_{old_stage_no}")
+
+            # Load this stage sprite sheet, animation data and actor surfaces
+            self.load_stage_assets()
 
         # Update the background drawer
         self.background.update_prop(
@@ -384,10 +211,10 @@ class Room:
             self.desired_background_names
         )
 
-        # Reset the book
-        reset_actor_to_quad()
+        # Collision grid, animated instances and static tile chunks, baked now or reused from the cache, after sprite sheet is ready
+        self.load_baked()
 
-        # Quadtree resize, as big as current room, FRect because kid size might be decimal
+        # Quadtree resize, as big as current room, FRect because kid size might be decimal, this also resets its book
         self.quadtree.set_rect(pg.FRect(self.rect))
 
         # Read actor layer
@@ -399,8 +226,7 @@ class Room:
             instance = self.game.actors[obj["sprite_name"]](
                 i,
                 self.actor_surfaces[obj["sprite_name"]],
-                self.actor_surfaces[f"{obj["sprite_name"]}_flip"],
-                self.animation_data[obj["sprite_name"]],
+                self.animation_clips[obj["sprite_name"]],
                 self.camera,
                 obj["xds"],
                 obj["yds"],
@@ -424,18 +250,314 @@ class Room:
         self.grid_surface.fill("black")
         self.grid_surface.set_alpha(100)
 
+    # Get this stage sprite sheet, animation data and actor surfaces from the asset manager, called on stage change
+    def load_stage_assets(self):
+        # Asset manager group, released when stage changes
+        group = f"stage_{self.stage_no}"
+
+        # Load this room sprite sheet
+        self.sprite_sheet_png_name = self.room_data["sprite_sheet_name"]
+        self.sprite_sheet_path = PNGS_PATHS[self.sprite_sheet_png_name]
+        self.sprite_sheet_surf = self.game.asset_manager.get_surface(
+            self.sprite_sheet_path, group
+        )
+
+        # Prepare to collect animation / actor surface data for this stage
+        self.animation_clips = {}
+        self.actor_surfaces = {}
+
+        # Handle stage 1 animation data
+        if self.stage_no == 1:
+            # Collect fire animation clips
+            self.animation_clips["fire"] = self.game.asset_manager.get_animation_clips(
+                JSONS_PATHS["fire_animation.json"], group
+            )
+
+            # Collect goblin animation clips
+            self.animation_clips["goblin"] = self.game.asset_manager.get_animation_clips(
+                JSONS_PATHS["goblin_animation.json"], group
+            )
+
+            # Collect goblin animation frames, flip or no flip, cut by its animation data, flips are made by transform flip
+            self.actor_surfaces["goblin"] = self.game.asset_manager.get_frame_atlas(
+                PNGS_PATHS["goblin_sprite_sheet.png"],
+                self.game.asset_manager.get_json(
+                    JSONS_PATHS["goblin_animation.json"], group
+                ),
+                group
+            )
+
+            # Collect twin_goddess surface
+            self.actor_surfaces["twin_goddess"] = self.sprite_sheet_surf
+
+            # Collect twin_goddess animation clips
+            self.animation_clips["twin_goddess"] = None
+
+    # Bake this room, or reuse what was baked the last time it was loaded, called on room load
+    def load_baked(self):
+        baked = self.room_entry["baked"]
+
+        # Not baked yet? Bake and keep it in the cache entry
+        if baked is None:
+            # Turn the solid layer into the compact collision grid
+            self.build_collision_grid()
+
+            # Instance the actors in background_layers
+            self.create_animated_instances()
+
+            # Render the static tiles once into chunk surfaces
+            self.bake_chunks()
+
+            # Bucket each pass animated instances by chunk, for draw and dirty rects lookup
+            self.index_animated_instances()
+
+            self.room_entry["baked"] = {
+                "collision_grid": self.collision_grid,
+                "collision_doors": self.collision_doors,
+                "background_passes": self.background_passes,
+                "solid_chunks": self.solid_chunks,
+                "foreground_chunks": self.foreground_chunks,
+            }
+
+        # Baked before? Reuse it, animated instances only animate so they are reused too
+        else:
+            self.collision_grid = baked["collision_grid"]
+            self.collision_doors = baked["collision_doors"]
+            self.background_passes = baked["background_passes"]
+            self.solid_chunks = baked["solid_chunks"]
+            self.foreground_chunks = baked["foreground_chunks"]
+
+        # Parse the rooms behind my doors in the background, so going through them is instant
+        self.room_cache.preload(
+            [door["door_target"] for door in self.collision_doors.values()]
+        )
+
+    # Instance every animated background sprite, 1 list of instances per background layer
+    def create_animated_instances(self):
+        self.background_instances = []
+
+        # Check if there are any actors in background_layers
+        for layer in self.background_layers:
+            layer_instances = []
+
+            for i, tile in enumerate(layer):
+                if tile != 0:
+                    sprite = self.palette[tile]
+
+                    # Found?
+                    if sprite["sprite_type"] == "animated_background":
+                        # Cell index -> room coord
+                        xds = (i % self.w_tu) * TILE_S + self.rect[0]
+                        yds = (i // self.w_tu) * TILE_S + self.rect[1]
+
+                        layer_instances.append(
+                            self.game.actors[sprite["sprite_name"]](
+                                self.sprite_sheet_surf,
+                                self.animation_clips[sprite["sprite_name"]],
+                                self.game.animation_clock,
+                                self.camera,
+                                xds,
+                                yds
+                            )
+                        )
+
+            self.background_instances.append(layer_instances)
+
+    # Build the compact collision grid from the solid layer, called on room load
+    def build_collision_grid(self):
+        # 1 byte cell kind per cell, same index as the solid layer
+        self.collision_grid = bytearray(len(self.collision_layer))
+
+        # Side table, cell index -> door cell dict, for door direction and target
+        self.collision_doors = {}
+
+        for i, tile in enumerate(self.collision_layer):
+            # Empty cell? Stays empty
+            if tile == 0:
+                continue
+
+            # Palette index -> tile dict
+            cell = self.palette[tile]
+
+            # Sprite type -> cell kind, unknown types do not collide
+            kind = CELL_KINDS.get(cell["sprite_type"], CELL_EMPTY)
+            self.collision_grid[i] = kind
+
+            # Door? Keep its data
+            if kind == CELL_DOOR:
+                self.collision_doors[i] = cell
+
+    # Render static tiles once into screen sized chunk surfaces, called on room load
+    def bake_chunks(self):
+        # Each background pass is a run of static layers, followed by the animated instances of its last layer
+        self.background_passes = []
+
+        # Prepare the first pass
+        chunks = {}
+
+        # Handle each background_layers
+        for layer, layer_instances in zip(self.background_layers, self.background_instances):
+            # Bake the static tiles in this layer, the animated instances draw themselves
+            self.bake_layer(layer, chunks)
+
+            # This layer has animated instances? They must be drawn on top of this pass, close it
+            if layer_instances:
+                self.background_passes.append(
+                    {
+                        "chunks": chunks,
+                        "instances": layer_instances
+                    }
+                )
+
+                # Start a new pass for the layers above the instances
+                chunks = {}
+
+        # Leftover static layers above the last animated instances
+        if chunks:
+            self.background_passes.append(
+                {
+                    "chunks": chunks,
+                    "instances": []
+                }
+            )
+
+        # Collision layer pass, doors are not drawn
+        self.solid_chunks = {}
+        self.bake_layer(self.collision_layer, self.solid_chunks)
+
+        # Foreground pass
+        self.foreground_chunks = {}
+        for layer in self.foreground_layers:
+            self.bake_layer(layer, self.foreground_chunks)
+
+    # Blit a layer static tiles into the given chunks
+    def bake_layer(self, layer, chunks):
+        for i, tile in enumerate(layer):
+            # Empty cell? Skip
+            if tile == 0:
+                continue
+
+            # Palette index -> tile dict
+            item = self.palette[tile]
+
+            # Its an actor? It draws itself, skip
+            if item["sprite_type"] == "animated_background":
+                continue
+
+            # Its a door? Do not draw that
+            if item["sprite_type"] == "door":
+                continue
+
+            # Cell index -> tile coord relative to room top left
+            x = (i % self.w_tu) * TILE_S
+            y = (i // self.w_tu) * TILE_S
+            w = item["sprite_region"][2]
+            h = item["sprite_region"][3]
+
+            # Blit the tile into every chunk it overlaps
+            for chunk_y in range(y // NATIVE_H, (y + h - 1) // NATIVE_H + 1):
+                for chunk_x in range(x // NATIVE_W, (x + w - 1) // NATIVE_W + 1):
+                    # Create the chunk on first use
+                    key = (chunk_x, chunk_y)
+                    if key not in chunks:
+                        chunks[key] = pg.Surface(
+                            (NATIVE_W, NATIVE_H), pg.SRCALPHA
+                        )
+
+                    # Turn room coord to chunk coord and draw
+                    chunks[key].blit(
+                        self.sprite_sheet_surf,
+                        (x - chunk_x * NATIVE_W, y - chunk_y * NATIVE_H),
+                        item["sprite_region"]
+                    )
+
+    # Bucket every pass animated instances into the chunks their rects overlap, called after bake chunks
+    def index_animated_instances(self):
+        for background_pass in self.background_passes:
+            # Each pass has its own grid, so passes still draw in order
+            instances_grid = {}
+
+            # Keep the instance index in the pass, to draw found instances in pass order
+            for i, instance in enumerate(background_pass["instances"]):
+                # Instance rect relative to room top left
+                x = instance.rect.x - self.rect[0]
+                y = instance.rect.y - self.rect[1]
+
+                # Add instance to every chunk it overlaps
+                for chunk_y in range(y // NATIVE_H, (y + instance.rect.height - 1) // NATIVE_H + 1):
+                    for chunk_x in range(x // NATIVE_W, (x + instance.rect.width - 1) // NATIVE_W + 1):
+                        instances_grid.setdefault(
+                            (chunk_x, chunk_y), []
+                        ).append((i, instance))
+
+            background_pass["instances_grid"] = instances_grid
+
+    # Return the animated instances of a background pass that overlap with given rect, in pass order
+    def search_animated_instances(self, given_rect, background_pass):
+        # Prepare output, index in pass -> instance, checks dupes in O(1)
+        found_instances = {}
+
+        # Given rect relative to room top left
+        x = int(given_rect.x) - self.rect[0]
+        y = int(given_rect.y) - self.rect[1]
+
+        # Only look in the chunks that the given rect overlaps
+        for chunk_y in range(y // NATIVE_H, (y + int(given_rect.height)) // NATIVE_H + 1):
+            for chunk_x in range(x // NATIVE_W, (x + int(given_rect.width)) // NATIVE_W + 1):
+                for i, instance in background_pass["instances_grid"].get((chunk_x, chunk_y), ()):
+                    # Instance in many chunks may be found twice, skip dupes
+                    if i in found_instances:
+                        continue
+
+                    if given_rect.colliderect(instance.rect):
+                        found_instances[i] = instance
+
+        # Return output, overlapping instances draw in the same order as the whole pass would
+        return [found_instances[i] for i in sorted(found_instances)]
+
+    # Blit the chunks that are in camera
+    def draw_chunks(self, chunks):
+        # Camera coord relative to room top left, rounded up so on screen tiles land where a per tile blit would
+        cam_x = ceil(self.camera.rect.x) - self.rect[0]
+        cam_y = ceil(self.camera.rect.y) - self.rect[1]
+
+        # Camera covers at most 2 by 2 chunks
+        for chunk_y in range(cam_y // NATIVE_H, (cam_y + NATIVE_H - 1) // NATIVE_H + 1):
+            for chunk_x in range(cam_x // NATIVE_W, (cam_x + NATIVE_W - 1) // NATIVE_W + 1):
+                # Get chunk
+                chunk = chunks.get((chunk_x, chunk_y))
+
+                # Chunk has tiles? Draw it
+                if chunk:
+                    NATIVE_SURF.blit(
+                        chunk,
+                        (
+                            chunk_x * NATIVE_W - cam_x,
+                            chunk_y * NATIVE_H - cam_y
+                        )
+                    )
+
+    # Tell dirty rects where every in camera instance and actor draws, used in dirty render mode
+    def add_actors_to_dirty_rects(self, dirty_rects):
+        # Animated instances, static tiles are in the baked chunks and only change with the camera
+        for background_pass in self.background_passes:
+            for instance in self.search_animated_instances(self.camera.rect, background_pass):
+                instance.add_to_dirty_rects(dirty_rects)
+
+        # Moving actors
+        for actor in self.quadtree.search(self.camera.rect):
+            actor.add_to_dirty_rects(dirty_rects)
+
     def add_room_to_mini_map(self, mini_map):
 
         # Prepare door container
         doors_pos = []
 
-        # Collect door position
-        for cell in self.collision_layer:
-            if cell != 0:
-                if cell["sprite_type"] == "door":
-                    xtu = cell["xds"] // TILE_S
-                    ytu = cell["yds"] // TILE_S
-                    doors_pos.append({"xtu": xtu, "ytu": ytu})
+        # Collect door position, cell index -> room tile coord
+        for i in self.collision_doors:
+            xtu = i % self.w_tu + self.x_tu
+            ytu = i // self.w_tu + self.y_tu
+            doors_pos.append({"xtu": xtu, "ytu": ytu})
 
         # Pack data for mini map
         mini_map_data = {
@@ -476,174 +598,50 @@ class Room:
             )
 
             # Add to debug draw
-            self.game.debug_draw.add(
-                {
-                    "type": "surf",
-                    "layer": 0,
-                    "x": 0,
-                    "y": 0,
-                    "surf": self.grid_surface,
-                }
+            self.game.debug_draw.add_surf(
+                layer=0,
+                surf=self.grid_surface,
+                x=0,
+                y=0
             )
 
         # Draw the background
         self.background.draw()
 
-        # Turn camera coord into tu
-        cam_x_tu = self.camera.rect.x // TILE_S
-        cam_y_tu = self.camera.rect.y // TILE_S
+        # Handle each background pass, static chunks then the animated instances on top
+        self.game.profiler.begin("room background")
+        for background_pass in self.background_passes:
+            self.draw_chunks(background_pass["chunks"])
 
-        # Turn tu into index, by sub cam offset
-        cam_x_tu = int(cam_x_tu - self.x_tu)
-        cam_y_tu = int(cam_y_tu - self.y_tu)
-
-        # Handle each background_layers
-        for layer in self.background_layers:
-            # Turn camera top left coord to index and the rest of the cells that is in camera
-            # Iterate over rows (camera width)
-            for row in range(NATIVE_H_TU_EXTRA_ONE):  # NATIVE_H_TU + 1
-                # Iterate over columns (camera height)
-                for col in range(NATIVE_W_TU_EXTRA_ONE):  # NATIVE_W_TU + 1
-                    # Compute index
-                    index = (
-                        cam_y_tu + row
-                    ) * self.w_tu + (
-                        cam_x_tu + col
-                    )
-
-                    # Makes sure its in index (because this iterates extra 1 to right and down of camera)
-                    if 0 <= index < len(layer):
-                        # Get item with index
-                        item = layer[index]
-
-                        # Find something?
-                        if item != 0:
-                            # Its an actor? let it draw itself
-                            if item["sprite_type"] == "animated_background":
-                                instance = item["instance"]
-                                instance.draw()
-                                continue
-
-                            # Not actor? turn the coord to draw coord
-                            xd = item["xds"] - self.camera.rect.x
-                            yd = item["yds"] - self.camera.rect.y
-
-                            # Draw this sprite with the draw coord
-                            NATIVE_SURF.blit(
-                                self.sprite_sheet_surf,
-                                (xd, yd),
-                                item["sprite_region"]
-                            )
+            # Its an actor in camera? let it draw itself, only the chunks in camera are looked in
+            for instance in self.search_animated_instances(self.camera.rect, background_pass):
+                instance.draw()
+        self.game.profiler.end("room background")
 
         # Handle each actor in camera
+        self.game.profiler.begin("room actors")
         for actor in self.quadtree.search(self.camera.rect):
             # Let the actor draw themselves
             actor.draw()
+        self.game.profiler.end("room actors")
 
-        # Turn camera top left coord to index and the rest of the cells that is in camera
-        # Iterate over rows (camera width)
-        for row in range(NATIVE_H_TU_EXTRA_ONE):  # NATIVE_H_TU + 1
-            # Iterate over columns (camera height)
-            for col in range(NATIVE_W_TU_EXTRA_ONE):  # NATIVE_W_TU + 1
-                # Compute index
-                index = (
-                    cam_y_tu + row
-                ) * self.w_tu + (
-                    cam_x_tu + col
-                )
-
-                # Makes sure its in index (because this iterates extra 1 to right and down of camera)
-                if 0 <= index < len(self.collision_layer):
-                    # Get item with index
-                    item = self.collision_layer[index]
-
-                    # Find something
-                    if item != 0:
-                        # Its a door? Do not draw that
-                        if item["sprite_type"] != "door":
+        # Draw the solid chunks
+        self.game.profiler.begin("room solid")
+        self.draw_chunks(self.solid_chunks)
+        self.game.profiler.end("room solid")
 
-                            # Turn this solid tile coord to draw coord
-                            xd = item["xds"] - self.camera.rect.x
-                            yd = item["yds"] - self.camera.rect.y
-
-                            # Draw this sprite with the draw coord
-                            NATIVE_SURF.blit(
-                                self.sprite_sheet_surf,
-                                (xd, yd),
-                                item["sprite_region"]
-                            )
-
-        # Handle each foreground_layers
-        for layer in self.foreground_layers:
-            # Turn camera top left coord to index and the rest of the cells that is in camera
-            # Iterate over rows (camera width)
-            for row in range(NATIVE_H_TU_EXTRA_ONE):  # NATIVE_H_TU + 1
-                # Iterate over columns (camera height)
-                for col in range(NATIVE_W_TU_EXTRA_ONE):  # NATIVE_W_TU + 1
-                    # Compute index
-                    index = (
-                        cam_y_tu + row
-                    ) * self.w_tu + (
-                        cam_x_tu + col
-                    )
-
-                    # Makes sure its in index (because this iterates extra 1 to right and down of camera)
-                    if 0 <= index < len(layer):
-                        # Get item with index
-                        item = layer[index]
-
-                        # Find something
-                        if item != 0:
-                            # Turn this foreground tile coord to draw coord
-                            xd = item["xds"] - self.camera.rect.x
-                            yd = item["yds"] - self.camera.rect.y
-
-                            # Draw this sprite with the draw coord
-                            NATIVE_SURF.blit(
-                                self.sprite_sheet_surf,
-                                (xd, yd),
-                                item["sprite_region"]
-                            )
+        # Draw the foreground chunks
+        self.game.profiler.begin("room foreground")
+        self.draw_chunks(self.foreground_chunks)
+        self.game.profiler.end("room foreground")
 
         # Draw quadtree for debug
         if self.game.is_debug:
             self.quadtree.draw(self.game, self.camera)
 
     def update(self, dt):
-        # Turn camera coord into tu
-        cam_x_tu = self.camera.rect.x // TILE_S
-        cam_y_tu = self.camera.rect.y // TILE_S
-
-        # Turn tu into index, by sub cam offset
-        cam_x_tu = int(cam_x_tu - self.x_tu)
-        cam_y_tu = int(cam_y_tu - self.y_tu)
-
-        # Handle each background_layers
-        for layer in self.background_layers:
-            # Turn camera top left coord to index and the rest of the cells that is in camera
-            # Iterate over rows (camera width)
-            for row in range(NATIVE_H_TU_EXTRA_ONE):  # NATIVE_H_TU + 1
-                # Iterate over columns (camera height)
-                for col in range(NATIVE_W_TU_EXTRA_ONE):  # NATIVE_W_TU + 1
-                    # Calculate index for the current tile
-                    # Compute index
-                    index = (
-                        cam_y_tu + row
-                    ) * self.w_tu + (
-                        cam_x_tu + col
-                    )
-
-                    # Makes sure its in index (because this iterates extra 1 to right and down of camera)
-                    if 0 <= index < len(layer):
-                        # Get item with index
-                        item = layer[index]
-
-                        # Find something
-                        if item != 0:
-                            # Found actor? let it update itself
-                            if item["sprite_type"] == "animated_background":
-                                instance = item["instance"]
-                                instance.update(dt)
+        # Animated instances share the game animation clock cursors, move them all once
+        self.game.animation_clock.update(dt)
 
         # Handle each actor in camera
         for actor in self.quadtree.search(self.camera.rect):
@@ -0,0 +1,104 @@
+from constants import *
+from nodes.room_format import RoomFormat
+from collections import OrderedDict
+from threading import Lock
+from threading import Thread
+
+
+class RoomCache:
+    '''
+    How to use:
+        1: Room owns me, give me how many rooms to keep
+        2: Room asks my get for the room it loads, I give back its entry, room format data in "room_data"
+        3: Room stores what it baked for that room in the entry "baked", next time it can skip baking
+        4: After a room is loaded, give my preload the room names behind its doors
+
+    What will happen:
+        1: Preload reads the given rooms on a background thread, one thread per call
+        2: Get of a preloaded room is only a dict lookup, else the room is read right there
+        3: Every get and preload marks the room as recently used, the least recently used is dropped past my size
+        4: Entries are shared, room must not change room data lists in place, copy them first
+        5: Stage changed? Call my release stage, baked chunks and instances of its rooms hold its surfaces, they are dropped
+    '''
+
+    def __init__(self, size):
+        # Max rooms kept
+        self.size = size
+
+        # Room name -> entry, oldest first
+        self.entries = OrderedDict()
+
+        # Preload threads and main thread both touch entries
+        self.lock = Lock()
+
+        # Reads baked room bins, or room jsons that were not baked
+        self.room_format = RoomFormat()
+
+    # Read room data, safe to call from any thread
+    def parse(self, name):
+        return self.room_format.load(name)
+
+    # Put an entry in, drop the least recently used past my size, call with lock held
+    def put(self, name, entry):
+        self.entries[name] = entry
+        self.entries.move_to_end(name)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    # Get room entry, parse now if it was not preloaded
+    def get(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None:
+                self.entries.move_to_end(name)
+                return entry
+
+        # Not in cache, parse outside the lock so preload is not blocked
+        entry = {
+            "room_data": self.parse(name),
+            "baked": None,
+        }
+
+        with self.lock:
+            # Preload finished it in the meantime? Use that one
+            if name in self.entries:
+                self.entries.move_to_end(name)
+                return self.entries[name]
+
+            self.put(name, entry)
+
+        return entry
+
+    # Drop what was baked for the rooms of a stage, the parsed room data stays, it holds no surfaces
+    def release_stage(self, stage_no):
+        with self.lock:
+            for entry in self.entries.values():
+                if entry["room_data"]["stage_no"] == stage_no:
+                    entry["baked"] = None
+
+    # Parse the given rooms on a background thread, skips rooms already cached
+    def preload(self, names):
+        with self.lock:
+            names = [
+                name for name in dict.fromkeys(names)
+                if name not in self.entries
+            ]
+
+        # All cached already? No thread needed
+        if not names:
+            return
+
+        Thread(target=self.preload_helper, args=(names,), daemon=True).start()
+
+    # Preload helper above, runs on the background thread
+    def preload_helper(self, names):
+        for name in names:
+            entry = {
+                "room_data": self.parse(name),
+                "baked": None,
+            }
+
+            with self.lock:
+                # Loaded by get in the meantime? Keep that one
+                if name not in self.entries:
+                    self.put(name, entry)
@@ -0,0 +1,291 @@
+from constants import *
+from array import array
+from glob import glob
+from json import dumps
+from json import loads
+from mmap import ACCESS_READ
+from mmap import mmap
+from os.path import exists
+from os.path import getmtime
+from struct import calcsize
+from struct import pack
+from struct import unpack_from
+from sys import byteorder
+
+
+class RoomFormat:
+    '''
+    How to use:
+        1: Room cache uses my load to read a room by its json name, eg. "stage_1_hallway_game.json"
+        2: Bake rooms script and room editor use my from json and save to write the baked bin of a room
+        3: They also use my save world to pack every room of a stage into 1 world file
+        4: Room reads tiles from the room data I give back, layer cells are palette indexes, 0 is empty
+
+    What will happen:
+        1: Room json repeats a whole dict per cell with its xds yds, those are dropped since index gives the position
+        2: Each unique tile dict goes into a palette once, door target and direction stay in their tile
+        3: Each layer becomes a uint16 array of palette indexes, 1 per cell, same order as the json layer
+        4: Bin is a header, a small json block (room rect, stage, actors, palette) then every layer array back to back
+        5: World is a header, a json directory (room name -> offset and size) then each room bin, 8 byte aligned
+        6: World files are memory mapped when I am made, a room load only parses its small meta json
+        7: Its layers are views into the mapped file, the os only reads the pages that are touched, nothing is copied
+        8: Load reads the stage world first, then the room bin, else it converts the json on the spot, room gets the same data either way
+        9: A world or bin older than its room json is stale, load warns once and converts the json instead
+    '''
+
+    # Bin header, magic, version and meta json byte size
+    HEADER = "<4sHI"
+    MAGIC = b"ROOM"
+    VERSION = 1
+
+    # World header, magic, version and directory json byte size
+    WORLD_HEADER = "<4sHI"
+    WORLD_MAGIC = b"WRLD"
+
+    def __init__(self, is_open_worlds=True):
+        # Room name -> (its block view in a mapped world, world path)
+        self.world_rooms = {}
+
+        # Mapped world files, kept open while I live
+        self.world_maps = []
+
+        # Room names already warned about a stale bake, warn once each
+        self.stale_names = set()
+
+        # Map the stage worlds, only their directories are read, bakers that rewrite them do not
+        if is_open_worlds:
+            self.open_worlds()
+
+    # Room json name -> its baked bin path
+    def get_bin_path(self, name):
+        return join(BINS_DIR_PATH, name.replace(".json", ".bin"))
+
+    # Is the baked file older than the room json? Json was edited after baking
+    def is_stale(self, name, path):
+        if getmtime(JSONS_PATHS[name]) <= getmtime(path):
+            return False
+
+        if name not in self.stale_names:
+            self.stale_names.add(name)
+            print(f"{path} is older than {JSONS_PATHS[name]}, loading the json, run bake_rooms.py {name}")
+        return True
+
+    # Read a room by its json name, stage world first, then room bin, baked files older than the json are skipped
+    def load(self, name):
+        # In a mapped world? Its layers are read straight from the mapped file
+        if name in self.world_rooms:
+            world_room, path = self.world_rooms[name]
+            if not self.is_stale(name, path):
+                return self.from_buffer(world_room, path)
+
+        bin_path = self.get_bin_path(name)
+        if exists(bin_path) and not self.is_stale(name, bin_path):
+            return self.load_bin(bin_path)
+
+        # Not baked? Convert the json
+        with open(JSONS_PATHS[name], "r") as data:
+            return self.from_json(load(data))
+
+    # Turn a room json into palette and index arrays
+    def from_json(self, room_json):
+        # Index 0 is the empty cell
+        palette = [None]
+
+        # Tile dict as text -> its palette index
+        palette_indexes = {}
+
+        # Turn 1 json layer into 1 index array
+        def to_indexes(layer):
+            indexes = array("H", bytes(2 * len(layer)))
+            for i, cell in enumerate(layer):
+                # Empty cell? Stays 0
+                if cell == 0:
+                    continue
+
+                # Same tile everywhere but its position, which the index already gives
+                tile = {
+                    key: value for key, value in cell.items()
+                    if key != "xds" and key != "yds"
+                }
+                tile_key = dumps(tile, sort_keys=True)
+
+                # New tile? Add it to the palette
+                if tile_key not in palette_indexes:
+                    palette_indexes[tile_key] = len(palette)
+                    palette.append(tile)
+
+                indexes[i] = palette_indexes[tile_key]
+            return indexes
+
+        return {
+            "room_rect": room_json["room_rect"],
+            "sprite_sheet_name": room_json["sprite_sheet_name"],
+            "desired_background_names": room_json["desired_background_names"],
+            "stage_no": room_json["stage_no"],
+            "actor_layer": room_json["actor_layer"],
+            "background_layer": [
+                to_indexes(layer) for layer in room_json["background_layer"]
+            ],
+            "solid_layer": to_indexes(room_json["solid_layer"]),
+            "foreground_layer": [
+                to_indexes(layer) for layer in room_json["foreground_layer"]
+            ],
+            "palette": palette,
+        }
+
+    # Room data from my from json -> bin bytes
+    def to_bytes(self, room_data):
+        # Everything that is not a layer array
+        meta = {
+            "room_rect": room_data["room_rect"],
+            "sprite_sheet_name": room_data["sprite_sheet_name"],
+            "desired_background_names": room_data["desired_background_names"],
+            "stage_no": room_data["stage_no"],
+            "actor_layer": room_data["actor_layer"],
+            "palette": room_data["palette"][1:],
+            "background_layers_total": len(room_data["background_layer"]),
+            "foreground_layers_total": len(room_data["foreground_layer"]),
+        }
+        meta_bytes = dumps(meta, separators=(",", ":")).encode("utf-8")
+
+        # Pad meta with spaces so layers start 8 byte aligned, they are read in place
+        meta_bytes += b" " * (-(calcsize(self.HEADER) + len(meta_bytes)) % 8)
+
+        # Layers back to back, always little endian
+        layers = (
+            room_data["background_layer"]
+            + [room_data["solid_layer"]]
+            + room_data["foreground_layer"]
+        )
+
+        data = [pack(self.HEADER, self.MAGIC, self.VERSION, len(meta_bytes)), meta_bytes]
+        for layer in layers:
+            layer = array("H", layer)
+            if byteorder == "big":
+                layer.byteswap()
+            data.append(layer.tobytes())
+
+        return b"".join(data)
+
+    # Write room data from my from json to a bin
+    def save(self, room_data, path):
+        with open(path, "wb") as bin_file:
+            bin_file.write(self.to_bytes(room_data))
+
+    # Read a bin from my save
+    def load_bin(self, path):
+        with open(path, "rb") as bin_file:
+            return self.from_buffer(memoryview(bin_file.read()), path)
+
+    # Read room data from bin bytes, layers are views into the given buffer, not copies
+    def from_buffer(self, buffer, path):
+        # Check header
+        magic, version, meta_size = unpack_from(self.HEADER, buffer)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a version {self.VERSION} room bin")
+
+        # Meta json block
+        offset = calcsize(self.HEADER)
+        meta = loads(bytes(buffer[offset:offset + meta_size]))
+        offset += meta_size
+
+        # Every layer has 1 uint16 per cell
+        room_rect = meta["room_rect"]
+        layer_size = 2 * (room_rect[2] // TILE_S) * (room_rect[3] // TILE_S)
+
+        # Read the layer arrays in save order
+        layers = []
+        total = meta["background_layers_total"] + 1 + meta["foreground_layers_total"]
+        for _ in range(total):
+            layer = buffer[offset:offset + layer_size]
+
+            # Little endian machine? Read in place, else copy and swap
+            if byteorder == "little":
+                layer = layer.cast("H")
+            else:
+                layer = array("H", layer.tobytes())
+                layer.byteswap()
+
+            layers.append(layer)
+            offset += layer_size
+
+        background_layers_total = meta["background_layers_total"]
+        return {
+            "room_rect": room_rect,
+            "sprite_sheet_name": meta["sprite_sheet_name"],
+            "desired_background_names": meta["desired_background_names"],
+            "stage_no": meta["stage_no"],
+            "actor_layer": meta["actor_layer"],
+            "background_layer": layers[:background_layers_total],
+            "solid_layer": layers[background_layers_total],
+            "foreground_layer": layers[background_layers_total + 1:],
+            "palette": [None] + meta["palette"],
+        }
+
+    # Stage no -> its packed world path
+    def get_world_path(self, stage_no):
+        return join(BINS_DIR_PATH, f"stage_{stage_no}_world.bin")
+
+    # Every game room json name of a stage
+    def get_stage_names(self, stage_no):
+        return [
+            name for name in JSONS_PATHS
+            if name.startswith(f"stage_{stage_no}_") and name.endswith("_game.json")
+        ]
+
+    # Pack the given room jsons into 1 world file, each room block is its bin bytes
+    def save_world(self, path, names):
+        # Room blocks, 8 byte aligned in the file
+        blocks = []
+        for name in names:
+            with open(JSONS_PATHS[name], "r") as data:
+                blocks.append((name, self.to_bytes(self.from_json(load(data)))))
+
+        # Directory, room name -> [offset, size], offsets depend on its size, so grow until it fits
+        directory_size = 0
+        while True:
+            offset = calcsize(self.WORLD_HEADER) + directory_size
+            directory = {}
+            for name, block in blocks:
+                offset += -offset % 8
+                directory[name] = [offset, len(block)]
+                offset += len(block)
+
+            directory_bytes = dumps(directory, separators=(",", ":")).encode("utf-8")
+            if len(directory_bytes) <= directory_size:
+                break
+            directory_size = len(directory_bytes)
+
+        # Pad directory with spaces to its reserved size
+        directory_bytes += b" " * (directory_size - len(directory_bytes))
+
+        with open(path, "wb") as world_file:
+            world_file.write(
+                pack(self.WORLD_HEADER, self.WORLD_MAGIC, self.VERSION, directory_size)
+            )
+            world_file.write(directory_bytes)
+            for name, block in blocks:
+                world_file.write(b"\0" * (directory[name][0] - world_file.tell()))
+                world_file.write(block)
+
+    # Map every world file in bins, fill the room name -> room block view lookup
+    def open_worlds(self):
+        for path in sorted(glob(join(BINS_DIR_PATH, "stage_*_world.bin"))):
+            with open(path, "rb") as world_file:
+                world_map = mmap(world_file.fileno(), 0, access=ACCESS_READ)
+
+            # Check header
+            magic, version, directory_size = unpack_from(self.WORLD_HEADER, world_map)
+            if magic != self.WORLD_MAGIC or version != self.VERSION:
+                raise ValueError(f"{path} is not a version {self.VERSION} world bin")
+
+            # Directory json block
+            offset = calcsize(self.WORLD_HEADER)
+            directory = loads(world_map[offset:offset + directory_size])
+
+            # Only views, nothing is read until a room is loaded
+            world_view = memoryview(world_map)
+            for name, (offset, size) in directory.items():
+                self.world_rooms[name] = (world_view[offset:offset + size], path)
+
+            self.world_maps.append(world_map)
@@ -0,0 +1,174 @@
+from constants import *
+
+
+class SpatialHash:
+    '''
+    How to use:
+        1: Drop in for quadtree, same insert, search, relocate, remove actor, set rect, clear and draw
+        2: In room, create this and pass the room size, game spatial index setting picks me or quadtree
+        3: Room instances actors with its json data, for each instance add it to me with my insert method
+        4: When room is changed, use the set_rect setter, this empties me
+        5: If actors move, call the relocate and pass the moved actor right after you have updated its position
+
+    What will happen:
+        1: The world is cut into a uniform grid of square cells (buckets), cell size is given, tile or screen size
+        2: Inserted actor is added to every bucket its rect overlaps, the book remembers which buckets
+        3: Relocate does nothing if the actor is still in the same buckets, else it removes and inserts it
+        4: Search only looks in the buckets that the given rect overlaps, no recursion
+        5: Empty buckets are deleted, so memory follows the actors, not the room size
+    '''
+
+    def __init__(self, rect, room, cell_size=TILE_S * 4):
+        # Get room
+        self.room = room
+
+        # My rect, only used for debug draw, actors outside of it are still stored
+        self.rect = rect
+
+        # Bucket size in px
+        self.cell_size = cell_size
+
+        # Bucket key (x, y) -> actors in that bucket
+        self.buckets = {}
+
+        # Book, actor -> bucket key range (x0, y0, x1, y1) it is in
+        self.actor_to_cells = {}
+
+    # Called when room changed, set my rect to be as big as room
+    def set_rect(self, rect):
+        # Clear first, removes all existing actors
+        self.clear()
+
+        # Update my rect
+        self.rect = rect
+
+    # Removes all actors and buckets
+    def clear(self):
+        self.buckets.clear()
+        self.actor_to_cells.clear()
+
+    # In case I need to know how many actors are in me
+    def size(self):
+        return len(self.actor_to_cells)
+
+    # Given rect -> bucket key range
+    def get_cells(self, given_rect):
+        return (
+            int(given_rect.x // self.cell_size),
+            int(given_rect.y // self.cell_size),
+            int((given_rect.x + given_rect.width) // self.cell_size),
+            int((given_rect.y + given_rect.height) // self.cell_size)
+        )
+
+    # Called when room first created or when actors position changed / relocated
+    def insert(self, given_actor):
+        # Get the buckets this actor overlaps
+        cells = self.get_cells(given_actor.rect)
+
+        # Add actor to each of them, create bucket if needed
+        for y in range(cells[1], cells[3] + 1):
+            for x in range(cells[0], cells[2] + 1):
+                self.buckets.setdefault((x, y), []).append(given_actor)
+
+        # Fill book, store the mapping of actor to its buckets
+        self.actor_to_cells[given_actor] = cells
+
+    # Return actors list that overlap with given rect
+    def search(self, given_rect):
+        # REMOVE IN BUILD, time it when I belong to a room
+        if self.room:
+            self.room.game.profiler.begin("spatial hash search")
+
+        # Prepare output, dict keeps insertion order and drops dupes from actors in many buckets
+        found_actors = {}
+
+        # Get the buckets the given rect overlaps
+        cells = self.get_cells(given_rect)
+
+        # Check actors in each bucket
+        for y in range(cells[1], cells[3] + 1):
+            for x in range(cells[0], cells[2] + 1):
+                bucket = self.buckets.get((x, y))
+
+                # No bucket here? Next
+                if not bucket:
+                    continue
+
+                for actor in bucket:
+                    if given_rect.colliderect(actor.rect):
+                        found_actors[actor] = None
+
+        # REMOVE IN BUILD
+        if self.room:
+            self.room.game.profiler.end("spatial hash search")
+
+        # Return output
+        return list(found_actors)
+
+    # Remove a certain actor from its buckets
+    def remove_actor(self, given_actor):
+        # Use the actor to immediately get the buckets it is in, also deletes that book row
+        cells = self.actor_to_cells.pop(given_actor, None)
+
+        # 400 not found
+        if cells is None:
+            return False
+
+        # Remove actor from each bucket, delete bucket when empty
+        for y in range(cells[1], cells[3] + 1):
+            for x in range(cells[0], cells[2] + 1):
+                bucket = self.buckets[(x, y)]
+                bucket.remove(given_actor)
+                if not bucket:
+                    del self.buckets[(x, y)]
+
+        # 200 deleted ok
+        return True
+
+    # Call this and pass the actor right after they have moved / updated their position
+    def relocate(self, given_actor):
+        # Not in book? Nothing to relocate
+        if given_actor not in self.actor_to_cells:
+            return
+
+        # Still in the same buckets? Nothing to do
+        if self.actor_to_cells[given_actor] == self.get_cells(given_actor.rect):
+            return
+
+        # Moved to other buckets
+        self.remove_actor(given_actor)
+        self.insert(given_actor)
+
+    # Debugging purposes to show all of the non empty buckets
+    def draw(self, game, camera):
+        # My rect
+        game.debug_draw.add_rect(
+            layer=2,
+            color="cyan",
+            rect=[self.rect.x - camera.rect.x, self.rect.y - camera.rect.y, self.rect.width, self.rect.height],
+            width=1
+        )
+
+        for (x, y), bucket in self.buckets.items():
+            # Bucket rect
+            xd = x * self.cell_size - camera.rect.x
+            yd = y * self.cell_size - camera.rect.y
+            game.debug_draw.add_rect(
+                layer=2,
+                color="cyan",
+                rect=[xd, yd, self.cell_size, self.cell_size],
+                width=1
+            )
+
+            # Draw how many actors it has
+            game.debug_draw.add_text(
+                layer=4,
+                x=xd + FONT_W,
+                y=yd + FONT_H,
+                text=f"actors: {len(bucket)}"
+            )
+
+    # In case I need to get all of the actors instance from me
+    def get_all_actors(self):
+        # Every actor is a key in the book
+        return list(self.actor_to_cells)
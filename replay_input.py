@@ -0,0 +1,84 @@
+# REMOVE IN BUILD
+# Headless World replay of an input recording, run from the project root:
+# python replay_input.py input.rec                            times of each profiler scope
+# python replay_input.py input.rec --csv before.csv           also write every frame, to compare commits
+# Record one in game, press 8 to start and 8 again to stop, it is saved to input.rec
+import os
+from argparse import ArgumentParser
+from collections import deque
+from hashlib import md5
+
+# No window and no sound device needed
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from constants import *
+from nodes.game import Game
+
+
+# Nearest rank percentile of a sorted list
+def percentile(sorted_values, value):
+    i = max(0, min(len(sorted_values) - 1, round(value / 100 * len(sorted_values)) - 1))
+    return sorted_values[i]
+
+
+def main():
+    parser = ArgumentParser(description="Headless World input replay")
+    parser.add_argument("recording", help="input recording from the game, eg. input.rec")
+    parser.add_argument("--csv", help="write every frame scope times to this csv")
+    args = parser.parse_args()
+
+    game = Game("World")
+    world = game.current_scene
+
+    # Put the world where the recording started, with its loop mode
+    input_recorder = game.input_recorder
+    input_recorder.load(args.recording)
+    input_recorder.set_start(world)
+
+    # Time everything main loop times, keep every frame
+    game.profiler.is_enabled = True
+    game.profiler.history = deque()
+
+    # Player path, same recording and same build must give the same one
+    path_hash = md5()
+
+    while not input_recorder.is_replay_done():
+        # Recorded flags instead of events
+        dt = input_recorder.replay(game)
+
+        game.profiler.begin("draw")
+        world.draw()
+        game.profiler.end("draw")
+
+        game.profiler.begin("update")
+        game.update(dt)
+        game.profiler.end("update")
+
+        game.profiler.end_frame()
+
+        path_hash.update(
+            f"{world.room.name} {world.player.rect.x} {world.player.rect.y};".encode("utf-8")
+        )
+
+    print(
+        f"{len(input_recorder.flags)} frames from {input_recorder.meta["room_name"]}, "
+        f"path {path_hash.hexdigest()}, times in ms"
+    )
+    print(f"{'scope':<24} {'p50':>7} {'p95':>7} {'p99':>7} {'total':>9}")
+
+    # Frames a scope did not run in count as 0
+    for name in game.profiler.scope_names:
+        times = sorted(frame.get(name, 0) for frame in game.profiler.history)
+        print(
+            f"{name[:24]:<24} {percentile(times, 50) / 1000000:>7.3f} "
+            f"{percentile(times, 95) / 1000000:>7.3f} {percentile(times, 99) / 1000000:>7.3f} "
+            f"{sum(times) / 1000000:>9.1f}"
+        )
+
+    if args.csv:
+        game.profiler.save(args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,9 +20,9 @@ class JsonEditor:
 
         self.sprite_sheet_path = PNGS_PATHS[f"stage_{
             self.stage_no}_sprite_sheet.png"]
-        self.sprite_sheet_surface = pg.image.load(
-            self.sprite_sheet_path
-        ).convert_alpha()
+        self.sprite_sheet_surface = self.game.asset_manager.get_surface(
+            self.sprite_sheet_path, "editor"
+        )
         self.sprite_sheet_rect = self.sprite_sheet_surface.get_rect()
 
         self.offset = Vector2(0.0, 0.0)
@@ -461,6 +461,7 @@ class JsonEditor:
             "total_layers": 0,
             "solid_layer": 0,
             "actor_layer": 0,
+            "backgrounds": [],
             "sprites": []
         }
 
@@ -548,7 +549,7 @@ class JsonEditor:
         # tu is availbale from here for index access
 
         if self.state == "setting start rect":
-            if self.game.is_lmb_just_pressed:
+            if self.game.input.is_just_pressed(ACTION_LMB):
                 x = int(x_tu * TILE_S)
                 y = int(y_tu * TILE_S)
                 self.start_selection_rect = pg.Rect(x, y, TILE_S, TILE_S)
@@ -556,7 +557,7 @@ class JsonEditor:
                 self.sound_manager.play_sound("cursor")
 
             # Save and quit
-            if self.game.is_enter_just_pressed == True:
+            if self.game.input.is_just_pressed(ACTION_ENTER) == True:
                 # Sanitize
                 for sprite in self.to_be_saved["sprites"]:
                     # Not door? no need door direction
@@ -567,6 +568,16 @@ class JsonEditor:
                     if sprite["sprite_bitmask_type"] == "none":
                         sprite.pop("sprite_is_bitmask_mix")
                         sprite.pop("sprite_regions")
+
+                # Backgrounds are hand written, keep the ones the old file has
+                try:
+                    with open(self.save_path, "r") as json_file:
+                        self.to_be_saved["backgrounds"] = load(json_file).get(
+                            "backgrounds", []
+                        )
+                except (FileNotFoundError, ValueError):
+                    pass
+
                 # Write
                 with open(self.save_path, "w") as json_file:
                     dump(self.to_be_saved, json_file)
@@ -588,12 +599,12 @@ class JsonEditor:
             )
 
             # Made a mistake, cancel back to selecting start point
-            if self.game.is_pause_just_pressed == True:
+            if self.game.input.is_just_pressed(ACTION_PAUSE) == True:
                 self.state = "setting start rect"
                 self.sound_manager.play_sound("cancel")
 
             # Confirm selection, start asking
-            if self.game.is_lmb_just_pressed == True:
+            if self.game.input.is_just_pressed(ACTION_LMB) == True:
                 self.sound_manager.play_sound("cursor")
 
                 sprite_name = input("Sprite name: ")
@@ -712,11 +723,11 @@ class JsonEditor:
 
     def update(self, dt):
         self.offset.x += (
-            self.game.is_right_pressed - self.game.is_left_pressed
+            self.game.input.is_held(ACTION_RIGHT) - self.game.input.is_held(ACTION_LEFT)
         ) * self.camera_speed
 
         self.offset.y += (
-            self.game.is_down_pressed - self.game.is_up_pressed
+            self.game.input.is_held(ACTION_DOWN) - self.game.input.is_held(ACTION_UP)
         ) * self.camera_speed
 
         self.camera.update(dt)
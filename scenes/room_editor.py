@@ -2,7 +2,10 @@ from constants import *
 from nodes.camera import Camera
 from nodes.curtain import Curtain
 from nodes.background import Background
+from nodes.room_format import RoomFormat
 import copy
+from os import makedirs
+from collections import deque
 
 
 class RoomEditor:
@@ -115,6 +118,7 @@ class RoomEditor:
         self.actor_layer = stage_data["actor_layer"]
         self.sprites = stage_data["sprites"]
         self.sprites_len = len(self.sprites)
+        self.backgrounds = stage_data.get("backgrounds", [])
 
         # Move this
         self.offset = Vector2(0.0, 0.0)
@@ -125,9 +129,9 @@ class RoomEditor:
 
         # Get stage sprite sheet
         self.sprite_sheet_path = PNGS_PATHS[f"{self.sprite_sheet_name}"]
-        self.sprite_sheet_surface = pg.image.load(
-            self.sprite_sheet_path
-        ).convert_alpha()
+        self.sprite_sheet_surface = self.game.asset_manager.get_surface(
+            self.sprite_sheet_path, "editor"
+        )
 
         # Get room
         self.room_x_tu = self.room_x_ru * NATIVE_W_TU
@@ -153,8 +157,8 @@ class RoomEditor:
         # Menu lookup
         self.menu_collisions = [0 for _ in range(NATIVE_W_TU * NATIVE_H_TU)]
 
-        # Collect animation data for this stage
-        self.animation_data = {}
+        # Collect animation clips for this stage
+        self.animation_clips = {}
 
         # Draw menu surface
         self.menu_surface = pg.Surface((NATIVE_W, NATIVE_H))
@@ -183,19 +187,22 @@ class RoomEditor:
 
             # Find animated sprites
             if sprite["sprite_type"] == "animated_background":
-                # Load the animation data for this sprite
-                with open(
-                    JSONS_PATHS[f"{sprite["sprite_name"]}_animation.json"], "r"
-                ) as data:
-                    animation_data = load(data)
+                # Load the animation clips for this sprite
+                animation_clips = self.game.asset_manager.get_animation_clips(
+                    JSONS_PATHS[f"{sprite["sprite_name"]}_animation.json"],
+                    "editor"
+                )
 
                 # Collect it
-                self.animation_data[sprite["sprite_name"]] = animation_data
+                self.animation_clips[sprite["sprite_name"]] = animation_clips
 
         self.selected_sprite = self.menu_collisions[0]
         self.selected_layer = self.layers_list[self.selected_sprite["sprite_layer"]]
 
         self.start_selection_rect = None
+
+        # Cells the last bucket fill touched, shown in debug
+        self.bucket_fill_touched = 0
         self.selection_rect = None
 
         self.game = game
@@ -212,69 +219,25 @@ class RoomEditor:
 
         self.state = "normal"
 
-        # This one cannot be saved to json needs to be hardcoded or saved to const
-
         if IS_LOAD == "no":
-            # Handle bg options
-            if self.stage_no == 1:
-                is_sky = self.selectFromDict(
-                    self.binary_types, "Sky background"
-                )
-                self.sound_manager.play_sound("accept")
-
-                is_clouds = self.selectFromDict(
-                    self.binary_types, "Clouds background"
-                )
-                self.sound_manager.play_sound("accept")
-
-                is_temple = self.selectFromDict(
-                    self.binary_types, "Temple background"
-                )
-                self.sound_manager.play_sound("accept")
-
-                is_trees = self.selectFromDict(
-                    self.binary_types, "Trees background"
-                )
-                self.sound_manager.play_sound("accept")
-
-                is_blue_glow = self.selectFromDict(
-                    self.binary_types, "Blue glow background"
+            # Handle bg options, ask for each layer the stage declares
+            for i, background in enumerate(self.backgrounds):
+                is_background = self.selectFromDict(
+                    self.binary_types,
+                    f"{background['name'].replace('_', ' ').capitalize()} background"
                 )
-                self.sound_manager.play_sound("success")
-
-                if is_sky == "yes":
-                    self.desired_background_names.append("sky")
-
-                if is_clouds == "yes":
-                    self.desired_background_names.append("clouds")
-
-                if is_temple == "yes":
-                    self.desired_background_names.append("temple")
-
-                if is_trees == "yes":
-                    self.desired_background_names.append("trees")
-
-                if is_blue_glow == "yes":
-                    self.desired_background_names.append("blue_glow")
 
-            elif self.stage_no == 2:
-                is_rock = self.selectFromDict(
-                    self.binary_types, "Rock background"
-                )
-                self.sound_manager.play_sound("accept")
-
-                is_orange_glow = self.selectFromDict(
-                    self.binary_types, "Orange glow background"
-                )
-                self.sound_manager.play_sound("success")
-
-                if is_rock == "yes":
-                    self.desired_background_names.append("rock")
+                # Last one? Play success instead
+                if i == len(self.backgrounds) - 1:
+                    self.sound_manager.play_sound("success")
+                else:
+                    self.sound_manager.play_sound("accept")
 
-                if is_orange_glow == "yes":
-                    self.desired_background_names.append("orange_glow")
+                if is_background == "yes":
+                    self.desired_background_names.append(background["name"])
 
         self.background = Background(
+            self.game.asset_manager,
             self.sprite_sheet_surface,
             self.camera,
             self.stage_no,
@@ -295,38 +258,69 @@ class RoomEditor:
                         # Add a new pair instance
                         sprite["instance"] = self.game.actors[sprite["sprite_name"]](
                             self.sprite_sheet_surface,
-                            self.animation_data[sprite["sprite_name"]],
+                            self.animation_clips[sprite["sprite_name"]],
+                            self.game.animation_clock,
                             self.camera,
                             sprite["xds"],
                             sprite["yds"]
                         )
 
-    def update_bitmasks(self, x_tu, y_tu, xds, yds, last=False):
-        # Raw bits
-        br, b, bl, r, l, tr, t, tl = 0, 0, 0, 0, 0, 0, 0, 0
-
-        # Check my neighbour positions
-        neighbour_pos_tu = [
-            (x_tu - 1, y_tu - 1), (x_tu - 0, y_tu - 1), (x_tu + 1, y_tu - 1),
-            (x_tu - 1, y_tu - 0),                       (x_tu + 1, y_tu - 0),
-            (x_tu - 1, y_tu + 1), (x_tu - 0, y_tu + 1), (x_tu + 1, y_tu + 1)
-        ]
-
+    # Neighbour positions that the selected sprite bitmask type looks at
+    def get_bitmask_neighbours_pos(self, x_tu, y_tu):
         # Top and bottom checks only
         if self.selected_sprite["sprite_bitmask_type"] in "vertical":
-            neighbour_pos_tu = [
+            return [
                 (x_tu - 0, y_tu - 1),
                 (x_tu - 0, y_tu + 1),
             ]
 
         # Left and right checks only
-        elif self.selected_sprite["sprite_bitmask_type"] in "horizontal":
-            neighbour_pos_tu = [
+        if self.selected_sprite["sprite_bitmask_type"] in "horizontal":
+            return [
                 (x_tu - 1, y_tu - 0), (x_tu + 1, y_tu - 0),
             ]
 
+        # Check my neighbour positions
+        return [
+            (x_tu - 1, y_tu - 1), (x_tu - 0, y_tu - 1), (x_tu + 1, y_tu - 1),
+            (x_tu - 1, y_tu - 0),                       (x_tu + 1, y_tu - 0),
+            (x_tu - 1, y_tu + 1), (x_tu - 0, y_tu + 1), (x_tu + 1, y_tu + 1)
+        ]
+
+    # Does this neighbour join the selected sprite bitmask?
+    def is_bitmask_neighbour(self, neighbour):
+        # Air? Not a neighbour
+        if neighbour == 0:
+            return False
+
+        # I do not mix?
+        if self.selected_sprite["sprite_bitmask_type"] == "none":
+            return False
+
+        # I do not mix?
+        if self.selected_sprite["sprite_is_bitmask_mix"] == "no":
+            # Neighbour diff name than me? look for someone else
+            if self.selected_sprite["sprite_name"] != neighbour["sprite_name"]:
+                return False
+
+        # I do mix?
+        if self.selected_sprite["sprite_is_bitmask_mix"] == "yes":
+            # Neighbour not bitmask?
+            if neighbour["sprite_bitmask_type"] == "none":
+                return False
+
+            # Neighbour not mix?
+            if neighbour["sprite_is_bitmask_mix"] == "no":
+                return False
+
+        return True
+
+    def update_bitmasks(self, x_tu, y_tu, xds, yds, last=False):
+        # Raw bits
+        br, b, bl, r, l, tr, t, tl = 0, 0, 0, 0, 0, 0, 0, 0
+
         # Check each nenighbour position
-        for pos in neighbour_pos_tu:
+        for pos in self.get_bitmask_neighbours_pos(x_tu, y_tu):
             # Get tile from collision list
             neighbour_x_tu = pos[0]
             neighbour_y_tu = pos[1]
@@ -338,30 +332,10 @@ class RoomEditor:
                     self.room_w_tu + neighbour_x_tu
                 ]
 
-                # Air? check other position
-                if neighbour == 0:
-                    continue
-
-                # I do not mix?
-                if self.selected_sprite["sprite_bitmask_type"] == "none":
+                # Not air and joins my bitmask? Else check other position
+                if not self.is_bitmask_neighbour(neighbour):
                     continue
 
-                # I do not mix?
-                if self.selected_sprite["sprite_is_bitmask_mix"] == "no":
-                    # Neighbour diff name than me? look for someone else
-                    if self.selected_sprite["sprite_name"] != neighbour["sprite_name"]:
-                        continue
-
-                # I do mix?
-                if self.selected_sprite["sprite_is_bitmask_mix"] == "yes":
-                    # Neighbour not bitmask?
-                    if neighbour["sprite_bitmask_type"] == "none":
-                        continue
-
-                    # Neighbour not mix?
-                    if neighbour["sprite_is_bitmask_mix"] == "no":
-                        continue
-
                 # Found! Tell my neighbour to update bitmask
                 if last == False:
                     self.update_bitmasks(
@@ -403,55 +377,79 @@ class RoomEditor:
                         y_tu * self.room_w_tu + x_tu
                     ]["sprite_region"] = new_region
 
+    # Fill the air connected to this tile with the selected sprite, no recursion, timed by the profiler, touched cells shown in debug
     def bucket_fill(self, x_tu, y_tu, xds, yds):
-        # Create a blink effect on tile that mask about to change
+        self.game.profiler.begin("bucket fill")
+
+        # Collect the air region first, walk it with a queue, 4 neighbours, not corners
+        region = []
+        seen = {(x_tu, y_tu)}
+        queue = deque([(x_tu, y_tu)])
+        while queue:
+            cell_x_tu, cell_y_tu = queue.popleft()
+
+            for neighbour_x_tu, neighbour_y_tu in (
+                (cell_x_tu - 0, cell_y_tu - 1), (cell_x_tu - 1, cell_y_tu - 0),
+                (cell_x_tu + 1, cell_y_tu - 0), (cell_x_tu - 0, cell_y_tu + 1)
+            ):
+                # Found already?
+                if (neighbour_x_tu, neighbour_y_tu) in seen:
+                    continue
 
-        # Check my neighbours, but not corners
-        neighbour_pos_tu = [
-            (x_tu - 0, y_tu - 1), (x_tu - 1, y_tu - 0),
-            (x_tu + 1, y_tu - 0), (x_tu - 0, y_tu + 1)
-        ]
-        for pos in neighbour_pos_tu:
-            # Get tile from collision list
-            neighbour_x_tu = pos[0]
-            neighbour_y_tu = pos[1]
+                # Make sure that pos is inside the room, this bounds the fill
+                if not ((0 <= neighbour_x_tu < self.room_w_tu) and (0 <= neighbour_y_tu < self.room_h_tu)):
+                    continue
 
-            # Make sure that pos is inside the list
-            if (0 <= neighbour_x_tu < self.room_w_tu) and (0 <= neighbour_y_tu < self.room_h_tu):
-                neighbour = self.selected_layer[
-                    neighbour_y_tu *
-                    self.room_w_tu + neighbour_x_tu
-                ]
+                seen.add((neighbour_x_tu, neighbour_y_tu))
+
+                # Air? Fill it, look at its neighbours too
+                if self.selected_layer[neighbour_y_tu * self.room_w_tu + neighbour_x_tu] == 0:
+                    region.append((neighbour_x_tu, neighbour_y_tu))
+                    queue.append((neighbour_x_tu, neighbour_y_tu))
+
+        # Then put the new sprites in
+        for cell_x_tu, cell_y_tu in region:
+            # Instance new sprite at real draw positions
+            new_sprite = self.selected_sprite.copy()
+            new_sprite["xds"] = (cell_x_tu + self.room_x_tu) * TILE_S
+            new_sprite["yds"] = (cell_y_tu + self.room_y_tu) * TILE_S
+            self.selected_layer[
+                cell_y_tu *
+                self.room_w_tu + cell_x_tu
+            ] = new_sprite
+
+        # Last, 1 bitmask pass over the start tile, the filled tiles and the neighbours that join them, each once
+        touched = 1 + len(region)
+        if self.selected_sprite["sprite_bitmask_type"] != "none":
+            bitmask_cells = {(x_tu, y_tu)}
+            for cell_x_tu, cell_y_tu in [(x_tu, y_tu)] + region:
+                bitmask_cells.add((cell_x_tu, cell_y_tu))
+
+                # Border neighbours that join the bitmask change too
+                for neighbour_x_tu, neighbour_y_tu in self.get_bitmask_neighbours_pos(cell_x_tu, cell_y_tu):
+                    if (0 <= neighbour_x_tu < self.room_w_tu) and (0 <= neighbour_y_tu < self.room_h_tu):
+                        neighbour = self.selected_layer[
+                            neighbour_y_tu *
+                            self.room_w_tu + neighbour_x_tu
+                        ]
+                        if self.is_bitmask_neighbour(neighbour):
+                            bitmask_cells.add((neighbour_x_tu, neighbour_y_tu))
+
+            # Every tile is in now, so no need to tell neighbours, last is true
+            for cell_x_tu, cell_y_tu in bitmask_cells:
+                self.update_bitmasks(
+                    cell_x_tu, cell_y_tu,
+                    (cell_x_tu + self.room_x_tu) * TILE_S,
+                    (cell_y_tu + self.room_y_tu) * TILE_S,
+                    last=True
+                )
 
-                # Air? Instance new sprite
-                if neighbour == 0:
-                    # Prepare real draw positions
-                    neighbour_xd_tu = neighbour_x_tu + self.room_x_tu
-                    neighbour_yd_tu = neighbour_y_tu + self.room_y_tu
-                    neighbour_xds = neighbour_xd_tu * TILE_S
-                    neighbour_yds = neighbour_yd_tu * TILE_S
-
-                    # Instance new sprite
-                    new_sprite = self.selected_sprite.copy()
-                    new_sprite["xds"] = neighbour_xds
-                    new_sprite["yds"] = neighbour_yds
-                    self.selected_layer[
-                        neighbour_y_tu *
-                        self.room_w_tu + neighbour_x_tu
-                    ] = new_sprite
+            touched = len(bitmask_cells)
 
-                    # Tell my neighbour to fill
-                    self.bucket_fill(
-                        neighbour_x_tu, neighbour_y_tu,
-                        neighbour_xds, neighbour_yds,
-                    )
+        # Remember how big it was for the debug text
+        self.bucket_fill_touched = touched
 
-                    # Update bistmasks if it is bitmask type
-                    if new_sprite["sprite_bitmask_type"] != "none":
-                        self.update_bitmasks(
-                            neighbour_x_tu, neighbour_y_tu,
-                            neighbour_xds, neighbour_yds
-                        )
+        self.game.profiler.end("bucket fill")
 
     def selectFromDict(self, options, name):
         index = 0
@@ -624,6 +622,16 @@ class RoomEditor:
                 pg.draw.rect(NATIVE_SURF, "green", [xs, ys, TILE_S, TILE_S], 1)
             # endregion Draw cursor
 
+        # REMOVE IN BUILD
+        if self.game.is_debug:
+            # Last bucket fill size
+            self.game.debug_draw.add_text(
+                layer=3,
+                x=1,
+                y=NATIVE_H - FONT_H - 1,
+                text=f"bucket fill {self.bucket_fill_touched} cells"
+            )
+
         self.curtain.draw()
 
     def update(self, dt):
@@ -631,43 +639,11 @@ class RoomEditor:
             # Do not update when curtain is lerping
             if self.curtain.is_done_lerping == True:
 
-                # Update animation background
-
-                # region Cam pos -> indexes -> get tile and draw them
-                # Turn coord into tu
-                cam_x_tu = self.camera.rect.x // TILE_S
-                cam_y_tu = self.camera.rect.y // TILE_S
-
-                # Turn tu into index, by sub cam offset
-                cam_x_tu = int(cam_x_tu - self.room_x_tu)
-                cam_y_tu = int(cam_y_tu - self.room_y_tu)
-
-                for layer in self.layers_list:
-                    # Iterate over rows
-                    for row in range(11):  # NATIVE_H_TU + 1
-                        # Iterate over columns
-                        for col in range(21):  # NATIVE_W_TU + 1
-                            # Calculate index for the current tile
-                            index = (cam_y_tu + row) * \
-                                self.room_w_tu + (cam_x_tu + col)
-
-                            # Makes sure its in index
-                            if 0 <= index < len(layer):
-                                # Get item and grab its draw pos
-                                item = layer[index]
-
-                                # Find air? Continue
-                                if item == 0:
-                                    continue
-
-                                # Found actor? let it draw itself
-                                if item["sprite_type"] == "animated_background":
-                                    instance = item["instance"]
-                                    instance.update(dt)
-                                    continue
+                # Update animation background, every instance shares the game animation clock
+                self.game.animation_clock.update(dt)
 
                 # Tap enter?
-                if self.game.is_enter_just_pressed == True:
+                if self.game.input.is_just_pressed(ACTION_ENTER) == True:
 
                     for i in range(self.total_layers):
                         # Handle each room in all layers
@@ -754,21 +730,37 @@ class RoomEditor:
                             json_file
                         )
 
+                    # Bake it too, game reads the room bin before the json, bins are not in git so make the folder
+                    makedirs(BINS_DIR_PATH, exist_ok=True)
+                    room_format = RoomFormat(is_open_worlds=False)
+                    room_format.save(
+                        room_format.from_json(to_be_saved_editor),
+                        room_format.get_bin_path(
+                            f"stage_{self.stage_no}_{self.room_name}_game.json"
+                        )
+                    )
+
+                    # Pack the stage world again, game reads it before the room bin
+                    room_format.save_world(
+                        room_format.get_world_path(self.stage_no),
+                        room_format.get_stage_names(self.stage_no)
+                    )
+
                     # Exit
                     pg.quit()
                     exit()
 
                 # Tap pause?
-                if self.game.is_pause_just_pressed == True:
+                if self.game.input.is_just_pressed(ACTION_PAUSE) == True:
                     # Curtain go to opaque
                     self.sound_manager.play_sound("accept")
                     self.curtain.go_to_opaque()
                     return
 
                 # Not pressing jump
-                elif not self.game.is_jump_pressed:
+                elif not self.game.input.is_held(ACTION_JUMP):
                     # Held lmb on canvas?
-                    if self.game.is_lmb_pressed:
+                    if self.game.input.is_held(ACTION_LMB):
                         # Get mouse positions
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
@@ -865,7 +857,8 @@ class RoomEditor:
                                             # Add a new pair instance
                                             new_sprite["instance"] = self.game.actors[new_sprite["sprite_name"]](
                                                 self.sprite_sheet_surface,
-                                                self.animation_data[new_sprite["sprite_name"]],
+                                                self.animation_clips[new_sprite["sprite_name"]],
+                                                self.game.animation_clock,
                                                 self.camera,
                                                 new_sprite["xds"],
                                                 new_sprite["yds"]
@@ -882,7 +875,7 @@ class RoomEditor:
                                 self.sound_manager.play_sound("cursor")
 
                     # Held rmb on canvas?
-                    elif self.game.is_rmb_pressed:
+                    elif self.game.input.is_held(ACTION_RMB):
                         # Get mouse positions
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
@@ -930,7 +923,7 @@ class RoomEditor:
                             self.sound_manager.play_sound("cancel")
 
                     # Just pressed mmb on canvas?
-                    elif self.game.is_mmb_just_pressed:
+                    elif self.game.input.is_just_pressed(ACTION_MMB):
                         # Get mouse positions
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
@@ -1025,17 +1018,14 @@ class RoomEditor:
                                             yc * self.room_w_tu + xc
                                         ] = new_sprite
 
+                                # Fill, it also updates the bitmasks of this tile and every filled one
                                 self.bucket_fill(x_tu, y_tu, xds, yds)
 
-                                # If this sprite has bitmask type, then update it
-                                if new_sprite["sprite_bitmask_type"] != "none":
-                                    self.update_bitmasks(x_tu, y_tu, xds, yds)
-
                                 self.sound_manager.play_sound("cursor")
 
                 # Held lmb on canvas?
-                elif self.game.is_jump_pressed:
-                    if self.game.is_lmb_just_pressed:
+                elif self.game.input.is_held(ACTION_JUMP):
+                    if self.game.input.is_just_pressed(ACTION_LMB):
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
                         y = (pos[1] // self.game.resolution) - (
@@ -1071,7 +1061,7 @@ class RoomEditor:
                             xds, yds, TILE_S, TILE_S
                         )
 
-                    elif self.game.is_lmb_pressed:
+                    elif self.game.input.is_held(ACTION_LMB):
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
                         y = (pos[1] // self.game.resolution) - (
@@ -1118,7 +1108,7 @@ class RoomEditor:
                             ], 1
                         )
 
-                    elif self.game.is_lmb_just_released:
+                    elif self.game.input.is_just_released(ACTION_LMB):
                         for xu in range(self.selection_rect.width // TILE_S):
                             for yu in range(self.selection_rect.height // TILE_S):
                                 xd_tu = (self.selection_rect.x // TILE_S) + xu
@@ -1227,7 +1217,7 @@ class RoomEditor:
 
                         self.sound_manager.play_sound("cursor")
 
-                    if self.game.is_rmb_just_pressed:
+                    if self.game.input.is_just_pressed(ACTION_RMB):
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
                         y = (pos[1] // self.game.resolution) - (
@@ -1263,7 +1253,7 @@ class RoomEditor:
                             xds, yds, TILE_S, TILE_S
                         )
 
-                    elif self.game.is_rmb_pressed:
+                    elif self.game.input.is_held(ACTION_RMB):
                         pos = pg.mouse.get_pos()
                         x = pos[0] // self.game.resolution
                         y = (pos[1] // self.game.resolution) - (
@@ -1310,7 +1300,7 @@ class RoomEditor:
                             ], 1
                         )
 
-                    elif self.game.is_rmb_just_released:
+                    elif self.game.input.is_just_released(ACTION_RMB):
                         for xu in range(self.selection_rect.width // TILE_S):
                             for yu in range(self.selection_rect.height // TILE_S):
                                 xd_tu = (self.selection_rect.x // TILE_S) + xu
@@ -1363,11 +1353,11 @@ class RoomEditor:
 
                 # Move camera
                 self.offset.x += (
-                    self.game.is_right_pressed - self.game.is_left_pressed
+                    self.game.input.is_held(ACTION_RIGHT) - self.game.input.is_held(ACTION_LEFT)
                 ) * self.camera_speed
 
                 self.offset.y += (
-                    self.game.is_down_pressed - self.game.is_up_pressed
+                    self.game.input.is_held(ACTION_DOWN) - self.game.input.is_held(ACTION_UP)
                 ) * self.camera_speed
 
                 self.camera.update(dt)
@@ -1376,14 +1366,14 @@ class RoomEditor:
             # Do not update when curtain is lerping
             if self.curtain.is_done_lerping == True:
                 # Tap pause?
-                if self.game.is_pause_just_pressed == True:
+                if self.game.input.is_just_pressed(ACTION_PAUSE) == True:
                     # Curtain go to opaque
                     self.sound_manager.play_sound("cancel")
                     self.curtain.go_to_opaque()
                     return
 
                 # In menu attempt to click on menu
-                if self.game.is_lmb_just_released:
+                if self.game.input.is_just_released(ACTION_LMB):
                     # Get mouse positions
                     pos = pg.mouse.get_pos()
                     x = pos[0] // self.game.resolution
@@ -76,6 +76,10 @@ class World:
         # To remember which door after transition curtain
         self.next_door = None
 
+        # Fixed loop mode, where the actors in camera and the camera were before the last tick
+        self.previous_positions = {}
+        self.previous_camera_position = self.camera.rect.topleft
+
     def on_player_save(self, twin_goddess):
         self.set_state("save")
         # print(twin_goddess.rect.midbottom)
@@ -146,7 +150,95 @@ class World:
             self.player.rect.top = self.room.rect[1] + TILE_S
             self.camera.rect.y += NATIVE_H
 
+        # Player and camera were teleported, fixed loop mode must not interpolate from the old room
+        if self.game.loop_mode == "fixed":
+            self.save_previous_positions()
+
     def draw(self):
+        # Fixed loop mode between 2 ticks? Draw everyone in between, put them back after
+        is_interpolated = self.game.loop_mode == "fixed" and self.game.alpha < 1
+        if is_interpolated:
+            positions = self.interpolate_positions()
+
+        # Dirty render mode? Only redraw what changed
+        if self.game.render_mode == "dirty" and not self.game.is_debug:
+            self.draw_dirty()
+
+        # Redraw everything
+        else:
+            self.draw_scene()
+
+        if is_interpolated:
+            self.restore_positions(positions)
+
+    # Fixed loop mode, remember where the actors in camera and the camera are before a tick
+    def save_previous_positions(self):
+        self.previous_positions = {
+            actor: actor.rect.topleft
+            for actor in self.room.quadtree.search(self.camera.rect)
+        }
+        self.previous_camera_position = self.camera.rect.topleft
+
+    # Move the actors and camera between their previous and current tick positions by game alpha, give back their real ones
+    def interpolate_positions(self):
+        alpha = self.game.alpha
+
+        # Actors
+        positions = {}
+        for actor, (x, y) in self.previous_positions.items():
+            positions[actor] = actor.rect.topleft
+            actor.rect.topleft = (
+                lerp(x, actor.rect.x, alpha),
+                lerp(y, actor.rect.y, alpha)
+            )
+
+        # Camera
+        camera_position = self.camera.rect.topleft
+        x, y = self.previous_camera_position
+        self.camera.rect.topleft = (
+            lerp(x, self.camera.rect.x, alpha),
+            lerp(y, self.camera.rect.y, alpha)
+        )
+
+        return positions, camera_position
+
+    # Put the actors and camera back where interpolate positions found them
+    def restore_positions(self, positions):
+        actor_positions, camera_position = positions
+        for actor, position in actor_positions.items():
+            actor.rect.topleft = position
+        self.camera.rect.topleft = camera_position
+
+    # Tell dirty rects what changed, then redraw the scene clipped to each dirty rect
+    def draw_dirty(self):
+        dirty_rects = self.game.dirty_rects
+
+        # Any of these changed? Whole screen changed
+        dirty_rects.begin(
+            (
+                self.state,
+                self.room.name,
+                tuple(self.camera.rect.topleft),
+                self.curtain.alpha,
+                self.inventory.curtain.alpha,
+                self.save_menu.curtain.alpha,
+                self.game.is_debug,
+                self.game.resolution,
+            )
+        )
+
+        # Tell where everything in camera draws
+        self.room.add_actors_to_dirty_rects(dirty_rects)
+        self.mini_map.add_to_dirty_rects(dirty_rects)
+        dirty_rects.end_tracking()
+
+        # Redraw the scene under the dirty rects only, many are drawn once as their union, nothing changed means no draw at all
+        for rect in dirty_rects.get_draw_rects():
+            NATIVE_SURF.set_clip(rect)
+            self.draw_scene()
+        NATIVE_SURF.set_clip(None)
+
+    def draw_scene(self):
         # Clear canvas with hot pink, to see if there is a hole somewhere in case
         NATIVE_SURF.fill("pink")
 
@@ -192,10 +284,14 @@ class World:
             self.save_menu.draw()
 
     def update(self, dt):
+        # Fixed loop mode? Draw interpolates from where everyone is before this tick
+        if self.game.loop_mode == "fixed":
+            self.save_previous_positions()
+
         # Gameplay state
         if self.state == "playing":
             # Prioritize pause input check
-            if self.game.is_pause_just_pressed:
+            if self.game.input.is_just_pressed(ACTION_PAUSE):
                 self.set_state("pause")
 
             # Update all bg sprites actors, and moving actors